@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark :func:`kwplot.draw_boxes` as the number of boxes grows, compared to
+the previous implementation that built one ``Rectangle`` patch and one
+``kwplot.Color`` per box.
+
+The "draw" column is the time to build and add the artists, and the "render"
+column is the time for a full Agg draw of the figure.
+
+CommandLine:
+    python dev/bench/bench_draw_boxes.py
+    python dev/bench/bench_draw_boxes.py --sizes="[1000, 10000]" --centers
+    python dev/bench/bench_draw_boxes.py --sizes="[1000, 5000]" --labels --alpha=0.8
+"""
+import ubelt as ub
+import scriptconfig as scfg
+
+
+class BenchDrawBoxesConfig(scfg.DataConfig):
+    sizes = scfg.Value([1_000, 10_000, 100_000, 1_000_000], help='numbers of boxes to draw')
+    legacy_max = scfg.Value(10_000, help='skip the legacy implementation for more boxes than this')
+    centers = scfg.Value(False, isflag=True, help='if True also draw box centers')
+    labels = scfg.Value(False, isflag=True, help='if True also draw a text label for each box')
+    alpha = scfg.Value(None, help='a single alpha for all boxes, if unspecified each box gets a random alpha')
+    per_box_colors = scfg.Value(False, isflag=True, help='if True give each box its own color')
+    render = scfg.Value(True, isflag=True, help='if True time a full Agg draw of the figure')
+
+
+def legacy_draw_boxes(boxes, alpha=None, color='blue', labels=None,
+                      centers=False, fill=False, ax=None, lw=2):
+    """
+    The per-box patch and per-label text implementation used before the
+    array-native rewrite.
+    """
+    import kwplot
+    import numpy as np
+    import matplotlib as mpl
+    xywh = np.asarray(boxes)
+    transparent = kwplot.Color((0, 0, 0, 0)).as01('rgba')
+    if alpha is None:
+        alpha = [1.0] * len(xywh)
+    elif not ub.iterable(alpha):
+        alpha = [alpha] * len(xywh)
+    edgecolors = [kwplot.Color(color, alpha=a).as01('rgba') for a in alpha]
+    color_groups = ub.group_items(range(len(edgecolors)), edgecolors)
+    for edgecolor, idxs in color_groups.items():
+        fc = edgecolor if fill else transparent
+        rectkw = dict(ec=edgecolor, fc=fc, lw=lw, linestyle='solid')
+        patches = [mpl.patches.Rectangle((x, y), w, h, **rectkw)
+                   for x, y, w, h in xywh[idxs]]
+        col = mpl.collections.PatchCollection(patches, match_original=True)
+        ax.add_collection(col)
+    if centers:
+        xy_centers = xywh[:, 0:2] + xywh[:, 2:4] / 2
+        for fcolor, idxs in color_groups.items():
+            patches = [mpl.patches.Circle((x, y), ec=None, fc=fcolor, fill=True)
+                       for x, y in xy_centers[idxs]]
+            col = mpl.collections.PatchCollection(patches, match_original=True)
+            ax.add_collection(col)
+    if labels:
+        tkw = {
+            'horizontalalignment': 'left',
+            'verticalalignment': 'top',
+            'backgroundcolor': (0, 0, 0, .8),
+            'color': 'white',
+            'fontproperties': mpl.font_manager.FontProperties(
+                size=6, family='monospace'),
+        }
+        for (x1, y1, w, h), label in zip(xywh, labels):
+            ax.text(x1, y1, label, **tkw)
+
+
+def main(cmdline=1, **kwargs):
+    """
+    Example:
+        >>> # xdoctest: +SKIP
+        >>> import sys, ubelt
+        >>> sys.path.append(ubelt.expandpath('~/code/kwplot/dev/bench'))
+        >>> from bench_draw_boxes import *  # NOQA
+        >>> main(cmdline=0, sizes=[100, 1000])
+    """
+    import numpy as np
+    import kwplot
+    config = BenchDrawBoxesConfig.cli(cmdline=cmdline, data=kwargs)
+    print('config = {}'.format(ub.urepr(dict(config), nl=1)))
+
+    def run(method, num):
+        rng = np.random.RandomState(0)
+        xywh = np.hstack([rng.rand(num, 2) * 1000, rng.rand(num, 2) * 20 + 1])
+        alpha = rng.rand(num) if config.alpha is None else float(config.alpha)
+        labels = ['box{}'.format(i) for i in range(num)] if config.labels else None
+        if config.per_box_colors and method == 'array':
+            color = rng.rand(num, 3)
+        else:
+            color = 'blue'
+        fig = kwplot.figure(managed=False, figsize=(8, 8))
+        ax = fig.add_subplot(1, 1, 1)
+        with ub.Timer() as draw_timer:
+            if method == 'legacy':
+                legacy_draw_boxes(xywh, alpha=alpha, color=color, labels=labels,
+                                  centers=config.centers, ax=ax)
+            else:
+                kwplot.draw_boxes(xywh, alpha=alpha, color=color, labels=labels,
+                                  centers=config.centers, ax=ax)
+        row = {'method': method, 'num': num, 'draw': draw_timer.elapsed}
+        if config.render:
+            ax.set_xlim(0, 1020)
+            ax.set_ylim(0, 1020)
+            with ub.Timer() as render_timer:
+                fig.canvas.draw()
+            row['render'] = render_timer.elapsed
+        kwplot.close_figures([fig])
+        return row
+
+    rows = []
+    for num in ub.ProgIter(config.sizes, desc='bench', verbose=3):
+        if num <= config.legacy_max:
+            rows.append(run('legacy', num))
+        rows.append(run('array', num))
+
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    if config.render:
+        df['total'] = df['draw'] + df['render']
+    piv = df.pivot(index='num', columns='method')
+    print(piv.to_string(float_format='%.4f'))
+    return df
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/kwplot/dev/bench/bench_draw_boxes.py
+    """
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark :func:`kwplot.draw_points` as the number of points grows, compared
+to the previous implementation that built one ``Circle`` patch and one
+``kwimage.Color`` per point.
+
+The "draw" column is the time to build and add the artists, and the "render"
+column is the time for a full Agg draw of the figure.
+
+CommandLine:
+    python dev/bench/bench_draw_points.py
+    python dev/bench/bench_draw_points.py --sizes="[1000, 1000000]" --no-render
+"""
+import ubelt as ub
+import scriptconfig as scfg
+
+
+class BenchDrawPointsConfig(scfg.DataConfig):
+    sizes = scfg.Value([1_000, 10_000, 100_000, 1_000_000], help='numbers of points to draw')
+    legacy_max = scfg.Value(10_000, help='skip the legacy implementation for more points than this')
+    num_classes = scfg.Value(10, help='number of classes to color the points by')
+    render = scfg.Value(True, isflag=True, help='if True time a full Agg draw of the figure')
+
+
+def legacy_draw_points(xy, class_idxs, classes, ax, radius=1):
+    """
+    The per-point patch implementation of ``color='classes'`` used before the
+    array-native rewrite.
+    """
+    import kwimage
+    import matplotlib as mpl
+    alpha = [1.0] * len(xy)
+    cls_colors = kwimage.Color.distinct(len(classes))
+    colors = list(ub.take(cls_colors, class_idxs))
+    ptcolors = [kwimage.Color(c, alpha=a).as01('rgba')
+                for c, a in zip(colors, alpha)]
+    color_groups = ub.group_items(range(len(ptcolors)), ptcolors)
+    for pcolor, idxs in color_groups.items():
+        patches = [mpl.patches.Circle((x, y), fc=pcolor, radius=radius,
+                                      fill=True, ec=None)
+                   for x, y in xy[idxs]]
+        col = mpl.collections.PatchCollection(patches, match_original=True)
+        ax.add_collection(col)
+
+
+def main(cmdline=1, **kwargs):
+    """
+    Example:
+        >>> # xdoctest: +SKIP
+        >>> import sys, ubelt
+        >>> sys.path.append(ubelt.expandpath('~/code/kwplot/dev/bench'))
+        >>> from bench_draw_points import *  # NOQA
+        >>> main(cmdline=0, sizes=[100, 1000])
+    """
+    import numpy as np
+    import kwplot
+    config = BenchDrawPointsConfig.cli(cmdline=cmdline, data=kwargs)
+    print('config = {}'.format(ub.urepr(dict(config), nl=1)))
+    classes = ['class{}'.format(i) for i in range(config.num_classes)]
+
+    def run(method, num):
+        rng = np.random.RandomState(0)
+        xy = rng.rand(num, 2) * 1000
+        class_idxs = rng.randint(0, len(classes), num)
+        fig = kwplot.figure(managed=False, figsize=(8, 8))
+        ax = fig.add_subplot(1, 1, 1)
+        with ub.Timer() as draw_timer:
+            if method == 'legacy':
+                legacy_draw_points(xy, class_idxs, classes, ax=ax)
+            else:
+                kwplot.draw_points(xy, color='classes', class_idxs=class_idxs,
+                                   classes=classes, ax=ax)
+        row = {'method': method, 'num': num, 'draw': draw_timer.elapsed}
+        if config.render:
+            ax.set_xlim(0, 1000)
+            ax.set_ylim(0, 1000)
+            with ub.Timer() as render_timer:
+                fig.canvas.draw()
+            row['render'] = render_timer.elapsed
+        kwplot.close_figures([fig])
+        return row
+
+    rows = []
+    for num in ub.ProgIter(config.sizes, desc='bench', verbose=3):
+        if num <= config.legacy_max:
+            rows.append(run('legacy', num))
+        rows.append(run('array', num))
+
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    if config.render:
+        df['total'] = df['draw'] + df['render']
+    piv = df.pivot(index='num', columns='method')
+    print(piv.to_string(float_format='%.4f'))
+    return df
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/kwplot/dev/bench/bench_draw_points.py
+    """
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark drawing the same PlotNums grid layout many times with and without
+recycling figures through :class:`kwplot.FigurePool`.
+
+CommandLine:
+    python dev/bench/bench_figure_pool.py
+    python dev/bench/bench_figure_pool.py --iters=200 --nRows=3 --nCols=4
+"""
+import ubelt as ub
+import scriptconfig as scfg
+
+
+class BenchFigurePoolConfig(scfg.DataConfig):
+    iters = scfg.Value(50, help='number of loop iterations per method')
+    nRows = scfg.Value(2, help='number of rows in the grid layout')
+    nCols = scfg.Value(3, help='number of columns in the grid layout')
+    render = scfg.Value(True, isflag=True, help='if True render each figure to an image')
+    managed = scfg.Value(False, isflag=True, help='if True use pyplot managed figures')
+
+
+def draw_grid(figure_func, config, rng):
+    """
+    Draw one iteration of a report-like figure with one plot per grid cell
+    """
+    import kwplot
+    pnum_ = kwplot.PlotNums(nRows=config.nRows, nCols=config.nCols)
+    for idx in range(len(pnum_)):
+        fig = figure_func(pnum=pnum_[idx], doclf=(idx == 0))
+        ax = fig.gca()
+        ax.plot(rng.rand(20), label='a')
+        ax.plot(rng.rand(20), label='b')
+        ax.set_title('plot {}'.format(idx))
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        ax.legend()
+    fig.suptitle('report')
+    if config.render:
+        kwplot.render_figure_to_image(fig, dpi=50)
+    return fig
+
+
+def main(cmdline=1, **kwargs):
+    """
+    Example:
+        >>> # xdoctest: +SKIP
+        >>> import sys, ubelt
+        >>> sys.path.append(ubelt.expandpath('~/code/kwplot/dev/bench'))
+        >>> from bench_figure_pool import *  # NOQA
+        >>> main(cmdline=0, iters=3)
+    """
+    import numpy as np
+    import kwplot
+    config = BenchFigurePoolConfig.cli(cmdline=cmdline, data=kwargs)
+    print('config = {}'.format(ub.urepr(dict(config), nl=1)))
+    if config.managed:
+        kwplot.autompl(force='agg')
+
+    figsize = (3 * config.nCols, 3 * config.nRows)
+    dpi = 50
+
+    def baseline_figure(pnum, doclf):
+        fig = kwplot.figure(fnum=1, pnum=pnum, doclf=doclf,
+                            managed=config.managed)
+        if doclf:
+            fig.set_size_inches(figsize)
+            fig.set_dpi(dpi)
+        return fig
+
+    pool = kwplot.FigurePool(managed=config.managed)
+
+    def pooled_figure(pnum, doclf):
+        return pool.figure(pnum=pnum, figsize=figsize, dpi=dpi, doclf=doclf)
+
+    methods = {
+        'fig.clf': baseline_figure,
+        'FigurePool': pooled_figure,
+    }
+    rows = []
+    for name, figure_func in methods.items():
+        rng = np.random.RandomState(0)
+        # Warmup so the first-render costs are not counted
+        draw_grid(figure_func, config, rng)
+        times = []
+        for _ in ub.ProgIter(range(config.iters), desc=name):
+            with ub.Timer() as timer:
+                draw_grid(figure_func, config, rng)
+            times.append(timer.elapsed)
+        times = np.array(times)
+        rows.append({
+            'method': name,
+            'mean_ms': times.mean() * 1e3,
+            'median_ms': np.median(times) * 1e3,
+            'std_ms': times.std() * 1e3,
+        })
+    pool.close()
+
+    import pandas as pd
+    df = pd.DataFrame(rows).set_index('method')
+    df['speedup'] = df.loc['fig.clf', 'median_ms'] / df['median_ms']
+    print(df.to_string(float_format='%.3f'))
+    return df
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/kwplot/dev/bench/bench_figure_pool.py
+    """
+    main()
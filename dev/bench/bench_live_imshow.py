@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Benchmark showing a stream of frames with repeated :func:`kwplot.imshow`
+calls versus updating a ``kwplot.imshow(..., live=True)`` handle in place.
+
+Each frame is fully rendered to the canvas buffer, so the numbers reflect the
+cost of getting a new frame on screen.
+
+CommandLine:
+    python dev/bench/bench_live_imshow.py
+    python dev/bench/bench_live_imshow.py --frames=200 --size=512 --managed
+"""
+import ubelt as ub
+import scriptconfig as scfg
+
+
+class BenchLiveImshowConfig(scfg.DataConfig):
+    frames = scfg.Value(50, help='number of frames to show per method')
+    size = scfg.Value(256, help='height and width of each frame')
+    channels = scfg.Value(3, help='number of channels in each frame')
+    managed = scfg.Value(False, isflag=True, help='if True use pyplot managed figures with the agg backend')
+
+
+def main(cmdline=1, **kwargs):
+    """
+    Example:
+        >>> # xdoctest: +SKIP
+        >>> import sys, ubelt
+        >>> sys.path.append(ubelt.expandpath('~/code/kwplot/dev/bench'))
+        >>> from bench_live_imshow import *  # NOQA
+        >>> main(cmdline=0, frames=5)
+    """
+    import numpy as np
+    import kwplot
+    config = BenchLiveImshowConfig.cli(cmdline=cmdline, data=kwargs)
+    print('config = {}'.format(ub.urepr(dict(config), nl=1)))
+    if config.managed:
+        kwplot.autompl(force='agg')
+
+    rng = np.random.RandomState(0)
+    shape = (config.size, config.size, config.channels)
+    frames = [rng.randint(0, 255, shape, dtype=np.uint8) for _ in range(8)]
+
+    def repeated_imshow():
+        fig = kwplot.figure(fnum=1, doclf=True, managed=config.managed)
+        for idx in ub.ProgIter(range(config.frames), desc='repeated imshow'):
+            kwplot.imshow(frames[idx % len(frames)], fig=fig, fnum=1,
+                          managed=config.managed)
+            fig.canvas.draw()
+
+    def repeated_imshow_doclf():
+        fig = kwplot.figure(fnum=1, doclf=True, managed=config.managed)
+        for idx in ub.ProgIter(range(config.frames), desc='repeated imshow (doclf)'):
+            kwplot.imshow(frames[idx % len(frames)], fig=fig, fnum=1,
+                          managed=config.managed, doclf=True)
+            fig.canvas.draw()
+
+    def live_update():
+        fig = kwplot.figure(fnum=1, doclf=True, managed=config.managed)
+        h = kwplot.imshow(frames[0], fig=fig, fnum=1, managed=config.managed,
+                          live=True)
+        h.redraw()
+        for idx in ub.ProgIter(range(config.frames), desc='live update'):
+            h.update(frames[idx % len(frames)])
+
+    methods = {
+        'repeated imshow': repeated_imshow,
+        'repeated imshow (doclf)': repeated_imshow_doclf,
+        'live update': live_update,
+    }
+    rows = []
+    for name, func in methods.items():
+        with ub.Timer() as timer:
+            func()
+        rows.append({
+            'method': name,
+            'seconds': timer.elapsed,
+            'fps': config.frames / timer.elapsed,
+        })
+        kwplot.close_figures()
+
+    import pandas as pd
+    df = pd.DataFrame(rows).set_index('method')
+    df['speedup'] = df['fps'] / df.loc['repeated imshow', 'fps']
+    print(df.to_string(float_format='%.3f'))
+    return df
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/kwplot/dev/bench/bench_live_imshow.py
+    """
+    main()
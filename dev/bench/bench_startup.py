@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+"""
+Benchmark the import time and first-render latency of kwplot.
+
+Every case runs in a fresh Python subprocess so module caches from previous
+cases do not hide cold-start costs. Each subprocess runs some untimed setup
+code and then times a single statement. The results are written as JSON and
+can be checked against per-case time budgets, which makes this usable as a
+regression gate in CI.
+
+CommandLine:
+    python dev/bench/bench_startup.py
+    python dev/bench/bench_startup.py --repeats=5 --out=startup.json
+    python dev/bench/bench_startup.py --cases="import_kwplot,first_*"
+    python dev/bench/bench_startup.py --budgets="{import_kwplot: 0.2, 'attr:*': 1.0}"
+"""
+import json
+import os
+import subprocess
+import sys
+import ubelt as ub
+import scriptconfig as scfg
+
+
+# Upper bounds (in seconds) on the median time of each case. Keys can be glob
+# patterns; the first matching pattern is used, and user specified patterns are
+# checked before these defaults.
+DEFAULT_BUDGETS = {
+    'import_kwplot': 0.5,
+    'attr:*': 5.0,
+    'autompl': 3.0,
+    'first_figure': 2.0,
+    'first_imshow': 3.0,
+    'first_render': 2.0,
+    'cli_help': 3.0,
+}
+
+# Names that are module properties and call autompl when accessed
+_MODULE_PROPERTIES = {'plt', 'pyplot', 'sns', 'seaborn'}
+
+_CHILD_TEMPLATE = ub.codeblock(
+    '''
+    import json
+    import time
+    {setup}
+    _bench_start = time.perf_counter()
+    {timed}
+    _bench_seconds = time.perf_counter() - _bench_start
+    print('__BENCH_RESULT__' + json.dumps(_bench_seconds))
+    ''')
+
+
+class BenchStartupConfig(scfg.DataConfig):
+    """
+    Time kwplot imports and first renders in fresh subprocesses.
+    """
+    repeats = scfg.Value(3, help='number of fresh subprocesses to run per case')
+
+    cases = scfg.Value(None, type=str, help=ub.paragraph(
+        '''
+        Comma separated list of case names or glob patterns to run.
+        Runs all cases by default.
+        '''))
+
+    out = scfg.Value(None, help='path to write the JSON results. Prints to stdout if unspecified')
+
+    budgets = scfg.Value(None, type=str, help=ub.paragraph(
+        '''
+        A YAML / JSON mapping (or a path to a file containing one) from case
+        name pattern to the maximum allowed median seconds. These update the
+        default budgets. Set to "none" to disable the budget check.
+        '''))
+
+    headless = scfg.Value(True, isflag=True, help=ub.paragraph(
+        '''
+        if True, unset DISPLAY and disable the autompl cache so autompl runs
+        its full headless probe in every subprocess.
+        '''))
+
+
+def build_cases():
+    """
+    Returns:
+        Dict[str, Dict[str, str]]: mapping from case name to the setup and
+            timed code of the case.
+    """
+    import kwplot
+    cases = {}
+    cases['import_kwplot'] = {
+        'setup': '',
+        'timed': 'import kwplot',
+    }
+    for attr in kwplot.__all__:
+        if attr in _MODULE_PROPERTIES:
+            continue
+        cases['attr:' + attr] = {
+            'setup': 'import kwplot',
+            'timed': 'kwplot.{}'.format(attr),
+        }
+    cases['autompl'] = {
+        'setup': 'import kwplot',
+        'timed': 'kwplot.autompl()',
+    }
+    cases['first_figure'] = {
+        'setup': 'import kwplot; kwplot.autompl()',
+        'timed': 'kwplot.figure(fnum=1)',
+    }
+    cases['first_imshow'] = {
+        'setup': ub.codeblock(
+            '''
+            import numpy as np
+            import kwplot
+            kwplot.autompl()
+            img = np.random.rand(64, 64, 3)
+            '''),
+        'timed': 'kwplot.imshow(img, fnum=1)',
+    }
+    cases['first_render'] = {
+        'setup': ub.codeblock(
+            '''
+            import numpy as np
+            import kwplot
+            kwplot.autompl()
+            img = np.random.rand(64, 64, 3)
+            fig = kwplot.imshow(img, fnum=1).fig
+            '''),
+        'timed': 'kwplot.render_figure_to_image(fig)',
+    }
+    cases['cli_help'] = {
+        'setup': ub.codeblock(
+            '''
+            import contextlib
+            import io
+            import sys
+            sys.argv = ['kwplot', '--help']
+            '''),
+        'timed': ub.codeblock(
+            '''
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    from kwplot.cli.main import main
+                    main()
+                except SystemExit:
+                    pass
+            '''),
+    }
+    return cases
+
+
+def run_case(case, env):
+    """
+    Run one case in a fresh subprocess.
+
+    Returns:
+        Tuple[float, float]: the timed seconds and the total process seconds
+    """
+    code = _CHILD_TEMPLATE.format(**case)
+    timer = ub.Timer().tic()
+    info = subprocess.run([sys.executable, '-c', code], env=env,
+                          capture_output=True, text=True)
+    process_seconds = timer.toc()
+    if info.returncode != 0:
+        raise RuntimeError('Benchmark case failed:\n{}\n{}'.format(
+            code, info.stderr))
+    for line in info.stdout.splitlines()[::-1]:
+        if line.startswith('__BENCH_RESULT__'):
+            seconds = json.loads(line[len('__BENCH_RESULT__'):])
+            return seconds, process_seconds
+    raise RuntimeError('Benchmark case did not report a result:\n{}'.format(
+        info.stdout))
+
+
+def _coerce_budgets(budgets):
+    if budgets is None:
+        return dict(DEFAULT_BUDGETS)
+    if isinstance(budgets, str):
+        if budgets.lower() == 'none':
+            return {}
+        if os.path.exists(budgets):
+            budgets = ub.Path(budgets).read_text()
+        import yaml
+        budgets = yaml.safe_load(budgets)
+    # User patterns take precedence over the default patterns
+    budgets = dict(budgets)
+    for key, value in DEFAULT_BUDGETS.items():
+        budgets.setdefault(key, value)
+    return budgets
+
+
+def _find_budget(name, budgets):
+    from fnmatch import fnmatch
+    for pattern, budget in budgets.items():
+        if fnmatch(name, pattern):
+            return budget
+    return None
+
+
+def main(cmdline=1, **kwargs):
+    """
+    Example:
+        >>> # xdoctest: +SKIP
+        >>> import sys, ubelt
+        >>> sys.path.append(ubelt.expandpath('~/code/kwplot/dev/bench'))
+        >>> from bench_startup import *  # NOQA
+        >>> results = main(cmdline=0, repeats=1, cases='import_kwplot')
+    """
+    from fnmatch import fnmatch
+    import importlib.metadata
+    import platform
+    import numpy as np
+    import kwplot
+    config = BenchStartupConfig.cli(cmdline=cmdline, data=kwargs)
+    print('config = {}'.format(ub.urepr(dict(config), nl=1)), file=sys.stderr)
+
+    cases = build_cases()
+    if config.cases:
+        patterns = [p.strip() for p in config.cases.split(',') if p.strip()]
+        cases = {k: v for k, v in cases.items()
+                 if any(fnmatch(k, p) for p in patterns)}
+
+    env = os.environ.copy()
+    if config.headless:
+        env.pop('DISPLAY', None)
+        env['KWPLOT_AUTOMPL_CACHE'] = '0'
+    env.pop('EAGER_IMPORT', None)
+
+    budgets = _coerce_budgets(config.budgets)
+
+    rows = []
+    for name, case in ub.ProgIter(list(cases.items()), desc='bench startup',
+                                  verbose=1, stream=sys.stderr):
+        times = []
+        process_times = []
+        for _ in range(config.repeats):
+            seconds, process_seconds = run_case(case, env)
+            times.append(seconds)
+            process_times.append(process_seconds)
+        median = float(np.median(times))
+        budget = _find_budget(name, budgets)
+        rows.append({
+            'case': name,
+            'seconds': times,
+            'median_seconds': median,
+            'min_seconds': min(times),
+            'median_process_seconds': float(np.median(process_times)),
+            'budget_seconds': budget,
+            'over_budget': budget is not None and median > budget,
+        })
+
+    failures = [row for row in rows if row['over_budget']]
+    results = {
+        'meta': {
+            'timestamp': ub.timestamp(),
+            'python': sys.version,
+            'platform': platform.platform(),
+            'kwplot_version': kwplot.__version__,
+            'matplotlib_version': importlib.metadata.version('matplotlib'),
+            'repeats': config.repeats,
+            'headless': config.headless,
+        },
+        'results': rows,
+        'num_over_budget': len(failures),
+    }
+
+    text = json.dumps(results, indent='    ')
+    if config.out is not None:
+        ub.Path(config.out).write_text(text)
+        print('wrote results to {}'.format(config.out), file=sys.stderr)
+    else:
+        print(text)
+
+    for row in failures:
+        print('OVER BUDGET: {case} median={median_seconds:.4f}s '
+              'budget={budget_seconds:.4f}s'.format(**row), file=sys.stderr)
+    return results
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/kwplot/dev/bench/bench_startup.py
+    """
+    results = main()
+    if results['num_over_budget']:
+        sys.exit(1)
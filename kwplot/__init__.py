@@ -193,6 +193,9 @@ def lazy_import(module_name, submodules, submod_attrs, eager='auto'):
             eager_import_text_ = eager_import_text.lower()
             if eager_import_text_ in {'true', '1', 'on', 'yes'}:
                 eager_import_flag = True
+            elif eager_import_text_ == 'background':
+                # Import everything (and warm up matplotlib) in a thread
+                eager_import_flag = 'background'
 
         eager_import_module_text = os.environ.get('EAGER_IMPORT_MODULES', '')
         if eager_import_module_text:
@@ -200,7 +203,9 @@ def lazy_import(module_name, submodules, submod_attrs, eager='auto'):
                 eager_import_flag = True
     else:
         eager_import_flag = eager
-    if eager_import_flag:
+    if eager_import_flag == 'background':
+        __getattr__('warmup')(background=True)
+    elif eager_import_flag:
         for name in submodules:
             __getattr__(name)
 
@@ -219,6 +224,7 @@ __getattr__ = lazy_import(
             'autoplt',
             'autosns',
             'set_mpl_backend',
+            'warmup',
         ],
         'draw_conv': [
             'make_conv_images',
@@ -228,6 +234,7 @@ __getattr__ = lazy_import(
             'ArtistManager',
             'FigureFinalizer',
             'FigureManager',
+            'FigurePool',
             'LabelManager',
             'Palette',
             'PaletteManager',
@@ -242,6 +249,8 @@ __getattr__ = lazy_import(
         ],
         'mpl_color': [
             'Color',
+            'resolve_color',
+            'resolve_many',
         ],
         'mpl_core': [
             'FigureAxes',
@@ -255,7 +264,9 @@ __getattr__ = lazy_import(
             'legend',
             'next_fnum',
             'phantom_legend',
+            'release_all',
             'set_figtitle',
+            'set_max_figures',
             'show_if_requested',
         ],
         'mpl_draw': [
@@ -267,6 +278,9 @@ __getattr__ = lazy_import(
             'draw_text_on_image',
             'plot_matrix',
         ],
+        'mpl_live': [
+            'LiveImage',
+        ],
         'mpl_make': [
             'make_heatmask',
             'make_legend_img',
@@ -277,6 +291,10 @@ __getattr__ = lazy_import(
         'mpl_multiplot': [
             'multi_plot',
         ],
+        'mpl_parallel': [
+            'RenderResult',
+            'render_many',
+        ],
         'mpl_plotnums': [
             'PlotNums',
         ],
@@ -295,18 +313,20 @@ def __dir__():
     return __all__
 
 __all__ = ['ArtistManager', 'BackendContext', 'Color', 'FigureAxes',
-           'FigureFinalizer', 'FigureManager', 'LabelManager',
-           'MonkeyPatchPyPlotFigureContext', 'Palette', 'PaletteManager',
-           'PlotNums', 'all_figures', 'autompl', 'autoplt', 'autosns',
-           'close_figures', 'cropwhite_ondisk', 'dataframe_table',
-           'distinct_colors', 'distinct_markers', 'draw_boxes',
-           'draw_boxes_on_image', 'draw_clf_on_image', 'draw_line_segments',
-           'draw_points', 'draw_text_on_image', 'ensure_fnum',
-           'extract_legend', 'figure', 'fix_matplotlib_dates',
-           'fix_matplotlib_timedeltas', 'humanize_dataframe', 'imshow',
-           'legend', 'make_conv_images', 'make_heatmask', 'make_legend_img',
-           'make_orimask', 'make_vector_field', 'multi_plot', 'next_fnum',
-           'phantom_legend', 'plot_convolutional_features', 'plot_matrix',
-           'plot_points3d', 'plot_surface3d', 'plt', 'pyplot',
-           'render_figure_to_image', 'seaborn', 'set_figtitle',
-           'set_mpl_backend', 'show_if_requested', 'sns']
+           'FigureFinalizer', 'FigureManager', 'FigurePool', 'LabelManager',
+           'LiveImage', 'MonkeyPatchPyPlotFigureContext', 'Palette',
+           'PaletteManager', 'PlotNums', 'RenderResult', 'all_figures',
+           'autompl', 'autoplt', 'autosns', 'close_figures',
+           'cropwhite_ondisk', 'dataframe_table', 'distinct_colors',
+           'distinct_markers', 'draw_boxes', 'draw_boxes_on_image',
+           'draw_clf_on_image', 'draw_line_segments', 'draw_points',
+           'draw_text_on_image', 'ensure_fnum', 'extract_legend', 'figure',
+           'fix_matplotlib_dates', 'fix_matplotlib_timedeltas',
+           'humanize_dataframe', 'imshow', 'legend', 'make_conv_images',
+           'make_heatmask', 'make_legend_img', 'make_orimask',
+           'make_vector_field', 'multi_plot', 'next_fnum', 'phantom_legend',
+           'plot_convolutional_features', 'plot_matrix', 'plot_points3d',
+           'plot_surface3d', 'plt', 'pyplot', 'release_all',
+           'render_figure_to_image', 'render_many', 'resolve_color',
+           'resolve_many', 'seaborn', 'set_figtitle', 'set_max_figures',
+           'set_mpl_backend', 'show_if_requested', 'sns', 'warmup']
@@ -4,15 +4,78 @@ use before importing pyplot.
 """
 import sys
 import os
+import time
+import contextlib
+import threading
 import ubelt as ub
 
 __all__ = [
     'autompl', 'autoplt', 'autosns', 'set_mpl_backend', 'BackendContext',
+    'warmup',
 ]
 
 
 _qtensured = False
 
+# Timing breakdown of the most recent call to autompl that chose a backend
+# (and the pyplot / seaborn imports done by autoplt / autosns afterwards).
+# Calls that skip the probe keep this report.
+last_probe_report = None
+
+# Holds the report that steps are currently recorded into. This is only set
+# while autompl is running, and is thread local so a background probe records
+# into its own report.
+_report_state = threading.local()
+
+
+def _new_probe_report():
+    """
+    Start a new timing report and make it the module level
+    :data:`last_probe_report`.
+
+    Returns:
+        Dict[str, Any]
+    """
+    global last_probe_report
+    last_probe_report = {
+        'backend': None,
+        'source': None,
+        'steps': [],
+        'total_seconds': 0.0,
+    }
+    return last_probe_report
+
+
+@contextlib.contextmanager
+def _report_step(name, report=None):
+    """
+    Context manager that records how long the body took as a named step in
+    the active report (or the given report).
+
+    Args:
+        name (str): name of the step
+        report (Dict | None): defaults to the report of the running autompl
+
+    Example:
+        >>> from kwplot import auto_backends
+        >>> report = auto_backends._new_probe_report()
+        >>> with auto_backends._report_step('nothing', report=report):
+        >>>     ...
+        >>> assert report['steps'][0]['step'] == 'nothing'
+        >>> assert report['steps'][0]['seconds'] >= 0
+    """
+    if report is None:
+        report = getattr(_report_state, 'report', None)
+    row = {'step': name, 'seconds': None}
+    start = time.perf_counter()
+    try:
+        yield row
+    finally:
+        row['seconds'] = time.perf_counter() - start
+        if report is not None:
+            report['steps'].append(row)
+            report['total_seconds'] = sum(r['seconds'] for r in report['steps'])
+
 
 def _current_ipython_session():
     """
@@ -79,8 +142,10 @@ def set_mpl_backend(backend, verbose=0):
         print('[kwplot.set_mpl_backend] backend={}'.format(backend))
     if backend.lower().startswith('qt'):
         # handle interactive qt case
-        _qtensure()
-    current_backend = mpl.get_backend()
+        with _report_step('qtensure'):
+            _qtensure()
+    with _report_step('mpl.get_backend'):
+        current_backend = _get_backend_without_autoselect(mpl)
     if verbose:
         mpl_config_fpath = mpl.matplotlib_fname()
         print('[kwplot.set_mpl_backend] mpl config file={}'.format(mpl_config_fpath))
@@ -92,11 +157,13 @@ def set_mpl_backend(backend, verbose=0):
             from matplotlib import pyplot as plt
             if verbose:
                 print('[kwplot.set_mpl_backend] plt.switch_backend({!r})'.format(current_backend))
-            plt.switch_backend(backend)
+            with _report_step('plt.switch_backend'):
+                plt.switch_backend(backend)
         else:
             if verbose:
                 print('[kwplot.set_mpl_backend] mpl.use({!r})'.format(backend))
-            mpl.use(backend)
+            with _report_step('mpl.use'):
+                mpl.use(backend)
     else:
         if verbose:
             print('[kwplot.set_mpl_backend] not changing backends')
@@ -104,10 +171,27 @@ def set_mpl_backend(backend, verbose=0):
         print('[kwplot.set_mpl_backend] new_backend = {!r}'.format(mpl.get_backend()))
 
 
+def _get_backend_without_autoselect(mpl):
+    """
+    Returns the current matplotlib backend, or None if it has not been
+    resolved yet.
+
+    In newer matplotlib versions :func:`matplotlib.get_backend` resolves the
+    "auto" backend by importing pyplot, which is expensive and pointless if we
+    are about to choose the backend ourselves.
+    """
+    try:
+        return mpl.get_backend(auto_select=False)
+    except TypeError:
+        # matplotlib < 3.10
+        return mpl.get_backend()
+
+
 _AUTOMPL_WAS_RUN = False
 
 
-def autompl(verbose=0, recheck=False, force=None):
+def autompl(verbose=0, recheck=False, force=None, return_info=False,
+            background=False):
     """
     Uses platform heuristics to automatically set the matplotlib backend.
     If no display is available it will be set to `agg`, otherwise we will try
@@ -119,7 +203,9 @@ def autompl(verbose=0, recheck=False, force=None):
 
         recheck (bool):
             if False, this function will not run if it has already been called
-            (this can save a significant amount of time).
+            (this can save a significant amount of time). If True, the on-disk
+            backend cache and the ``KWPLOT_AUTOMPL_BACKEND`` environment
+            variable are ignored and a fresh probe is run.
 
         force (str | int | None):
             If None or "auto", then the backend will only be set if this
@@ -127,6 +213,38 @@ def autompl(verbose=0, recheck=False, force=None):
             chosen backend, which is a string that :func:`matplotlib.use` would
             accept (e.g. Agg or Qt5Agg).
 
+        return_info (bool):
+            if True, return a report with a timing breakdown of each step.
+            The same report is always available as
+            :data:`kwplot.auto_backends.last_probe_report`.
+
+        background (bool):
+            if True, determine the backend and import pyplot in a daemon
+            thread and return immediately. The thread is joined the first time
+            pyplot is needed (e.g. by :func:`kwplot.figure`,
+            :func:`kwplot.imshow`, :func:`kwplot.autoplt`, or ``kwplot.plt``).
+            This lets the expensive probe overlap with other startup work.
+            Interactive backends are still set on the thread that joins.
+
+    Returns:
+        None | Dict[str, Any]:
+            the timing report if ``return_info`` is True. It contains the
+            chosen "backend", the "source" of the decision (e.g. "probe",
+            "cache", "environ", "force", or "skipped"), and a list of "steps"
+            with the number of "seconds" each took.
+
+    Note:
+        Determining the best backend can be expensive (it may check the X
+        server and import Qt bindings). The X server is checked in every
+        process, but the Qt part of the decision is cached on disk and reused
+        by other processes in the same environment. The cache is keyed on the
+        location and modification time of the Qt / cv2 modules and the
+        matplotlib version. Set the environment variable
+        ``KWPLOT_AUTOMPL_CACHE=0`` to disable this cache.
+
+        A parent process can export ``KWPLOT_AUTOMPL_BACKEND`` (e.g. to
+        ``agg``) so its children skip the probe entirely.
+
     CommandLine:
         # Checks
         export QT_DEBUG_PLUGINS=1
@@ -139,11 +257,80 @@ def autompl(verbose=0, recheck=False, force=None):
         >>> plt = autoplt(verbose=1)
         >>> plt.figure()
 
+    Example:
+        >>> from kwplot.auto_backends import *  # NOQA
+        >>> report = autompl(return_info=True)
+        >>> assert report['source'] in {'probe', 'cache', 'environ', 'skipped'}
+        >>> for row in report['steps']:
+        >>>     print('{step}: {seconds:.4f}'.format(**row))
+        >>> # Later calls that skip the probe keep the existing report
+        >>> autoplt()
+        >>> assert autompl(return_info=True) is report
+        >>> from kwplot import auto_backends
+        >>> assert auto_backends.last_probe_report is report
+
+    Example:
+        >>> from kwplot.auto_backends import *  # NOQA
+        >>> from kwplot import auto_backends
+        >>> autompl(recheck=True, background=True)
+        >>> # ... do other expensive startup work here ...
+        >>> plt = autoplt()  # joins the background thread
+        >>> assert auto_backends._BACKGROUND_PROBE is None
+
     References:
         https://stackoverflow.com/questions/637005/check-if-x-server-is-running
         https://matplotlib.org/stable/users/explain/figure/backends.html
     """
     global _AUTOMPL_WAS_RUN
+    global _BACKGROUND_PROBE
+    # Finish any pending background probe before we make new decisions
+    joined_report = _join_background_probe()
+    if joined_report is not None and not recheck and force is None:
+        # The background probe already did the work for this call
+        if return_info:
+            return joined_report
+        return
+
+    if (not recheck and force is None and _AUTOMPL_WAS_RUN and
+            last_probe_report is not None):
+        # Keep the report of the call that did the work, so repeated calls
+        # (e.g. from autoplt or kwplot.plt) do not replace it.
+        if verbose > 2:
+            print('[kwplot.autompl] Check already ran and recheck=False. Skipping')
+        if return_info:
+            return last_probe_report
+        return
+
+    report = _new_probe_report()
+    if background and force in {None, 'auto'} and (
+            recheck or force == 'auto' or not _AUTOMPL_WAS_RUN):
+        _run_inline_magic_in_colab(verbose)
+        _BACKGROUND_PROBE = _BackgroundProbe(
+            report, verbose=verbose, recheck=recheck or force == 'auto')
+        _BACKGROUND_PROBE.start()
+        _AUTOMPL_WAS_RUN = True
+        if return_info:
+            return report
+        return
+
+    _report_state.report = report
+    try:
+        _autompl(report, verbose=verbose, recheck=recheck, force=force)
+    finally:
+        _report_state.report = None
+
+    if verbose > 1:
+        print('[kwplot.autompl] report = {}'.format(ub.urepr(report, nl=2, precision=4)))
+
+    if return_info:
+        return report
+
+
+def _autompl(report, verbose=0, recheck=False, force=None):
+    """
+    Implementation of :func:`autompl` that records into a timing report.
+    """
+    global _AUTOMPL_WAS_RUN
     if verbose > 2:
         print('[kwplot.autompl] Called autompl')
 
@@ -153,18 +340,123 @@ def autompl(verbose=0, recheck=False, force=None):
     elif force is not None:
         _run_inline_magic_in_colab(verbose)
         set_mpl_backend(force, verbose=verbose)
+        report['backend'] = force
+        report['source'] = 'force'
         _AUTOMPL_WAS_RUN = True
 
     if recheck or not _AUTOMPL_WAS_RUN:
         _run_inline_magic_in_colab(verbose)
-        backend = _determine_best_backend(verbose=verbose)
+        backend = _lookup_best_backend(verbose=verbose, recheck=recheck)
         if backend is not None:
             set_mpl_backend(backend, verbose=verbose)
+        report['backend'] = backend
 
         _AUTOMPL_WAS_RUN = True
     else:
         if verbose > 2:
             print('[kwplot.autompl] Check already ran and recheck=False. Skipping')
+        if report['source'] is None:
+            report['source'] = 'skipped'
+
+
+# The thread started by autompl(background=True), if it has not been joined
+_BACKGROUND_PROBE = None
+_BACKGROUND_LOCK = threading.Lock()
+
+# Backends that are safe to set from a background thread
+_NONINTERACTIVE_BACKENDS = {'agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template'}
+
+
+class _BackgroundProbe(threading.Thread):
+    """
+    Determines the best backend and imports pyplot in a daemon thread.
+
+    Interactive (e.g. Qt) backends are not set in this thread. They are set by
+    :func:`_join_background_probe` on the thread that needs pyplot.
+    """
+
+    def __init__(self, report, verbose=0, recheck=False):
+        super().__init__(name='kwplot-autompl', daemon=True)
+        self.report = report
+        self.verbose = verbose
+        self.recheck = recheck
+        self.backend = None
+        self.backend_was_set = False
+        self.error = None
+
+    def run(self):
+        _report_state.report = self.report
+        try:
+            self.backend = _lookup_best_backend(verbose=self.verbose,
+                                                recheck=self.recheck)
+            self.report['backend'] = self.backend
+            if self.backend is not None and self.backend.lower() in _NONINTERACTIVE_BACKENDS:
+                set_mpl_backend(self.backend, verbose=self.verbose)
+                self.backend_was_set = True
+            with _report_step('import_pyplot'):
+                from matplotlib import pyplot as plt  # NOQA
+        except BaseException as ex:
+            self.error = ex
+        finally:
+            _report_state.report = None
+
+
+def _join_background_probe():
+    """
+    Wait for a pending ``autompl(background=True)`` probe to finish and set
+    its backend if the background thread did not.
+
+    This is cheap if there is no pending probe, and is called by functions
+    that need pyplot.
+
+    Returns:
+        Dict | None: the report of the joined probe, if there was one
+
+    Raises:
+        Exception: the error of a failed probe. The next call to
+            :func:`autompl` will probe again.
+
+    Example:
+        >>> from kwplot import auto_backends
+        >>> from unittest import mock
+        >>> # Simulate a background probe that failed
+        >>> probe = auto_backends._BackgroundProbe(report={})
+        >>> probe.error = RuntimeError('simulated failure')
+        >>> probe.join = lambda: None
+        >>> with mock.patch.object(auto_backends, '_AUTOMPL_WAS_RUN', True):
+        >>>     with mock.patch.object(auto_backends, '_BACKGROUND_PROBE', probe):
+        >>>         try:
+        >>>             auto_backends._join_background_probe()
+        >>>         except RuntimeError:
+        >>>             ...
+        >>>         else:
+        >>>             raise AssertionError('the error should be raised')
+        >>>     assert not auto_backends._AUTOMPL_WAS_RUN
+    """
+    global _BACKGROUND_PROBE
+    global _AUTOMPL_WAS_RUN
+    if _BACKGROUND_PROBE is None:
+        return None
+    with _BACKGROUND_LOCK:
+        probe = _BACKGROUND_PROBE
+        if probe is None:
+            return None
+        probe.join()
+        _BACKGROUND_PROBE = None
+        try:
+            if probe.error is not None:
+                raise probe.error
+            if probe.backend is not None and not probe.backend_was_set:
+                _report_state.report = probe.report
+                try:
+                    set_mpl_backend(probe.backend, verbose=probe.verbose)
+                finally:
+                    _report_state.report = None
+        except BaseException:
+            # The probe did not finish, so the next autompl must run it again
+            _AUTOMPL_WAS_RUN = False
+            raise
+        return probe.report
 
 
 def _run_inline_magic_in_colab(verbose):
@@ -179,6 +471,141 @@ def _run_inline_magic_in_colab(verbose):
             ipy.run_line_magic('matplotlib', 'inline')
 
 
+def _backend_cache_depends():
+    """
+    Information that, if changed, could change the result of
+    :func:`_determine_best_qt_backend`.
+
+    Returns:
+        Dict[str, Any]
+
+    Example:
+        >>> from kwplot.auto_backends import _backend_cache_depends
+        >>> depends = _backend_cache_depends()
+        >>> assert 'DISPLAY' not in depends
+        >>> assert 'matplotlib' in depends
+    """
+    # Matplotlib is imported by set_mpl_backend anyway, so this costs nothing
+    import matplotlib as mpl
+    depends = {
+        'executable': sys.executable,
+        'platform': sys.platform,
+        'KWPLOT_UNSAFE': os.environ.get('KWPLOT_UNSAFE', ''),
+    }
+    for modname in ['PyQt6', 'PyQt5', 'PyQt4', 'cv2']:
+        modpath = ub.modname_to_modpath(modname)
+        if modpath is None:
+            depends[modname] = None
+        else:
+            try:
+                mtime = os.stat(modpath).st_mtime
+            except OSError:
+                mtime = None
+            depends[modname] = (os.fspath(modpath), mtime)
+    depends['matplotlib'] = mpl.__version__
+    return depends
+
+
+def _backend_cacher():
+    """
+    Returns a cacher for the Qt backend decision or None if the cache is
+    disabled.
+
+    Returns:
+        ub.Cacher | None
+    """
+    cache_text = os.environ.get('KWPLOT_AUTOMPL_CACHE', '')
+    if cache_text.lower() in {'0', 'false', 'no', 'off'}:
+        return None
+    dpath = ub.Path.appdir('kwplot', 'autompl')
+    cacher = ub.Cacher('best_qt_backend', depends=_backend_cache_depends(),
+                       dpath=dpath, ext='.json', verbose=0)
+    return cacher
+
+
+def _set_report_source(source):
+    report = getattr(_report_state, 'report', None)
+    if report is not None:
+        report['source'] = source
+
+
+def _lookup_best_backend(verbose=0, recheck=False):
+    """
+    Determine the best backend, reusing a previous decision if possible.
+
+    The decision is taken from (in order of precedence): the
+    ``KWPLOT_AUTOMPL_BACKEND`` environment variable or a fresh check of the
+    display. If the display is usable, the Qt backend is taken from the
+    on-disk cache, or from a fresh probe with
+    :func:`_determine_best_qt_backend`. If recheck is True, the fresh probe is
+    always run and the on-disk cache is updated.
+
+    The display is checked in every process, because whether the X server is
+    reachable can change while ``DISPLAY`` stays the same (e.g. a closed ssh
+    tunnel). Only the expensive Qt import and conflict checks are cached.
+
+    Args:
+        verbose (int): verbosity level
+        recheck (bool): if True, always run a fresh probe
+
+    Returns:
+        str | None
+
+    Example:
+        >>> from kwplot.auto_backends import _lookup_best_backend
+        >>> import os
+        >>> from unittest import mock
+        >>> with mock.patch.dict(os.environ, {'KWPLOT_AUTOMPL_BACKEND': 'agg'}):
+        >>>     assert _lookup_best_backend() == 'agg'
+        >>> with mock.patch.dict(os.environ, {'DISPLAY': ''}):
+        >>>     assert _lookup_best_backend(recheck=True) == 'agg'
+    """
+    if not recheck:
+        environ_backend = os.environ.get('KWPLOT_AUTOMPL_BACKEND', '')
+        if environ_backend:
+            _set_report_source('environ')
+            if verbose:
+                print('[kwplot.autompl] Using KWPLOT_AUTOMPL_BACKEND={!r}'.format(environ_backend))
+            return environ_backend
+
+    if sys.platform.startswith('win32'):
+        # There are no expensive heuristics to cache on windows
+        _set_report_source('probe')
+        return _determine_best_backend(verbose=verbose)
+
+    _set_report_source('probe')
+    if not _check_display(verbose=verbose):
+        if verbose:
+            print('[kwplot.autompl] No display, agg is probably best')
+        return 'agg'
+
+    try:
+        cacher = _backend_cacher()
+    except OSError:
+        cacher = None
+
+    if cacher is not None and not recheck:
+        with _report_step('cache_lookup'):
+            data = cacher.tryload(on_error='clear')
+        if data is not None:
+            _set_report_source('cache')
+            backend = data['backend']
+            if verbose:
+                print('[kwplot.autompl] Using cached backend={!r} from {}'.format(
+                    backend, cacher.get_fpath()))
+            return backend
+
+    backend = _determine_best_qt_backend(verbose=verbose)
+
+    if cacher is not None:
+        try:
+            cacher.save({'backend': backend})
+        except OSError:
+            if verbose:
+                print('[kwplot.autompl] Unable to write the backend cache')
+    return backend
+
+
 def _determine_best_backend(verbose):
     """
     Helper to determine what a good backend would be for autompl
@@ -192,137 +619,177 @@ def _determine_best_backend(verbose):
             print('[kwplot.autompl] No heuristics implemented on windows')
         return None
 
-    backend_infos = {}
-    backend_infos['pyqt6'] = {'usable': None}
-    backend_infos['pyqt5'] = {'usable': None}
-    backend_infos['pyqt4'] = {'usable': None}
+    if not _check_display(verbose=verbose):
+        if verbose:
+            print('[kwplot.autompl] No display, agg is probably best')
+        return 'agg'
+    return _determine_best_qt_backend(verbose=verbose)
+
+
+def _check_display(verbose=0):
+    """
+    Check if there is a display that GUI backends could use. On Linux this
+    checks that the X server in ``DISPLAY`` is reachable.
+
+    Args:
+        verbose (int): verbosity level
 
+    Returns:
+        bool
+    """
     DISPLAY = os.environ.get('DISPLAY', '')
     if DISPLAY:
-        if sys.platform.startswith('linux') and ub.find_exe('xdpyinfo'):
+        if sys.platform.startswith('linux'):
             # On Linux, check if we can actually connect to X
-            # NOTE: this call takes a significant amount of time
-            info = ub.cmd('xdpyinfo', shell=True)
+            with _report_step('display_check'):
+                reachable = _probe_x11_display(DISPLAY)
             if verbose > 3:
-                print('xdpyinfo-info = {}'.format(ub.repr2(info)))
-            if info['ret'] != 0:
+                print('x11-probe-reachable = {!r}'.format(reachable))
+            if reachable is None and ub.find_exe('xdpyinfo'):
+                # Fallback when the native probe does not understand DISPLAY
+                # NOTE: this call takes a significant amount of time
+                with _report_step('display_check_xdpyinfo'):
+                    info = ub.cmd('xdpyinfo', shell=True)
+                if verbose > 3:
+                    print('xdpyinfo-info = {}'.format(ub.repr2(info)))
+                reachable = info['ret'] == 0
+            if reachable is False:
                 DISPLAY = None
 
     if verbose:
         print('[kwplot.autompl] DISPLAY = {!r}'.format(DISPLAY))
+    return bool(DISPLAY)
 
-    if not DISPLAY:
-        if verbose:
-            print('[kwplot.autompl] No display, agg is probably best')
-        backend = 'agg'
-    else:
-        """
-        Note:
 
-            May encounter error that crashes the program, not sure why
-            this happens yet. The current workaround is to uninstall
-            PyQt5, but that isn't sustainable.
+def _determine_best_qt_backend(verbose):
+    """
+    Determine the best Qt backend, assuming there is a usable display.
 
-            QObject::moveToThread: Current thread (0x7fe8d965d030) is not the object's thread (0x7fffb0f64340).
-            Cannot move to target thread (0x7fe8d965d030)
+    Args:
+        verbose (int): verbosity level
 
+    Returns:
+        str: a Qt backend or "agg" if none of the Qt bindings are usable
+    """
+    backend_infos = {}
+    backend_infos['pyqt6'] = {'usable': None}
+    backend_infos['pyqt5'] = {'usable': None}
+    backend_infos['pyqt4'] = {'usable': None}
 
-            qt.qpa.plugin: Could not load the Qt platform plugin "xcb" in "" even though it was found.
-            This application failed to start because no Qt platform plugin could be initialized. Reinstalling the application may fix this problem.
+    """
+    Note:
 
-            Available platform plugins are: eglfs, linuxfb, minimal, minimalegl, offscreen, vnc, wayland-egl, wayland, wayland-xcomposite-egl, wayland-xcomposite-glx, webgl, xcb.
+        May encounter error that crashes the program, not sure why
+        this happens yet. The current workaround is to uninstall
+        PyQt5, but that isn't sustainable.
 
+        QObject::moveToThread: Current thread (0x7fe8d965d030) is not the object's thread (0x7fffb0f64340).
+        Cannot move to target thread (0x7fe8d965d030)
 
-        UPDATE 2021-01-04:
 
-            By setting
+        qt.qpa.plugin: Could not load the Qt platform plugin "xcb" in "" even though it was found.
+        This application failed to start because no Qt platform plugin could be initialized. Reinstalling the application may fix this problem.
 
-            export QT_DEBUG_PLUGINS=1
+        Available platform plugins are: eglfs, linuxfb, minimal, minimalegl, offscreen, vnc, wayland-egl, wayland, wayland-xcomposite-egl, wayland-xcomposite-glx, webgl, xcb.
 
-            I was able to look at more debug information. It turns out
-            that it was grabbing the xcb plugin from the opencv-python
-            package. I uninstalled that package and then installed
-            opencv-python-headless which does not include an xcb
-            binary. However, now the it is missing "libxcb-xinerama".
 
-            May be able to do something with:
-                conda install -c conda-forge xorg-libxinerama
+    UPDATE 2021-01-04:
 
-                # But that didnt work I had to
-                pip uninstall PyQt5
+        By setting
 
-                # This seems to work correctly
-                conda install -c anaconda pyqt
+        export QT_DEBUG_PLUGINS=1
 
-        UPDATE 2024-08-11:
+        I was able to look at more debug information. It turns out
+        that it was grabbing the xcb plugin from the opencv-python
+        package. I uninstalled that package and then installed
+        opencv-python-headless which does not include an xcb
+        binary. However, now the it is missing "libxcb-xinerama".
 
-             For PyQt6, I got the error message:
-                 "From 6.5.0, xcb-cursor0 or libxcb-cursor0 is needed to load
-                 the Qt xcb platform plugin."
+        May be able to do something with:
+            conda install -c conda-forge xorg-libxinerama
 
-             And was able to resolve it by installing a system library:
+            # But that didnt work I had to
+            pip uninstall PyQt5
 
-                 sudo apt-get install -y libxcb-cursor-dev
-        """
+            # This seems to work correctly
+            conda install -c anaconda pyqt
 
-        # Enumerate backends and candidate module paths that might exist
-        backend_infos['pyqt6']['modpath'] = ub.modname_to_modpath('PyQt6')
-        backend_infos['pyqt5']['modpath'] = ub.modname_to_modpath('PyQt5')
-        backend_infos['pyqt4']['modpath'] = ub.modname_to_modpath('PyQt4')
+    UPDATE 2024-08-11:
 
-        for k, info in backend_infos.items():
-            if info['modpath'] is None:
-                info['usable'] = False
+         For PyQt6, I got the error message:
+             "From 6.5.0, xcb-cursor0 or libxcb-cursor0 is needed to load
+             the Qt xcb platform plugin."
 
-        if backend_infos['pyqt6']['modpath']:
-            try:
+         And was able to resolve it by installing a system library:
+
+             sudo apt-get install -y libxcb-cursor-dev
+    """
+
+    # Enumerate backends and candidate module paths that might exist
+    backend_infos['pyqt6']['modpath'] = ub.modname_to_modpath('PyQt6')
+    backend_infos['pyqt5']['modpath'] = ub.modname_to_modpath('PyQt5')
+    backend_infos['pyqt4']['modpath'] = ub.modname_to_modpath('PyQt4')
+
+    for k, info in backend_infos.items():
+        if info['modpath'] is None:
+            info['usable'] = False
+
+    if backend_infos['pyqt6']['modpath']:
+        try:
+            with _report_step('import_pyqt6'):
                 import PyQt6  # NOQA
                 from PyQt6 import QtCore  # NOQA
-            except ImportError as ex:
-                if verbose:
-                    print('[kwplot.autompl] No PyQt6, agg is probably best')
-                backend_infos['pyqt6']['usable'] = False
-                backend_infos['pyqt6']['importable'] = False
-                backend_infos['pyqt6']['import_error'] = repr(ex)
-            else:
-                backend_infos['pyqt6']['usable'] = True
-                backend_infos['pyqt6']['importable'] = True
-                KWPLOT_UNSAFE = os.environ.get('KWPLOT_UNSAFE', '')
-                TRY_AVOID_CRASH = KWPLOT_UNSAFE.lower() not in ['1', 'true', 'yes']
-                if TRY_AVOID_CRASH and ub.LINUX:
-                    # HOLD UP. Lets try to avoid a crash.
-                    if _check_for_linux_opencv_qt_conflicts(QtCore):
-                        backend_infos['pyqt6']['usable'] = False
-        elif backend_infos['pyqt5']['modpath']:
-            try:
+        except ImportError as ex:
+            if verbose:
+                print('[kwplot.autompl] No PyQt6, agg is probably best')
+            backend_infos['pyqt6']['usable'] = False
+            backend_infos['pyqt6']['importable'] = False
+            backend_infos['pyqt6']['import_error'] = repr(ex)
+        else:
+            backend_infos['pyqt6']['usable'] = True
+            backend_infos['pyqt6']['importable'] = True
+            KWPLOT_UNSAFE = os.environ.get('KWPLOT_UNSAFE', '')
+            TRY_AVOID_CRASH = KWPLOT_UNSAFE.lower() not in ['1', 'true', 'yes']
+            if TRY_AVOID_CRASH and ub.LINUX:
+                # HOLD UP. Lets try to avoid a crash.
+                with _report_step('qt_cv2_conflict_scan'):
+                    has_conflict = _check_for_linux_opencv_qt_conflicts(QtCore)
+                if has_conflict:
+                    backend_infos['pyqt6']['usable'] = False
+    elif backend_infos['pyqt5']['modpath']:
+        try:
+            with _report_step('import_pyqt5'):
                 import PyQt5  # NOQA
                 from PyQt5 import QtCore  # NOQA
-            except ImportError as ex:
-                if verbose:
-                    print('[kwplot.autompl] No PyQt5, agg is probably best')
-                backend_infos['pyqt5']['usable'] = False
-                backend_infos['pyqt5']['importable'] = False
-                backend_infos['pyqt5']['import_error'] = repr(ex)
-            else:
-                backend_infos['pyqt5']['usable'] = True
-                backend_infos['pyqt5']['importable'] = True
-                KWPLOT_UNSAFE = os.environ.get('KWPLOT_UNSAFE', '')
-                TRY_AVOID_CRASH = KWPLOT_UNSAFE.lower() not in ['1', 'true', 'yes']
-                if TRY_AVOID_CRASH and ub.LINUX:
-                    # HOLD UP. Lets try to avoid a crash.
-                    if _check_for_linux_opencv_qt_conflicts(QtCore):
-                        backend_infos['pyqt5']['usable'] = False
-        elif backend_infos['pyqt4']['modpath']:
-            try:
+        except ImportError as ex:
+            if verbose:
+                print('[kwplot.autompl] No PyQt5, agg is probably best')
+            backend_infos['pyqt5']['usable'] = False
+            backend_infos['pyqt5']['importable'] = False
+            backend_infos['pyqt5']['import_error'] = repr(ex)
+        else:
+            backend_infos['pyqt5']['usable'] = True
+            backend_infos['pyqt5']['importable'] = True
+            KWPLOT_UNSAFE = os.environ.get('KWPLOT_UNSAFE', '')
+            TRY_AVOID_CRASH = KWPLOT_UNSAFE.lower() not in ['1', 'true', 'yes']
+            if TRY_AVOID_CRASH and ub.LINUX:
+                # HOLD UP. Lets try to avoid a crash.
+                with _report_step('qt_cv2_conflict_scan'):
+                    has_conflict = _check_for_linux_opencv_qt_conflicts(QtCore)
+                if has_conflict:
+                    backend_infos['pyqt5']['usable'] = False
+    elif backend_infos['pyqt4']['modpath']:
+        try:
+            with _report_step('import_pyqt4'):
                 import Qt4Agg  # NOQA
                 from PyQt4 import QtCore  # NOQA
-            except ImportError as ex:
-                backend_infos['pyqt4']['usable'] = False
-                backend_infos['pyqt4']['importable'] = False
-                backend_infos['pyqt4']['import_error'] = repr(ex)
-            else:
-                backend_infos['pyqt4']['importable'] = True
-                backend_infos['pyqt4']['usable'] = True
+        except ImportError as ex:
+            backend_infos['pyqt4']['usable'] = False
+            backend_infos['pyqt4']['importable'] = False
+            backend_infos['pyqt4']['import_error'] = repr(ex)
+        else:
+            backend_infos['pyqt4']['importable'] = True
+            backend_infos['pyqt4']['usable'] = True
 
     if backend_infos['pyqt6']['usable']:
         backend = 'QtAgg'
@@ -340,6 +807,110 @@ def _determine_best_backend(verbose):
     return backend
 
 
+def _parse_x11_display(display):
+    """
+    Parse an X11 DISPLAY string of the form ``[host]:number[.screen]``.
+
+    Args:
+        display (str): the value of the DISPLAY environment variable
+
+    Returns:
+        Tuple[str, int] | None:
+            The host (an empty string for a local display) and the display
+            number, or None if the string is not understood.
+
+    Example:
+        >>> from kwplot.auto_backends import _parse_x11_display
+        >>> assert _parse_x11_display(':0') == ('', 0)
+        >>> assert _parse_x11_display(':1.0') == ('', 1)
+        >>> assert _parse_x11_display('unix:2') == ('', 2)
+        >>> assert _parse_x11_display('localhost:10.0') == ('localhost', 10)
+        >>> assert _parse_x11_display('[::1]:3') == ('::1', 3)
+        >>> assert _parse_x11_display('wayland-0') is None
+        >>> assert _parse_x11_display('/private/tmp/org.xquartz:0') is None
+    """
+    host, sep, rest = display.rpartition(':')
+    if not sep or host.startswith('/'):
+        return None
+    number_text = rest.partition('.')[0]
+    if not number_text.isdigit():
+        return None
+    if host.endswith('/unix') or host == 'unix':
+        host = ''
+    if host.startswith('[') and host.endswith(']'):
+        host = host[1:-1]
+    return host, int(number_text)
+
+
+def _probe_x11_display(display, timeout=0.5, socket_dpath='/tmp/.X11-unix'):
+    """
+    Check if an X server is accepting connections on a display without
+    spawning a subprocess.
+
+    Local displays are checked by connecting to the unix socket
+    ``<socket_dpath>/X<n>`` (and its abstract namespace variant on Linux).
+    Remote displays (e.g. SSH forwarded ones) are checked by connecting to TCP
+    port ``6000 + n`` on the host.
+
+    Args:
+        display (str): the value of the DISPLAY environment variable
+
+        timeout (float): maximum number of seconds to wait for a connection
+
+        socket_dpath (str | PathLike): directory containing local X sockets
+
+    Returns:
+        bool | None:
+            True if the X server accepted a connection, False if it did not,
+            and None if DISPLAY could not be interpreted.
+
+    Example:
+        >>> from kwplot.auto_backends import _probe_x11_display
+        >>> import socket
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('kwplot', 'tests', 'x11probe').delete().ensuredir()
+        >>> server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        >>> server.bind(str(dpath / 'X7'))
+        >>> server.listen(1)
+        >>> assert _probe_x11_display(':7', socket_dpath=dpath) is True
+        >>> assert _probe_x11_display(':8', socket_dpath=dpath) is False
+        >>> assert _probe_x11_display('wayland-0', socket_dpath=dpath) is None
+        >>> server.close()
+        >>> dpath.delete()
+    """
+    import socket
+    parsed = _parse_x11_display(display)
+    if parsed is None:
+        return None
+    host, number = parsed
+    if host:
+        try:
+            sock = socket.create_connection((host, 6000 + number),
+                                            timeout=timeout)
+        except OSError:
+            return False
+        sock.close()
+        return True
+    else:
+        socket_fpath = os.path.join(os.fspath(socket_dpath), 'X{}'.format(number))
+        candidates = [socket_fpath]
+        if sys.platform.startswith('linux'):
+            # Modern X servers also listen in the abstract namespace
+            candidates.append('\0' + socket_fpath)
+        for address in candidates:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(address)
+            except OSError:
+                continue
+            else:
+                return True
+            finally:
+                sock.close()
+        return False
+
+
 def _check_for_linux_opencv_qt_conflicts(QtCore):
     """
     See if there are conflicting shared object files for qt
@@ -416,8 +987,15 @@ def autoplt(verbose=0, recheck=False, force=None):
     Returns:
         ModuleType
     """
-    autompl(verbose=verbose, recheck=recheck, force=force)
-    from matplotlib import pyplot as plt
+    report = autompl(verbose=verbose, recheck=recheck, force=force,
+                     return_info=True)
+    # Only the first import is recorded, so repeated calls do not grow the
+    # report.
+    if 'matplotlib.pyplot' in sys.modules:
+        from matplotlib import pyplot as plt
+    else:
+        with _report_step('import_pyplot', report=report):
+            from matplotlib import pyplot as plt
     return plt
 
 
@@ -435,12 +1013,122 @@ def autosns(verbose=0, recheck=False, force=None):
     Returns:
         ModuleType
     """
-    autompl(verbose=verbose, recheck=recheck, force=force)
-    import seaborn as sns
-    sns.set()
+    report = autompl(verbose=verbose, recheck=recheck, force=force,
+                     return_info=True)
+    # Only the first import is recorded, so repeated calls do not grow the
+    # report.
+    if 'seaborn' in sys.modules:
+        import seaborn as sns
+        sns.set()
+        return sns
+    if 'matplotlib.pyplot' not in sys.modules:
+        with _report_step('import_pyplot', report=report):
+            from matplotlib import pyplot as plt  # NOQA
+    with _report_step('import_seaborn', report=report):
+        import seaborn as sns
+    with _report_step('sns.set', report=report):
+        sns.set()
     return sns
 
 
+# The steps that :func:`warmup` knows how to run, in the order they are run
+_WARMUP_STEPS = ['kwplot', 'kwimage', 'pyplot', 'font_manager', 'render']
+
+# The lazy kwplot submodules used by common plotting calls. Optional heavy
+# integrations (e.g. seaborn, pandas tables) are not warmed by default.
+_WARMUP_KWPLOT_SUBMODULES = [
+    'mpl_core', 'mpl_color', 'mpl_draw', 'mpl_make', 'mpl_multiplot',
+    'mpl_plotnums', 'managers',
+]
+
+
+def warmup(background=True, modules=None, verbose=0):
+    """
+    Pay the one-off costs of the first plot ahead of time.
+
+    The first plot in a process is dominated by importing pyplot, loading the
+    font manager cache, importing kwimage, and the first Agg text layout.
+    This does all of those (rendering a tiny throwaway figure with text on an
+    unmanaged Agg canvas), so the first real plot in a long running process
+    is fast. This does not choose or switch the matplotlib backend.
+
+    Setting the environment variable ``EAGER_IMPORT=background`` calls this
+    in the background when kwplot is imported.
+
+    Args:
+        background (bool):
+            if True, run in a daemon thread and return immediately.
+
+        modules (List[str] | None):
+            what to warm up. Can contain "kwplot" (imports the lazy
+            plotting submodules of kwplot), "kwimage", "pyplot", "font_manager", and
+            "render". Any other name is imported as a module. Defaults to all
+            of the named steps.
+
+        verbose (int): verbosity level
+
+    Returns:
+        threading.Thread | Dict[str, Any]:
+            the started thread if background is True, otherwise a timing
+            report with the same structure as :data:`last_probe_report`.
+
+    Example:
+        >>> from kwplot.auto_backends import *  # NOQA
+        >>> report = warmup(background=False, modules=['kwimage', 'render', 'json'])
+        >>> print([row['step'] for row in report['steps']])
+        ['kwimage', 'render', 'json']
+        >>> thread = warmup(modules=['font_manager'])
+        >>> thread.join()
+    """
+    if modules is None:
+        modules = _WARMUP_STEPS
+    report = {'steps': [], 'total_seconds': 0.0}
+    if not background:
+        _warmup(report, modules, verbose)
+        return report
+    thread = threading.Thread(target=_warmup, args=(report, modules, verbose),
+                              name='kwplot-warmup', daemon=True)
+    thread.report = report
+    thread.start()
+    return thread
+
+
+def _warmup(report, modules, verbose):
+    """
+    Runs the steps of :func:`warmup` in the current thread
+    """
+    import importlib
+    for name in modules:
+        try:
+            with _report_step(name, report=report):
+                if name == 'kwplot':
+                    for submod in _WARMUP_KWPLOT_SUBMODULES:
+                        importlib.import_module('kwplot.' + submod)
+                elif name == 'pyplot':
+                    from matplotlib import pyplot  # NOQA
+                elif name == 'font_manager':
+                    from matplotlib import font_manager
+                    font_manager.findfont(font_manager.FontProperties())
+                elif name == 'render':
+                    from kwplot import mpl_core
+                    fig = mpl_core.figure(pnum=None, managed=False)
+                    fig.set_size_inches(0.5, 0.5)
+                    ax = fig.add_subplot(1, 1, 1)
+                    ax.plot([0, 1], [0, 1])
+                    ax.set_title('warmup')
+                    fig.canvas.draw()
+                    fig.clf()
+                else:
+                    importlib.import_module(name)
+        except Exception as ex:
+            # Warmup is best effort, the real call will report the error
+            if verbose:
+                print('[kwplot.warmup] {} failed: {!r}'.format(name, ex))
+    if verbose:
+        for row in report['steps']:
+            print('[kwplot.warmup] {step}: {seconds:.4f}'.format(**row))
+
+
 class BackendContext:
     """
     Context manager that ensures a specific backend, but then reverts after the
@@ -450,6 +1138,10 @@ class BackendContext:
     chance for odd behavior to occur. Please submit and issue if you experience
     this and can document the environment that caused it.
 
+    If you only need to render a figure to an image, prefer
+    ``kwplot.figure(managed=False)``, which builds a figure on an Agg canvas
+    without switching the global backend.
+
     CommandLine:
         # Checks
         xdoctest -m kwplot.auto_backends BackendContext --check
@@ -488,6 +1180,7 @@ class BackendContext:
 
     def __enter__(self):
         import matplotlib as mpl
+        _join_background_probe()
         self.prev = mpl.get_backend()
 
         if self.prev in {'Qt5Agg', 'QtAgg'}:
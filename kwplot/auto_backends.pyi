@@ -1,6 +1,12 @@
 from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import List
+import threading
 from _typeshed import Incomplete
 
+last_probe_report: Dict[str, Any] | None
+
 
 def set_mpl_backend(backend: str, verbose: int = 0) -> None:
     ...
@@ -8,7 +14,9 @@ def set_mpl_backend(backend: str, verbose: int = 0) -> None:
 
 def autompl(verbose: int = 0,
             recheck: bool = False,
-            force: str | int | None = None) -> None:
+            force: str | int | None = None,
+            return_info: bool = False,
+            background: bool = False) -> None | Dict[str, Any]:
     ...
 
 
@@ -24,6 +32,12 @@ def autosns(verbose: int = ...,
     ...
 
 
+def warmup(background: bool = True,
+           modules: List[str] | None = None,
+           verbose: int = 0) -> threading.Thread | Dict[str, Any]:
+    ...
+
+
 class BackendContext:
     backend: Incomplete
     prev: Incomplete
@@ -80,7 +80,9 @@ def main():
         ...
     else:
         from kwplot.cli import gifify
+        from kwplot.cli import startup_report
         modal.register(gifify.Gifify)
+        modal.register(startup_report.StartupReportCLI)
 
         modal.run()
 
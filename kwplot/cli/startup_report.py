@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Report how long it takes kwplot to initialize matplotlib.
+
+This is useful for tracking cold-start regressions (e.g. in CI).
+"""
+import ubelt as ub
+import scriptconfig as scfg
+
+
+class StartupReportCLI(scfg.DataConfig):
+    """
+    Print a timing breakdown of :func:`kwplot.autompl` and the pyplot /
+    seaborn imports done by :func:`kwplot.autoplt` / :func:`kwplot.autosns`.
+
+    Example:
+        kwplot startup-report
+        kwplot startup-report --format=json
+        kwplot startup-report --seaborn --no-recheck
+    """
+    __command__ = 'startup-report'
+
+    format = scfg.Value('table', choices=['table', 'json'], help='output format')
+
+    recheck = scfg.Value(True, isflag=True, help=ub.paragraph(
+        '''
+        if True, ignore any cached backend decision and run a fresh probe
+        '''))
+
+    seaborn = scfg.Value(False, isflag=True, help='if True also time the seaborn import')
+
+    @classmethod
+    def main(cls, cmdline=True, **kwargs):
+        """
+        Example:
+            >>> from kwplot.cli.startup_report import *  # NOQA
+            >>> report = StartupReportCLI.main(cmdline=0, format='json', recheck=False)
+            >>> assert 'steps' in report
+        """
+        config = cls.cli(cmdline=cmdline, data=kwargs)
+        from kwplot import auto_backends
+        if config.seaborn:
+            auto_backends.autosns(recheck=config.recheck)
+        else:
+            auto_backends.autoplt(recheck=config.recheck)
+        report = auto_backends.last_probe_report
+        if config.format == 'json':
+            import json
+            print(json.dumps(report, indent='    '))
+        else:
+            print(format_report_table(report))
+        return report
+
+
+def format_report_table(report):
+    """
+    Format a :data:`kwplot.auto_backends.last_probe_report` as a text table
+
+    Args:
+        report (Dict[str, Any]): the report to format
+
+    Returns:
+        str
+
+    Example:
+        >>> from kwplot.cli.startup_report import *  # NOQA
+        >>> report = {
+        >>>     'backend': 'agg', 'source': 'cache', 'total_seconds': 0.3,
+        >>>     'steps': [{'step': 'cache_lookup', 'seconds': 0.1},
+        >>>               {'step': 'import_pyplot', 'seconds': 0.2}],
+        >>> }
+        >>> print(format_report_table(report))
+        backend: agg (source: cache)
+        step          | seconds
+        --------------+--------
+        cache_lookup  |  0.1000
+        import_pyplot |  0.2000
+        --------------+--------
+        total         |  0.3000
+    """
+    rows = [(row['step'], row['seconds']) for row in report['steps']]
+    width = max([len('total'), len('step')] + [len(name) for name, _ in rows])
+    lines = []
+    lines.append('backend: {} (source: {})'.format(report['backend'], report['source']))
+    lines.append('{} | seconds'.format('step'.ljust(width)))
+    sep = '-' * (width + 1) + '+' + '-' * len(' seconds')
+    lines.append(sep)
+    for name, seconds in rows:
+        lines.append('{} | {:7.4f}'.format(name.ljust(width), seconds))
+    lines.append(sep)
+    lines.append('{} | {:7.4f}'.format('total'.ljust(width), report['total_seconds']))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python -m kwplot.cli.startup_report
+    """
+    StartupReportCLI.main()
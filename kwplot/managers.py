@@ -2,8 +2,10 @@
 Manager classes to help construct concise matplotlib figures.
 """
 import ubelt as ub
-import matplotlib as mpl
-import matplotlib.text  # NOQA
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import matplotlib
 
 
 class FigureManager:
@@ -49,11 +51,112 @@ class FigureManager:
         final_fpath = self.finalizer.finalize(fig, fpath, **kwargs)
         return final_fpath
 
+    def flush(self):
+        """
+        Wait for pending asynchronous writes. See :func:`FigureFinalizer.flush`.
+        """
+        return self.finalizer.flush()
+
     def set_figtitle(self, *args, **kwargs):
         import kwplot
         kwplot.set_figtitle(*args, **kwargs, fig=self.fig)
 
 
+class FigurePool:
+    """
+    Keeps figures alive across loop iterations and recycles them.
+
+    Figures are keyed by their grid layout (i.e. the number of rows and
+    columns in the pnum), so subplots of the same layout are drawn on the same
+    figure. A requested size or dpi is applied to the pooled figure. When a
+    figure is reused with ``doclf=True``
+    only the data artists are removed, and the axes, tick locators, and label
+    objects are kept (see the ``recycle`` argument of :func:`kwplot.figure`).
+
+    Args:
+        managed (bool):
+            if False the pooled figures are not registered with pyplot.
+            See :func:`kwplot.figure`. Defaults to True.
+
+    Example:
+        >>> import kwplot
+        >>> from kwplot.managers import *  # NOQA
+        >>> pool = FigurePool(managed=False)
+        >>> seen = []
+        >>> for _ in range(3):
+        >>>     pnum_ = kwplot.PlotNums(nRows=1, nCols=2)
+        >>>     fig = pool.figure(pnum=pnum_(), figsize=(4, 2), dpi=50, doclf=True)
+        >>>     fig.gca().plot([1, 2, 3])
+        >>>     fig = pool.figure(pnum=pnum_())
+        >>>     fig.gca().plot([3, 2, 1])
+        >>>     seen.append(tuple(fig.axes))
+        >>> assert len(pool) == 1
+        >>> assert seen[0] == seen[1] == seen[2]
+        >>> assert all(len(ax.lines) == 1 for ax in fig.axes)
+        >>> # A new size is applied to the pooled figure
+        >>> fig2 = pool.figure(pnum=(1, 2, 1), figsize=(6, 3), doclf=True)
+        >>> assert fig2 is fig and tuple(fig.get_size_inches()) == (6, 3)
+        >>> pool.close()
+    """
+
+    def __init__(self, managed=True):
+        self.managed = managed
+        self._key_to_fig = {}
+
+    def __len__(self):
+        return len(self._key_to_fig)
+
+    def figure(self, pnum=(1, 1, 1), figsize=None, dpi=None, doclf=False,
+               **kwargs):
+        """
+        Lookup or create a figure with this layout, set its size and dpi, and
+        then call :func:`kwplot.figure` on it with ``recycle=True``.
+
+        Args:
+            pnum (Tuple[int, int, int]): plot number, the first two values
+                determine the layout used as the pool key.
+            figsize (Tuple[float, float] | None):
+                figure size in inches. If None the size is not changed.
+            dpi (float | None):
+                figure dots per inch. If None the dpi is not changed.
+            doclf (bool): if True, recycle the figure before drawing
+            **kwargs: passed to :func:`kwplot.figure`
+
+        Returns:
+            matplotlib.figure.Figure
+        """
+        import kwplot
+        from kwplot import mpl_core
+        if isinstance(pnum, int):
+            pnum = mpl_core._convert_pnum_int_to_tup(pnum)
+        key = None if pnum is None else tuple(pnum[0:2])
+        fig = self._key_to_fig.get(key, None)
+        if fig is None:
+            fnum = kwplot.next_fnum() if self.managed else None
+            fig = kwplot.figure(fnum=fnum, pnum=None, managed=self.managed)
+            self._key_to_fig[key] = fig
+        if figsize is not None and tuple(fig.get_size_inches()) != tuple(figsize):
+            fig.set_size_inches(figsize)
+        if dpi is not None and fig.get_dpi() != dpi:
+            fig.set_dpi(dpi)
+        return kwplot.figure(fig=fig, pnum=pnum, doclf=doclf, recycle=True,
+                             **kwargs)
+
+    def close(self):
+        """
+        Close all pooled figures
+        """
+        import kwplot
+        kwplot.close_figures(list(self._key_to_fig.values()))
+        self._key_to_fig.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 class LabelManager:
     """
     Registers multiple ways to relabel text on axes
@@ -138,7 +241,7 @@ class LabelManager:
             new_text = mapper(new_text)
         return new_text
 
-    def _modify_labels(self, label: mpl.text.Text):
+    def _modify_labels(self, label: 'matplotlib.text.Text'):
         # Handles labels, which are mpl Text objects
         text = label.get_text()
         new_text = self._modify_text(text)
@@ -318,11 +421,70 @@ class FigureFinalizer(ub.NiceRepr):
         bbox_extra_artists :
         pil_kwargs :
 
+    Args:
+        async_write (bool):
+            if True, :func:`FigureFinalizer.finalize` renders the figure into
+            memory (through ``savefig``, so the ``savefig.*`` rcParams apply)
+            and returns a :class:`concurrent.futures.Future`. Encoding,
+            cropping, and writing the image happen in a background thread pool,
+            so the caller can draw the next figure while the previous one is
+            written. Use :func:`FigureFinalizer.flush` to wait for all writes.
+
+        max_pending (int):
+            the maximum number of asynchronous writes in flight. When this many
+            are pending, ``finalize`` blocks until the oldest one finishes,
+            which bounds the memory held by rendered snapshots.
+
     Example:
         self = FigureFinalizer()
         print('self = {}'.format(ub.urepr(self, nl=1)))
         self.update(dpi=300)
 
+    Example:
+        >>> import kwplot
+        >>> from kwplot.managers import *  # NOQA
+        >>> dpath = ub.Path.appdir('kwplot/tests/finalizer_async').delete().ensuredir()
+        >>> self = FigureFinalizer(dpath=dpath, dpi=50, async_write=True, max_pending=2)
+        >>> futures = []
+        >>> for idx in range(4):
+        >>>     fig = kwplot.figure(managed=False, doclf=True)
+        >>>     fig.gca().plot([0, idx])
+        >>>     futures.append(self.finalize(fig, f'fig{idx}.png'))
+        >>> fpaths = self.flush()
+        >>> assert fpaths == [f.result() for f in futures]
+        >>> assert all(ub.Path(p).exists() for p in fpaths)
+        >>> assert '_executor' not in str(self)
+
+    Example:
+        >>> # Synchronous and asynchronous writes produce the same file
+        >>> import kwplot
+        >>> import kwimage
+        >>> import matplotlib as mpl
+        >>> from kwplot.managers import *  # NOQA
+        >>> dpath = ub.Path.appdir('kwplot/tests/finalizer_sync_async').delete().ensuredir()
+        >>> self = FigureFinalizer(dpath=dpath, dpi=50)
+        >>> def make_fig():
+        >>>     fig = kwplot.figure(managed=False, doclf=True)
+        >>>     fig.gca().plot([0, 1])
+        >>>     return fig
+        >>> sync_fpath = self.finalize(make_fig(), 'sync.jpg')
+        >>> async_fpath = self.finalize(make_fig(), 'async.jpg', async_write=True).result()
+        >>> assert sync_fpath.read_bytes() == async_fpath.read_bytes()
+        >>> sync_img = kwimage.imread(sync_fpath)
+        >>> # Both honor the savefig rcParams
+        >>> with mpl.rc_context({'savefig.transparent': True}):
+        >>>     sync_fpath = self.finalize(make_fig(), 'sync.png')
+        >>>     async_fpath = self.finalize(make_fig(), 'async.png', async_write=True).result()
+        >>> assert sync_fpath.read_bytes() == async_fpath.read_bytes()
+        >>> assert kwimage.imread(async_fpath)[0, 0, 3] == 0
+        >>> # cropwhite can be overridden per call
+        >>> full_fpath = self.finalize(make_fig(), 'full.jpg', cropwhite=False)
+        >>> assert kwimage.imread(full_fpath).shape[0] > sync_img.shape[0]
+        >>> # A None path writes nothing
+        >>> self.update(dpath=None)
+        >>> assert self.finalize(make_fig(), None) is None
+        >>> assert self.finalize(make_fig(), None, async_write=True).result() is None
+        >>> self.flush()
     """
 
     def __init__(
@@ -332,6 +494,8 @@ class FigureFinalizer(ub.NiceRepr):
         cropwhite=True,
         tight_layout=True,
         verbose=0,
+        async_write=False,
+        max_pending=4,
         **kwargs
     ):
         locals_ = ub.udict(locals())
@@ -339,15 +503,30 @@ class FigureFinalizer(ub.NiceRepr):
         locals_.update(kwargs)
         self.verbose = verbose
         self.update(locals_)
+        self._executor = None
+        self._futures = []
+
+    def _config(self):
+        return ub.udict({k: v for k, v in self.__dict__.items()
+                         if not k.startswith('_')})
 
     def __nice__(self):
-        return ub.urepr(self.__dict__)
+        return ub.urepr(self._config())
+
+    def __getstate__(self):
+        # The write-behind queue is local to this process
+        return self._config()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor = None
+        self._futures = []
 
     def copy(self):
         """
         Create a copy of this object.
         """
-        new = self.__class__(**self.__dict__)
+        new = self.__class__(**self._config())
         return new
 
     def update(self, *args, **kwargs):
@@ -367,8 +546,14 @@ class FigureFinalizer(ub.NiceRepr):
             fpath (str | PathLike): where to save the figure image
 
             **kwargs: overrides this config for this finalize only
+
+        Returns:
+            str | PathLike | concurrent.futures.Future | None:
+                the path that was written, or a future that resolves to it if
+                ``async_write`` is True. Nothing is written if the path is
+                None.
         """
-        config = ub.udict(self.__dict__) | kwargs
+        config = self._config() | kwargs
 
         if config['dpath'] is None:
             final_fpath = fpath
@@ -388,13 +573,84 @@ class FigureFinalizer(ub.NiceRepr):
         if config['tight_layout'] is not None:
             fig.tight_layout()
 
-        # TODO: could save to memory and then write as an image
-        if final_fpath is not None:
-            fig.savefig(final_fpath, **savekw)
-            if self.cropwhite:
-                cropwhite_ondisk(final_fpath)
+        if final_fpath is None:
+            if config['async_write']:
+                from concurrent.futures import Future
+                future = Future()
+                future.set_result(None)
+                return future
+            return final_fpath
+
+        if config['async_write']:
+            return self._submit_write(fig, final_fpath, savekw, config)
+
+        fig.savefig(final_fpath, **savekw)
+        if config['cropwhite']:
+            cropwhite_ondisk(final_fpath)
         return final_fpath
 
+    def _submit_write(self, fig, final_fpath, savekw, config):
+        """
+        Snapshot the figure on the calling thread and write it in the
+        background.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        max_pending = max(1, int(config['max_pending']))
+        pending = [f for f in self._futures if not f.done()]
+        while len(pending) >= max_pending:
+            wait(pending, return_when=FIRST_COMPLETED)
+            pending = [f for f in pending if not f.done()]
+
+        data = _snapshot_figure(fig, final_fpath, savekw)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_pending,
+                thread_name_prefix='kwplot_finalizer')
+        future = self._executor.submit(
+            _write_snapshot, data, final_fpath, savekw, config['cropwhite'])
+        self._futures.append(future)
+        return future
+
+    def wait(self, timeout=None):
+        """
+        Block until all pending asynchronous writes finish.
+
+        Args:
+            timeout (float | None): maximum number of seconds to wait
+
+        Returns:
+            List[str | PathLike]: the paths written since the last wait, in
+                the order they were submitted.
+
+        Raises:
+            Exception: the first error raised by a background write
+        """
+        from concurrent.futures import wait
+        futures = self._futures
+        _, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            raise TimeoutError(
+                '{} figure writes are still pending'.format(len(not_done)))
+        self._futures = []
+        return [f.result() for f in futures]
+
+    def flush(self):
+        """
+        Wait for all pending asynchronous writes and release the writer
+        threads. The thread pool is recreated on the next asynchronous write.
+
+        Returns:
+            List[str | PathLike]: the paths written since the last wait.
+        """
+        try:
+            fpaths = self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        return fpaths
+
     def __call__(self, fig, fpath, **kwargs):
         """
         Alias for finalize
@@ -402,6 +658,91 @@ class FigureFinalizer(ub.NiceRepr):
         return self.finalize(fig, fpath, **kwargs)
 
 
+# Formats that Agg encodes from its RGBA buffer with ``matplotlib.image.imsave``
+_AGG_RASTER_FORMATS = {
+    '.png': 'png',
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+    '.tif': 'tiff',
+    '.tiff': 'tiff',
+    '.webp': 'webp',
+}
+
+
+def _snapshot_rgba(fig, savekw):
+    """
+    Render a figure the way ``fig.savefig`` would, but return the RGBA buffer
+    and the dpi it was drawn at instead of encoding it.
+
+    The render goes through ``savefig``, so the ``savefig.*`` rcParams (e.g.
+    transparency, face color, and tight bounding boxes) are honored.
+    """
+    import io
+    import numpy as np
+    drawn = []
+
+    def _on_draw(event):
+        renderer = event.renderer
+        drawn.append((int(renderer.height), int(renderer.width), renderer.dpi))
+
+    cid = fig.canvas.mpl_connect('draw_event', _on_draw)
+    try:
+        with io.BytesIO() as stream:
+            fig.savefig(stream, format='rgba', **savekw)
+            buf = stream.getvalue()
+    finally:
+        fig.canvas.mpl_disconnect(cid)
+    h, w, dpi = drawn[-1]
+    rgba = np.frombuffer(buf, dtype=np.uint8).reshape(h, w, 4)
+    return rgba, dpi
+
+
+def _snapshot_figure(fig, fpath, savekw):
+    """
+    Render a figure into memory for :func:`_write_snapshot`: an RGBA buffer
+    for formats Agg encodes itself, or the encoded bytes otherwise.
+    """
+    if ub.Path(fpath).suffix.lower() in _AGG_RASTER_FORMATS:
+        return _snapshot_rgba(fig, savekw)
+    # Vector formats must be encoded by matplotlib, but the file write can
+    # still happen in the background.
+    import io
+    fmt = ub.Path(fpath).suffix[1:] or None
+    with io.BytesIO() as stream:
+        fig.savefig(stream, format=fmt, **savekw)
+        return stream.getvalue()
+
+
+def _write_snapshot(data, fpath, savekw, cropwhite):
+    """
+    Encode and write a snapshot made by :func:`_snapshot_figure`. Raster
+    snapshots are encoded the same way ``fig.savefig`` encodes them, so the
+    file matches a synchronous write.
+    """
+    if isinstance(data, bytes):
+        ub.Path(fpath).write_bytes(data)
+        return fpath
+    import matplotlib as mpl
+    rgba, dpi = data
+    fmt = _AGG_RASTER_FORMATS[ub.Path(fpath).suffix.lower()]
+    if fmt == 'jpeg':
+        # Agg blends jpegs against white. Do that here instead of relying on
+        # the (global) savefig.facecolor rcParam from a background thread.
+        from PIL import Image
+        import numpy as np
+        image = Image.frombuffer('RGBA', (rgba.shape[1], rgba.shape[0]),
+                                 rgba, 'raw', 'RGBA', 0, 1)
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, image)
+        rgba = np.asarray(background.convert('RGBA'))
+    mpl.image.imsave(fpath, rgba, format=fmt, origin='upper', dpi=dpi,
+                     metadata=savekw.get('metadata', None),
+                     pil_kwargs=savekw.get('pil_kwargs', None))
+    if cropwhite:
+        cropwhite_ondisk(fpath)
+    return fpath
+
+
 class ArtistManager:
     """
     Accumulates artist collections (e.g. lines, patches, ellipses) the user is
@@ -483,10 +824,10 @@ class ArtistManager:
         self.group_to_attrs = {}
 
     def _normalize_attrs(self, attrs):
-        import kwimage
+        from kwplot.mpl_color import resolve_color
         attrs = ub.udict(attrs)
         if 'color' in attrs:
-            attrs['color'] = kwimage.Color.coerce(attrs['color']).as01()
+            attrs['color'] = resolve_color(attrs['color'], space=None)
         if 'hashid' in attrs:
             attrs = attrs - {'hashid'}
         hashid = ub.hash_data(sorted(attrs.items()))[0:8]
@@ -527,8 +868,9 @@ class ArtistManager:
         """
         Real ellipses in dataspace
         """
+        from matplotlib.patches import Ellipse
         hashid, attrs = self._normalize_attrs(attrs)
-        ell = mpl.patches.Ellipse(xy, rx, ry, angle=angle, **attrs)
+        ell = Ellipse(xy, rx, ry, angle=angle, **attrs)
         self.group_to_patches[hashid]['ellipse'].append(ell)
         self.group_to_attrs[hashid] = attrs
 
@@ -536,8 +878,9 @@ class ArtistManager:
         """
         Real ellipses in dataspace
         """
+        from matplotlib.patches import Circle
         hashid, attrs = self._normalize_attrs(attrs)
-        ell = mpl.patches.Circle(xy, r, **attrs)
+        ell = Circle(xy, r, **attrs)
         self.group_to_patches[hashid]['circle'].append(ell)
         self.group_to_attrs[hashid] = attrs
 
@@ -551,12 +894,12 @@ class ArtistManager:
 
         """
         import numpy as np
-        import kwimage
+        from kwplot.mpl_color import resolve_color
         if color is not None:
             if 'edgecolors' not in attrs:
-                attrs['edgecolors'] = kwimage.Color.coerce(color).as01()
+                attrs['edgecolors'] = resolve_color(color, space=None)
             if 'facecolors' not in attrs:
-                attrs['facecolors'] = kwimage.Color.coerce(color).as01()
+                attrs['facecolors'] = resolve_color(color, space=None)
 
         hashid, attrs = self._normalize_attrs(attrs)
         cols = self.group_to_ellipse_markers[hashid]
@@ -606,6 +949,8 @@ class ArtistManager:
 
     def build_collections(self, ax=None):
         import numpy as np
+        import matplotlib as mpl
+        import matplotlib.collections  # NOQA
         collections = []
         for hashid, segments in self.group_to_line_segments.items():
             attrs = self.group_to_attrs[hashid]
@@ -727,6 +1072,7 @@ class Palette(ub.udict):
             labels (List[str] | None): new labels that should take distinct colors
         """
         import kwimage
+        from kwplot.mpl_color import resolve_color
         # Given an existing set of colors, add colors to things without it.
         if label_to_color is None:
             label_to_color = {}
@@ -734,7 +1080,7 @@ class Palette(ub.udict):
             labels = []
 
         # Determine which labels in the input mapping are not explicitly given
-        specified = {k: kwimage.Color.coerce(v).as01()
+        specified = {k: resolve_color(v, space=None)
                      for k, v in label_to_color.items() if v is not None}
         unspecified = ub.oset(label_to_color.keys()) - specified
 
@@ -753,6 +1099,17 @@ class Palette(ub.udict):
             super().update(new_label_to_color)
 
     def make_legend_img(self, dpi=300, **kwargs):
+        """
+        Draw this palette as a legend image.
+
+        Args:
+            dpi (int): resolution of the legend
+            **kwargs: see :func:`kwplot.make_legend_img`. Legends are cached,
+                so drawing the same palette again is a lookup.
+
+        Returns:
+            ndarray
+        """
         import kwplot
         legend = kwplot.make_legend_img(self, dpi=dpi, **kwargs)
         return legend
@@ -0,0 +1,160 @@
+"""
+Matplotlib artists whose drawing can be customized by another object.
+
+Several kwplot helpers need to change what an artist shows right before it is
+drawn, e.g. to choose the labels that are readable at the current zoom
+(:class:`kwplot.mpl_labels.LabelLayer`), to read the visible window of an
+image pyramid (:class:`kwplot.mpl_pyramid.PyramidView`), or to rasterize line
+segments for the current view (:class:`kwplot.mpl_raster.SegmentRaster`).
+
+The artists in this module override ``draw`` and call their ``draw_hook``
+(if it is set) as ``draw_hook(renderer, draw)``, where ``draw`` draws the
+artist as usual. Because the hook is an attribute and not a replaced method,
+figures that use these artists can still be pickled and deep copied.
+"""
+import matplotlib as mpl
+import matplotlib.collections  # NOQA
+import matplotlib.image  # NOQA
+import matplotlib.text  # NOQA
+
+
+class _DrawHookMixin:
+    """
+    Draws through ``draw_hook(renderer, draw)`` when it is set.
+    """
+    draw_hook = None
+
+    @mpl.artist.allow_rasterization
+    def draw(self, renderer):
+        draw_hook = self.draw_hook
+        if draw_hook is None:
+            return super().draw(renderer)
+        return draw_hook(renderer, super().draw)
+
+
+class DrawHookText(_DrawHookMixin, mpl.text.Text):
+    """
+    A ``Text`` artist that is drawn through a ``draw_hook``.
+
+    Args:
+        *args: passed to :class:`matplotlib.text.Text`
+        draw_hook (Callable | None): called as ``draw_hook(renderer, draw)``
+        **kwargs: passed to :class:`matplotlib.text.Text`
+
+    Example:
+        >>> import kwplot
+        >>> import pickle
+        >>> from kwplot.mpl_artists import *  # NOQA
+        >>> fig = kwplot.figure(managed=False, doclf=True)
+        >>> ax = fig.gca()
+        >>> num_draws = []
+        >>> def count_draws(renderer, draw):
+        >>>     num_draws.append(1)
+        >>>     return draw(renderer)
+        >>> text = add_hooked_text(ax, 0.5, 0.5, 'a', draw_hook=count_draws)
+        >>> assert text in ax.texts
+        >>> fig.canvas.draw()
+        >>> assert len(num_draws) == 1
+        >>> # The artist survives a pickle round trip. (The hook must also be
+        >>> # picklable, which a function defined in a doctest is not.)
+        >>> text.draw_hook = None
+        >>> fig2 = pickle.loads(pickle.dumps(fig))
+        >>> text2 = fig2.gca().texts[0]
+        >>> assert type(text2) is DrawHookText
+        >>> assert text2.get_text() == 'a'
+    """
+
+    def __init__(self, *args, draw_hook=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.draw_hook = draw_hook
+
+
+class DrawHookImage(_DrawHookMixin, mpl.image.AxesImage):
+    """
+    An ``AxesImage`` that is drawn through a ``draw_hook``.
+
+    Args:
+        ax (matplotlib.axes.Axes): the axes the image belongs to
+        draw_hook (Callable | None): called as ``draw_hook(renderer, draw)``
+        **kwargs: passed to :class:`matplotlib.image.AxesImage`
+    """
+
+    def __init__(self, ax, draw_hook=None, **kwargs):
+        super().__init__(ax, **kwargs)
+        self.draw_hook = draw_hook
+
+
+class DrawHookLineCollection(_DrawHookMixin, mpl.collections.LineCollection):
+    """
+    A ``LineCollection`` that is drawn through a ``draw_hook``.
+
+    Args:
+        segments (ndarray | List): the line segments
+        draw_hook (Callable | None): called as ``draw_hook(renderer, draw)``
+        **kwargs: passed to :class:`matplotlib.collections.LineCollection`
+    """
+
+    def __init__(self, segments, draw_hook=None, **kwargs):
+        super().__init__(segments, **kwargs)
+        self.draw_hook = draw_hook
+
+
+def add_hooked_text(ax, x, y, s, draw_hook=None, **kwargs):
+    """
+    Like ``ax.text``, but adds a :class:`DrawHookText`.
+
+    Returns:
+        DrawHookText
+    """
+    kwargs = {'transform': ax.transData, 'clip_on': False, **kwargs}
+    text = DrawHookText(x, y, s, draw_hook=draw_hook, **kwargs)
+    if text.get_clip_path() is None:
+        text.set_clip_path(ax.patch)
+    ax.add_artist(text)
+    return text
+
+
+def add_hooked_image(ax, data, draw_hook=None, cmap=None, norm=None,
+                     aspect=None, vmin=None, vmax=None, extent=None,
+                     **kwargs):
+    """
+    Like ``ax.imshow``, but adds a :class:`DrawHookImage`.
+
+    Returns:
+        DrawHookImage
+
+    Example:
+        >>> import kwplot
+        >>> import numpy as np
+        >>> from kwplot.mpl_artists import *  # NOQA
+        >>> fig = kwplot.figure(managed=False, doclf=True)
+        >>> ax = fig.gca()
+        >>> data = np.arange(12.).reshape(3, 4)
+        >>> num_draws = []
+        >>> def count_draws(renderer, draw):
+        >>>     num_draws.append(1)
+        >>>     return draw(renderer)
+        >>> image = add_hooked_image(ax, data, draw_hook=count_draws, cmap='gray')
+        >>> expected = ax.imshow(data, cmap='gray')
+        >>> assert image.get_extent() == expected.get_extent()
+        >>> assert image.get_clim() == expected.get_clim()
+        >>> expected.remove()
+        >>> fig.canvas.draw()
+        >>> assert len(num_draws) == 1
+    """
+    image = DrawHookImage(ax, draw_hook=draw_hook, cmap=cmap, norm=norm,
+                          extent=extent, **kwargs)
+    if aspect is None:
+        aspect = mpl.rcParams['image.aspect']
+    ax.set_aspect(aspect)
+    image.set_data(data)
+    if image.get_clip_path() is None:
+        image.set_clip_path(ax.patch)
+    if vmin is not None or vmax is not None:
+        image.set_clim(vmin, vmax)
+    image.autoscale_None()
+    # Resolve the default extent so the data limits are updated
+    image.set_extent(image.get_extent())
+    ax.add_image(image)
+    return image
+
@@ -1,7 +1,16 @@
 """
-DEPRECATED: use kwimage.Color instead
+Color helpers.
+
+The ``Color`` class is DEPRECATED: use kwimage.Color instead.
+
+:func:`resolve_color` and :func:`resolve_many` convert color-like inputs to
+float RGBA values. Drawing helpers tend to resolve the same handful of colors
+many times, so the result for each hashable input is interned in a bounded
+least recently used cache.
 """
-__all__ = ['Color']
+import functools
+
+__all__ = ['Color', 'resolve_color', 'resolve_many']
 
 
 class mcolors:
@@ -76,3 +85,165 @@ try:
     from kwimage import Color  # noqa
 except ImportError:
     Color = None
+
+
+def _color_key(color):
+    """
+    Make a hashable key for a color-like input, or return None if the input
+    cannot be cached.
+
+    The type of each number is part of the key because kwimage interprets
+    integers as 0-255 values and floats as 0-1 values.
+    """
+    if isinstance(color, str):
+        return color
+    if hasattr(color, 'tolist') and getattr(color, 'ndim', None) == 1:
+        # numpy arrays
+        color = color.tolist()
+    if isinstance(color, (tuple, list)) and len(color) in {3, 4}:
+        return tuple((type(v).__name__, v) for v in color)
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_key(key, alpha, space):
+    if isinstance(key, str):
+        color = key
+    else:
+        color = tuple(v for _, v in key)
+    return _resolve(color, alpha, space)
+
+
+def _resolve(color, alpha, space):
+    import kwimage
+    if alpha is None:
+        return kwimage.Color.coerce(color).as01(space)
+    rgba = kwimage.Color.coerce(color).as01('rgba')
+    return rgba[0:3] + (float(alpha),)
+
+
+def resolve_color(color, alpha=None, space='rgba'):
+    """
+    Resolve a color-like input to a tuple of floats between 0 and 1.
+
+    Results for names, hex strings, and tuples of numbers are cached.
+
+    Args:
+        color (str | Tuple | kwimage.Color):
+            anything accepted by :func:`kwimage.Color.coerce`
+
+        alpha (float | None):
+            if specified, overrides the alpha of the color and the result is
+            always RGBA.
+
+        space (str | None):
+            colorspace of the result. If None, the native space of the color
+            is used, i.e. the same as ``kwimage.Color.coerce(color).as01()``.
+
+    Returns:
+        Tuple[float, ...]
+
+    Example:
+        >>> import kwplot
+        >>> kwplot.resolve_color('red')
+        (1.0, 0.0, 0.0, 1.0)
+        >>> kwplot.resolve_color('#ff000080', alpha=0.25)
+        (1.0, 0.0, 0.0, 0.25)
+        >>> kwplot.resolve_color((255, 0, 0), space=None)
+        (1.0, 0.0, 0.0)
+        >>> # Integers are 0-255 values and floats are 0-1 values
+        >>> kwplot.resolve_color((1, 0, 0)) != kwplot.resolve_color((1.0, 0, 0))
+        True
+    """
+    if alpha is not None:
+        alpha = float(alpha)
+    key = _color_key(color)
+    if key is None:
+        return _resolve(color, alpha, space)
+    try:
+        return _resolve_key(key, alpha, space)
+    except TypeError:
+        # unhashable elements
+        return _resolve(color, alpha, space)
+
+
+def resolve_many(colors, alphas=None, num=None):
+    """
+    Resolve one color or a color for each item into an (N, 4) float RGBA array.
+
+    Each distinct color is resolved once (and interned by
+    :func:`resolve_color`), and the array is built by indexing a table of the
+    distinct colors.
+
+    Args:
+        colors (str | Any | List[Any] | ndarray):
+            a single color-like, a sequence with one color-like for each item,
+            or an (N, 3) or (N, 4) numeric array (0-255 if integer, 0-1
+            otherwise).
+
+        alphas (float | List[float] | ndarray | None):
+            if specified, a single alpha or one alpha for each item that
+            overrides the alpha of the colors.
+
+        num (int | None):
+            the number of items. Required if ``colors`` is a single color.
+
+    Returns:
+        ndarray: a new (N, 4) float64 array that the caller may modify.
+
+    Example:
+        >>> import kwplot
+        >>> kwplot.resolve_many('red', num=2).tolist()
+        [[1.0, 0.0, 0.0, 1.0], [1.0, 0.0, 0.0, 1.0]]
+        >>> kwplot.resolve_many(['red', (0, 0, 1.), 'red'], alphas=[1, .5, 0]).tolist()
+        [[1.0, 0.0, 0.0, 1.0], [0.0, 0.0, 1.0, 0.5], [1.0, 0.0, 0.0, 0.0]]
+        >>> import numpy as np
+        >>> kwplot.resolve_many(np.array([[255, 0, 0], [0, 255, 0]])).tolist()
+        [[1.0, 0.0, 0.0, 1.0], [0.0, 1.0, 0.0, 1.0]]
+    """
+    import numpy as np
+    rgba = None
+    if isinstance(colors, (list, tuple, np.ndarray)):
+        try:
+            arr = np.asarray(colors) if len(colors) else None
+        except ValueError:
+            # ragged sequences of color-likes
+            arr = None
+        is_numeric = arr is not None and arr.dtype.kind in 'iuf'
+        if len(colors) == 0:
+            rgba = np.empty((0, 4), dtype=float)
+        elif is_numeric and arr.ndim == 2 and arr.shape[1] in {3, 4}:
+            rgba = np.ones((len(arr), 4), dtype=float)
+            rgba[:, 0:arr.shape[1]] = arr
+            if arr.dtype.kind in 'iu':
+                rgba[:, 0:arr.shape[1]] /= 255.0
+        elif arr is not None and arr.ndim == 1 and arr.dtype.kind == 'U':
+            # A sequence of color names
+            uniq, inverse = np.unique(arr, return_inverse=True)
+            table = np.array([resolve_color(c) for c in uniq.tolist()])
+            rgba = table[inverse.ravel()]
+        elif not (is_numeric and arr.ndim == 1):
+            # A sequence with a color for each item
+            lut = {}
+            rgba = np.empty((len(colors), 4), dtype=float)
+            for idx, item in enumerate(colors):
+                key = _color_key(item)
+                if key is None:
+                    rgba[idx] = resolve_color(item)
+                    continue
+                try:
+                    value = lut[key]
+                except KeyError:
+                    value = lut[key] = resolve_color(item)
+                rgba[idx] = value
+        if rgba is not None and num is not None and len(rgba) != num:
+            raise ValueError(f'Got {len(rgba)} colors for {num} items')
+    if rgba is None:
+        if num is None:
+            raise ValueError('num must be given to broadcast a single color')
+        rgba = np.tile(np.asarray(resolve_color(colors), dtype=float),
+                       (num, 1))
+    if alphas is not None:
+        rgba[:, 3] = np.broadcast_to(np.asarray(alphas, dtype=float),
+                                     (len(rgba),))
+    return rgba
@@ -1,6 +1,23 @@
+from typing import Tuple
+from typing import List
+from typing import Any
+from numpy import ndarray
+import kwimage
 from _typeshed import Incomplete
 
 
 class mcolors:
     BASE_COLORS: Incomplete
     CSS4_COLORS: Incomplete
+
+
+def resolve_color(color: str | Tuple | kwimage.Color,
+                  alpha: float | None = None,
+                  space: str | None = 'rgba') -> Tuple[float, ...]:
+    ...
+
+
+def resolve_many(colors: str | Any | List[Any] | ndarray,
+                 alphas: float | List[float] | ndarray | None = None,
+                 num: int | None = None) -> ndarray:
+    ...
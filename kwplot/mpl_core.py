@@ -9,10 +9,17 @@ Extensions of pyplot functionality. Main differences / modifications are
 
 
 """
+import functools
+import os
+import threading
+import weakref
+from collections import OrderedDict
 import numpy as np
 import ubelt as ub
-import matplotlib as mpl
-import matplotlib.figure  # NOQA
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import matplotlib
 
 
 try:
@@ -24,8 +31,8 @@ try:
         figure and axes. This lets new code avoid magic numbers when accessing
         one or the other.
         """
-        fig : mpl.figure.Figure
-        ax : mpl.axes.Axes
+        fig : 'matplotlib.figure.Figure'
+        ax : 'matplotlib.axes.Axes'
 
 except ImportError:
     # Is this needed in 3.8?
@@ -34,6 +41,57 @@ except ImportError:
 
 _BASE_FNUM = 9001
 
+# Figures created by ``figure(managed=False)`` keyed by figure number. These
+# are not registered with pyplot, and each thread gets its own registry.
+_UNMANAGED_STATE = threading.local()
+
+# Weak references to the figures returned by :func:`figure` in least recently
+# used order. Used to enforce the limit set by :func:`set_max_figures`.
+_FIGURE_LRU = OrderedDict()
+_FIGURE_LRU_LOCK = threading.Lock()
+
+
+def _max_figures_from_environ():
+    """
+    Read the default figure limit from the ``KWPLOT_MAX_FIGURES`` environment
+    variable. Invalid values are ignored with a warning.
+
+    Returns:
+        int | None
+
+    Example:
+        >>> from kwplot.mpl_core import _max_figures_from_environ
+        >>> import os
+        >>> import warnings
+        >>> from unittest import mock
+        >>> with mock.patch.dict(os.environ, {'KWPLOT_MAX_FIGURES': '10'}):
+        >>>     assert _max_figures_from_environ() == 10
+        >>> with mock.patch.dict(os.environ, {'KWPLOT_MAX_FIGURES': ''}):
+        >>>     assert _max_figures_from_environ() is None
+        >>> with mock.patch.dict(os.environ, {'KWPLOT_MAX_FIGURES': 'ten'}):
+        >>>     with warnings.catch_warnings(record=True) as caught:
+        >>>         warnings.simplefilter('always')
+        >>>         assert _max_figures_from_environ() is None
+        >>> assert len(caught) == 1
+    """
+    text = os.environ.get('KWPLOT_MAX_FIGURES', '').strip()
+    if not text:
+        return None
+    try:
+        num = int(text)
+    except ValueError:
+        num = None
+    if num is None or num < 1:
+        import warnings
+        warnings.warn(
+            'Ignoring KWPLOT_MAX_FIGURES={!r}, which is not a positive '
+            'integer'.format(text))
+        return None
+    return num
+
+
+_MAX_FIGURES = _max_figures_from_environ()
+
 
 def next_fnum(new_base=None):
     global _BASE_FNUM
@@ -52,7 +110,8 @@ def ensure_fnum(fnum):
 # import xdev  # NOQA
 # @xdev.profile  # NOQA
 def figure(fnum=None, pnum=(1, 1, 1), title=None, figtitle=None, doclf=False,
-           docla=False, projection=None, **kwargs):
+           docla=False, projection=None, managed=True, fig=None,
+           recycle=False, **kwargs):
     """
     http://matplotlib.org/users/gridspec.html
 
@@ -64,6 +123,25 @@ def figure(fnum=None, pnum=(1, 1, 1), title=None, figtitle=None, doclf=False,
         docla (bool): (default = False)
         doclf (bool): (default = False)
 
+        managed (bool):
+            if False, the figure is a :class:`matplotlib.figure.Figure` bound
+            directly to a ``FigureCanvasAgg`` and is not registered with
+            pyplot. This does not import pyplot or switch backends, so it is
+            safe to use for headless rendering in any thread, even in an
+            interactive session. Unmanaged figures are looked up by fnum in a
+            per-thread registry. If fnum is None a new figure is created.
+            Defaults to True.
+
+        fig (mpl.figure.Figure | None):
+            if specified, use this figure instead of looking one up by fnum.
+
+        recycle (bool):
+            if True, ``doclf`` only removes the data artists (lines, images,
+            collections, texts, legends) and keeps the axes, tick locators,
+            and label objects. This is much cheaper when the same layout is drawn
+            many times in a loop. See also :class:`kwplot.FigurePool`.
+            Defaults to False.
+
     Returns:
         mpl.figure.Figure: fig
 
@@ -90,10 +168,40 @@ def figure(fnum=None, pnum=(1, 1, 1), title=None, figtitle=None, doclf=False,
         >>> fig = figure(fnum, (2, 4, (1, slice(1, None))))
         >>> fig.gca().text(0.5, 0.5, "ax3", va="center", ha="center")
         >>> show_if_requested()
+
+    Example:
+        >>> # Render without pyplot or a backend switch
+        >>> import kwplot
+        >>> fig = kwplot.figure(fnum=1, managed=False, doclf=True)
+        >>> assert fig.canvas.manager is None
+        >>> assert kwplot.figure(fnum=1, managed=False) is fig
+        >>> fig.gca().plot([0, 10], [0, 10])
+        >>> canvas = kwplot.render_figure_to_image(fig, transparent=False)
+        >>> assert canvas.shape[2] == 3
+        >>> kwplot.close_figures([fig])
+
+    Example:
+        >>> # Recycling keeps the axes of a repeated layout
+        >>> import kwplot
+        >>> fig = kwplot.figure(fnum=1, pnum=(1, 2, 1), managed=False, doclf=True)
+        >>> ax1 = fig.gca()
+        >>> ax1.plot([1, 2, 3])
+        >>> ax1.set_title('first')
+        >>> fig = kwplot.figure(fnum=1, pnum=(1, 2, 1), managed=False, doclf=True, recycle=True)
+        >>> assert fig.gca() is ax1
+        >>> assert len(ax1.lines) == 0 and ax1.get_title() == ''
+        >>> kwplot.close_figures([fig])
     """
-    fig = _ensure_fig(fnum)
+    if fig is None:
+        if managed:
+            fig = _ensure_fig(fnum)
+        else:
+            fig = _ensure_unmanaged_fig(fnum)
     if doclf:
-        fig.clf()
+        if recycle:
+            _recycle_figure(fig)
+        else:
+            fig.clf()
     if pnum is not None:
         _setup_subfigure(fig, pnum, docla, projection)
     # Set the title / figtitle
@@ -102,10 +210,89 @@ def figure(fnum=None, pnum=(1, 1, 1), title=None, figtitle=None, doclf=False,
         ax.set_title(title)
     if figtitle is not None:
         fig.suptitle(figtitle)
+    _touch_figure(fig)
     return fig
 
 
+def set_max_figures(num):
+    """
+    Limit the number of open figures created by :func:`kwplot.figure`.
+
+    When a new figure would exceed this limit, the least recently used figure
+    is closed. This can also be set with the ``KWPLOT_MAX_FIGURES``
+    environment variable. By default there is no limit.
+
+    Args:
+        num (int | None): the maximum number of figures, or None for no limit
+
+    Returns:
+        int | None: the previous limit
+
+    Example:
+        >>> import kwplot
+        >>> prev = kwplot.set_max_figures(2)
+        >>> figs = [kwplot.figure(fnum=i, managed=False, doclf=True) for i in range(3)]
+        >>> assert len(figs[0].axes) == 0, 'the oldest figure was closed'
+        >>> assert len(figs[2].axes) == 1
+        >>> kwplot.set_max_figures(prev)
+        >>> kwplot.close_figures(figs)
+    """
+    global _MAX_FIGURES
+    prev = _MAX_FIGURES
+    _MAX_FIGURES = num
+    _touch_figure(None)
+    return prev
+
+
+def _figure_is_open(fig):
+    """
+    Check if a figure has not been closed.
+    """
+    if getattr(fig, '_kwplot_closed', False):
+        return False
+    if _is_managed(fig):
+        from matplotlib._pylab_helpers import Gcf
+        manager = fig.canvas.manager
+        return Gcf.figs.get(getattr(manager, 'num', None), None) is manager
+    return True
+
+
+def _touch_figure(fig):
+    """
+    Mark a figure as the most recently used and close the least recently used
+    figures that exceed the limit set by :func:`set_max_figures`.
+    """
+    evicted = []
+    if fig is not None and getattr(fig, '_kwplot_closed', False):
+        # A closed unmanaged figure was explicitly reused
+        fig._kwplot_closed = False
+    with _FIGURE_LRU_LOCK:
+        if fig is not None:
+            key = id(fig)
+            ref = _FIGURE_LRU.get(key, None)
+            if ref is not None and ref() is fig:
+                _FIGURE_LRU.move_to_end(key)
+            else:
+                _FIGURE_LRU.pop(key, None)
+                _FIGURE_LRU[key] = weakref.ref(fig)
+        if _MAX_FIGURES is not None and len(_FIGURE_LRU) > _MAX_FIGURES:
+            # Forget figures that were garbage collected or closed elsewhere
+            for key, ref in list(_FIGURE_LRU.items()):
+                other = ref()
+                if other is None or not _figure_is_open(other):
+                    _FIGURE_LRU.pop(key)
+            while len(_FIGURE_LRU) > _MAX_FIGURES:
+                _, ref = _FIGURE_LRU.popitem(last=False)
+                other = ref()
+                if other is not None and other is not fig:
+                    evicted.append(other)
+    if evicted:
+        close_figures(evicted)
+
+
 def _ensure_fig(fnum):
+    from kwplot.auto_backends import _join_background_probe
+    _join_background_probe()
     import matplotlib.pyplot as plt
     if fnum is None:
         try:
@@ -120,6 +307,193 @@ def _ensure_fig(fnum):
     return fig
 
 
+def _ensure_unmanaged_fig(fnum):
+    """
+    Lookup or create a figure that is not registered with pyplot.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    registry = getattr(_UNMANAGED_STATE, 'figures', None)
+    if registry is None:
+        registry = _UNMANAGED_STATE.figures = {}
+    fig = None if fnum is None else registry.get(fnum, None)
+    if fig is None:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        if fnum is not None:
+            registry[fnum] = fig
+    return fig
+
+
+def _is_managed(fig):
+    """
+    Returns True if the figure is registered with pyplot
+    """
+    return getattr(fig.canvas, 'manager', None) is not None
+
+
+def _sca(ax):
+    """
+    Make ax the current axes of its figure without registering an unmanaged
+    figure with pyplot.
+    """
+    fig = ax.figure
+    if _is_managed(fig):
+        from matplotlib import pyplot as plt
+        plt.sca(ax)
+    else:
+        fig.sca(ax)
+
+
+def _layout_cache(fig):
+    """
+    Per-figure cache used to make pnum lookups O(1).
+
+    Contains the GridSpecs keyed by ``(nrows, ncols)``, an index from a grid
+    position ``(nrows, ncols, num1, num2)`` to the axes at that position, and
+    the number of axes the index has seen.
+    """
+    cache = getattr(fig, '_kwplot_layout', None)
+    if cache is None:
+        cache = fig._kwplot_layout = {
+            'gridspecs': {},
+            'axes': {},
+            'num_axes': 0,
+        }
+    return cache
+
+
+def _num_axes(fig):
+    """
+    Number of axes in a figure without building the sorted axes list
+    """
+    try:
+        return len(fig._axstack._axes)
+    except AttributeError:
+        return len(fig.axes)
+
+
+def _has_axes(fig, ax):
+    """
+    Check if an axes is still part of a figure without a linear scan
+    """
+    try:
+        return ax in fig._axstack._axes
+    except AttributeError:
+        return ax in fig.axes
+
+
+def _grid_position(subspec):
+    """
+    Hashable key for the cells of a grid that a SubplotSpec covers
+    """
+    nrows, ncols = subspec.get_gridspec().get_geometry()
+    return (nrows, ncols, subspec.num1, subspec.num2)
+
+
+def _rebuild_axes_index(fig):
+    """
+    Index axes that were added or removed outside of :func:`_subplot`
+    """
+    cache = _layout_cache(fig)
+    index = cache['axes'] = {}
+    for ax in fig.axes:
+        other = ax.get_subplotspec()
+        if other is not None:
+            index.setdefault(_grid_position(other), ax)
+    cache['num_axes'] = _num_axes(fig)
+    return index
+
+
+def _subplot(fig, subspec, projection=None):
+    """
+    Figure-local version of :func:`matplotlib.pyplot.subplot`, which reuses
+    an existing axes at the same grid position or adds a new one.
+
+    Existing axes are found with the index in :func:`_layout_cache`, so this
+    does not scan all axes in the figure.
+
+    Example:
+        >>> import kwplot
+        >>> fig = kwplot.figure(fnum=1, pnum=(2, 2, 1), managed=False, doclf=True)
+        >>> ax1 = fig.gca()
+        >>> fig = kwplot.figure(fnum=1, pnum=(2, 2, 2), managed=False)
+        >>> fig = kwplot.figure(fnum=1, pnum=(2, 2, 1), managed=False)
+        >>> assert fig.gca() is ax1
+        >>> assert len(fig.axes) == 2
+        >>> kwplot.close_figures([fig])
+    """
+    cache = _layout_cache(fig)
+    key = _grid_position(subspec)
+    index = cache['axes']
+    if cache['num_axes'] != _num_axes(fig):
+        index = _rebuild_axes_index(fig)
+    ax = index.get(key, None)
+    if ax is not None and not _has_axes(fig, ax):
+        index = _rebuild_axes_index(fig)
+        ax = index.get(key, None)
+    if ax is None or projection is not None:
+        ax = fig.add_subplot(subspec, projection=projection)
+        index[key] = ax
+        cache['num_axes'] = _num_axes(fig)
+    fig.sca(ax)
+    return ax
+
+
+def _recycle_figure(fig):
+    """
+    Cheaper alternative to ``fig.clf()`` that removes the data artists of a
+    figure but keeps its axes, tick locators, and label text objects.
+
+    Colorbars change the layout of their parent axes, so figures with
+    colorbars fall back to ``fig.clf()``.
+    """
+    axes_list = fig.axes
+    if any(getattr(ax, '_colorbar', None) is not None for ax in axes_list):
+        fig.clf()
+        return
+    for ax in axes_list:
+        _recycle_axes(ax)
+    # The figure title artists are reused by suptitle / supxlabel / supylabel
+    keep = {id(getattr(fig, attr, None))
+            for attr in ['_suptitle', '_supxlabel', '_supylabel']}
+    fig_artists = (list(fig.legends) + list(fig.texts) + list(fig.images) +
+                   list(fig.lines) + list(fig.patches) + list(fig.artists))
+    for artist in fig_artists:
+        if id(artist) in keep:
+            artist.set_text('')
+        else:
+            artist.remove()
+
+
+def _recycle_axes(ax):
+    """
+    Remove the data artists of an axes and reset its data limits, but keep
+    the axes itself, its tick locators, and its label text objects.
+    """
+    from matplotlib.transforms import Bbox
+    data_artists = (list(ax.lines) + list(ax.patches) + list(ax.collections) +
+                    list(ax.images) + list(ax.texts) + list(ax.tables) +
+                    list(ax.artists))
+    for artist in data_artists:
+        artist.remove()
+    if ax.legend_ is not None:
+        ax.legend_.remove()
+    ax.containers.clear()
+    if hasattr(ax, '_phantom_legends'):
+        del ax._phantom_legends
+    ax.set_title('')
+    ax.set_title('', loc='left')
+    ax.set_title('', loc='right')
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+    ax.dataLim.set_points(Bbox.null().get_points())
+    ax.ignore_existing_data_limits = True
+    ax.set_autoscale_on(True)
+    # Restart the color cycle like a new axes would
+    ax.set_prop_cycle(None)
+
+
 def _convert_pnum_int_to_tup(int_pnum):
     # Convert pnum to tuple format if in integer format
     nr = int_pnum // 100
@@ -129,14 +503,21 @@ def _convert_pnum_int_to_tup(int_pnum):
     return pnum
 
 
-def _pnum_to_subspec(pnum):
+def _pnum_to_subspec(pnum, fig=None):
     import matplotlib.gridspec as gridspec
     if isinstance(pnum, str):
         pnum = list(pnum)
     nrow, ncols, plotnum = pnum
     # if kwargs.get('use_gridspec', True):
     # Convert old pnums to gridspec
-    gs = gridspec.GridSpec(nrow, ncols)
+    if fig is None:
+        gs = gridspec.GridSpec(nrow, ncols)
+    else:
+        # Reuse one GridSpec per layout so the subplotspecs compare equal
+        gridspecs = _layout_cache(fig)['gridspecs']
+        gs = gridspecs.get((nrow, ncols), None)
+        if gs is None:
+            gs = gridspecs[(nrow, ncols)] = gridspec.GridSpec(nrow, ncols)
     if isinstance(plotnum, (tuple, slice, list)):
         subspec = gs[plotnum]
     else:
@@ -145,24 +526,23 @@ def _pnum_to_subspec(pnum):
 
 
 def _setup_subfigure(fig, pnum, docla, projection):
-    import matplotlib.pyplot as plt
     if isinstance(pnum, int):
         pnum = _convert_pnum_int_to_tup(pnum)
-    axes_list = fig.get_axes()
-    if docla or len(axes_list) == 0:
+    num_axes = _num_axes(fig)
+    if docla or num_axes == 0:
         if pnum is not None:
             assert pnum[0] > 0, 'nRows must be > 0: pnum=%r' % (pnum,)
             assert pnum[1] > 0, 'nCols must be > 0: pnum=%r' % (pnum,)
-            subspec = _pnum_to_subspec(pnum)
-            ax = fig.add_subplot(*subspec, projection=projection)
-            if len(axes_list) > 0:
+            subspec, = _pnum_to_subspec(pnum, fig=fig)
+            ax = _subplot(fig, subspec, projection=projection)
+            if num_axes > 0:
                 ax.cla()
         else:
             ax = fig.gca()
     else:
         if pnum is not None:
-            subspec = _pnum_to_subspec(pnum)
-            ax = plt.subplot(*subspec)
+            subspec, = _pnum_to_subspec(pnum, fig=fig)
+            ax = _subplot(fig, subspec)
         else:
             ax = fig.gca()
 
@@ -208,10 +588,10 @@ def legend(loc='best', fontproperties=None, size=None, fc='w', alpha=1,
         >>> print(result)
         >>> show_if_requested()
     """
-    from matplotlib import pyplot as plt
     assert loc in _LEGEND_LOCATION or loc == 'best', (
         'invalid loc. try one of %r' % (_LEGEND_LOCATION,))
     if ax is None:
+        from matplotlib import pyplot as plt
         ax = plt.gca()
     if fontproperties is None:
         prop = {}
@@ -269,16 +649,20 @@ def imshow(img,
            colorspace='rgb',
            interpolation='nearest', alpha=None,
            origin_convention="center",
-           show_ticks=False, **kwargs):
+           show_ticks=False, max_display_pixels=None, pyramid=False,
+           tile_cache_bytes=None, live=False, **kwargs):
     r"""
     A wrapper around pyplot.imshow with extra options and slightly modified
     defaults.
 
     Args:
-        img (ndarray): image data. Height, Width, and Channel dimensions
-            can either be in standard (H, W, C) format or in (C, H, W) format.
-            If C in [3, 4], we assume data is in the rgb / rgba colorspace by
-            default.
+        img (ndarray | str | PathLike | ArrayLike): image data. Height, Width,
+            and Channel dimensions can either be in standard (H, W, C) format
+            or in (C, H, W) format.  If C in [3, 4], we assume data is in the
+            rgb / rgba colorspace by default. A path to a ``.npy`` file is
+            memory-mapped. Memory-mapped arrays and lazy array-like objects
+            that support slicing are read on demand: only the visible window,
+            at the needed stride, is read and it is refreshed on pan / zoom.
 
         colorspace (str): if the data is 3-4 channels, this indicates the
             colorspace 1 channel data is assumed grayscale. 4 channels assumes
@@ -321,16 +705,37 @@ def imshow(img,
         ax (mpl.axes.Axes | None):
             axes to draw on (alternative to fnum and pnum)
 
+        max_display_pixels (int | None):
+            if specified, images with more pixels than this are shown as an
+            area-averaged downsampled copy, so matplotlib does not resample
+            the full resolution data on every draw.
+
+        pyramid (bool):
+            if True, build an area-averaged image pyramid and show only the
+            level that matches the pixel size of the axes. When the view is
+            zoomed or panned, a finer level is swapped in for just the visible
+            window. See :class:`kwplot.mpl_pyramid.PyramidView`.
+
+        tile_cache_bytes (int | None):
+            maximum number of bytes of tiles kept in memory when ``img`` is
+            read on demand. Defaults to 256MB.
+
+        live (bool):
+            if True, return a :class:`kwplot.mpl_live.LiveImage` handle whose
+            ``update`` method shows a new frame in the same image artist.
+
         **kwargs: docla, doclf, projection, and other arguments passed to
             :func:`figure`.
 
     Returns:
         FigureAxes: a tuple containing the figure and axes that was plotted to.
+            If ``live`` is True, this is a :class:`kwplot.mpl_live.LiveImage`.
 
     Note:
         Calling this function will import pyplot if you have not done so
         already. Be sure to setup the backend correctly (e.g. with
-        ``kwplot.autompl()``) before calling this function.
+        ``kwplot.autompl()``) before calling this function. This does not
+        apply if ``ax`` belongs to a figure created with ``managed=False``.
 
     Example:
         >>> # Simple case of showing an image
@@ -362,10 +767,46 @@ def imshow(img,
         >>> ax2.plot([0, 1], [0, 1], '-o')
         >>> # xdoctest: +REQUIRES(--show)
         >>> kwplot.show_if_requested()
-    """
-    #import matplotlib as mpl
-    import matplotlib.pyplot as plt
 
+    Example:
+        >>> # Large images can be shown at the resolution of the screen
+        >>> import kwplot
+        >>> import kwimage
+        >>> kwplot.autompl()
+        >>> img = kwimage.grab_test_image('amazon', dsize=(2048, 2048))
+        >>> fig, ax = kwplot.imshow(img, fnum=1, doclf=True, pyramid=True,
+        >>>                         origin_convention='corner')
+        >>> shown = ax.get_images()[0].get_array()
+        >>> assert shown.shape[0] < 2048
+        >>> assert ax.get_images()[0].get_extent() == [0, 2048, 2048, 0]
+        >>> # xdoctest: +REQUIRES(--show)
+        >>> kwplot.show_if_requested()
+
+    Example:
+        >>> # On-disk arrays are read on demand
+        >>> import kwplot
+        >>> import numpy as np
+        >>> import ubelt as ub
+        >>> kwplot.autompl()
+        >>> fpath = ub.Path.appdir('kwplot/tests/imshow_npy').ensuredir() / 'data.npy'
+        >>> data = np.lib.format.open_memmap(fpath, mode='w+', dtype=np.float32,
+        >>>                                  shape=(3, 2000, 3000))
+        >>> data[:, :1000] = 1
+        >>> data.flush()
+        >>> fig, ax = kwplot.imshow(fpath, fnum=1, doclf=True,
+        >>>                         tile_cache_bytes=8 * 2 ** 20)
+        >>> artist = ax.get_images()[0]
+        >>> assert artist.get_array().shape[1] < 3000
+        >>> ax.set_xlim(100, 300)
+        >>> ax.set_ylim(1100, 900)
+        >>> fig.canvas.draw()
+        >>> left, right, bottom, top = artist.get_extent()
+        >>> assert left <= 100 and right >= 300 and top <= 900 and bottom >= 1100
+        >>> assert artist._kwplot_pyramid_view.pyramid.cache_nbytes <= 8 * 2 ** 20
+    """
+    import matplotlib as mpl
+    import matplotlib.colors  # NOQA
+    import matplotlib.ticker  # NOQA
     if ax is not None:
         fig = ax.figure
         nospecial = True
@@ -374,11 +815,34 @@ def imshow(img,
         ax = fig.gca()
         nospecial = False
 
-    if isinstance(img, str):
+    if isinstance(img, (str, os.PathLike)):
         # Allow for path to image to be specified
         img_fpath = img
-        import kwimage
-        img = kwimage.imread(img_fpath)
+        if os.fspath(img_fpath).endswith('.npy'):
+            img = np.load(img_fpath, mmap_mode='r')
+        else:
+            import kwimage
+            img = kwimage.imread(img_fpath)
+
+    # Handle tensor chw format in most cases
+    try:
+        if 'torch' in img.__module__:
+            img = img.cpu().data.numpy()
+    except Exception:
+        pass
+
+    from kwplot.mpl_pyramid import is_lazy_image
+    lazy = is_lazy_image(img)
+    if lazy:
+        # Only read the visible part of the image
+        from kwplot.mpl_pyramid import lazy_image_pyramid
+        img = lazy_image_pyramid(img, colorspace=colorspace,
+                                 cache_bytes=tile_cache_bytes)
+        pyramid = True
+    if live and (pyramid or max_display_pixels is not None):
+        raise ValueError(
+            'live=True cannot be used with pyramid, max_display_pixels, or '
+            'lazy image sources')
 
     valid_interpolation_choices = ['nearest', 'bicubic', 'bilinear']
 
@@ -420,14 +884,7 @@ def imshow(img,
             else:
                 plt_imshow_kwargs['vmax'] = 1.0
 
-    # Handle tensor chw format in most cases
-    try:
-        if 'torch' in img.__module__:
-            img = img.cpu().data.numpy()
-    except Exception:
-        pass
-
-    if img.ndim == 3:
+    if not lazy and img.ndim == 3:
         if img.shape[0] == 3 or img.shape[0] == 1:
             if img.shape[2] > 4:
                 # probably in chw format
@@ -438,41 +895,66 @@ def imshow(img,
         # https://stackoverflow.com/questions/49714222/can-matplotlib-imshow-coordinates-start-at-0-instead-of-0-5
         numrows, numcols = img.shape[0:2]
         plt_imshow_kwargs['extent'] = (0, numcols, numrows, 0)
+        origin_offset = 0.0
     elif origin_convention == 'center':
-        ...  # default case
+        origin_offset = -0.5  # default case
     else:
         raise KeyError(f'origin_convention={origin_convention}')
 
+    use_pyramid = pyramid or (
+        max_display_pixels is not None and
+        img.shape[0] * img.shape[1] > max_display_pixels)
+    if use_pyramid:
+        from kwplot.mpl_pyramid import pyramid_imshow
+
+        def _imshow(data, **kw):
+            return pyramid_imshow(
+                ax, data, offset=origin_offset, pyramid=pyramid,
+                max_display_pixels=max_display_pixels, **kw)
+    else:
+        _imshow = ax.imshow
+
     try:
         if len(img.shape) == 3 and (img.shape[2] == 3 or img.shape[2] == 4):
             # img is in a color format
             dst_space = 'rgb'
-            import kwimage
-            imgRGB = kwimage.convert_colorspace(img, src_space=colorspace,
-                                                dst_space=dst_space,
-                                                implicit=True)
-            if not norm:
+            if lazy:
+                # Tiles are converted as they are read
+                imgRGB = img
+            elif img.dtype == np.uint8 and _is_identity_colorspace(colorspace, img.shape[2]):
+                # Fast path: give uint8 RGB(A) data (or a CHW transposed view
+                # of it) to matplotlib without any intermediate copies.
+                imgRGB = img
+            elif colorspace.lower() == 'bgr' and img.shape[2] == 3:
+                # Reversing the channels is a view, a conversion is a copy
+                imgRGB = img[..., ::-1]
+            else:
+                import kwimage
+                imgRGB = kwimage.convert_colorspace(img, src_space=colorspace,
+                                                    dst_space=dst_space,
+                                                    implicit=True)
+            if not norm and not lazy:
                 if  imgRGB.dtype.kind == 'f':
                     maxval = imgRGB.max()
                     if maxval > 1.01 and maxval < 256:
                         imgRGB = np.array(imgRGB, dtype=np.uint8)
-            cs = ax.imshow(imgRGB, **plt_imshow_kwargs)
+            cs = _imshow(imgRGB, **plt_imshow_kwargs)
 
         elif len(img.shape) == 2 or (len(img.shape) == 3 and img.shape[2] == 1):
             # img is in grayscale
-            if len(img.shape) == 3:
+            if len(img.shape) == 3 and not lazy:
                 imgGRAY = img.reshape(img.shape[0:2])
             else:
                 imgGRAY = img
             if cmap is None:
-                cmap = plt.get_cmap('gray')
+                cmap = mpl.colormaps['gray']
             if isinstance(cmap, str):
-                cmap = plt.get_cmap(cmap)
+                cmap = mpl.colormaps[cmap]
             # for some reason gray floats aren't working right
             # if not norm:
             #     if imgGRAY.max() <= 1.01 and imgGRAY.min() >= -1E-9:
             #         imgGRAY = (imgGRAY * 255).astype(np.uint8)
-            cs = ax.imshow(imgGRAY, cmap=cmap, **plt_imshow_kwargs)
+            cs = _imshow(imgGRAY, cmap=cmap, **plt_imshow_kwargs)
         else:
             raise AssertionError(
                 'Unknown image format. '
@@ -507,8 +989,9 @@ def imshow(img,
             # References:
             #    https://github.com/matplotlib/matplotlib/issues/8307
             cbar.ax.yaxis.set_major_locator(mpl.ticker.LogLocator())  # <- Why? See refs
+            shown = cs.get_array() if lazy else img
             cbar.set_ticks(cbar.ax.yaxis.get_major_locator().tick_values(
-                img.min(), img.max()))
+                shown.min(), shown.max()))
 
         # scores = np.unique(img.flatten())
         # if cmap is None:
@@ -520,10 +1003,32 @@ def imshow(img,
         ax.set_xlabel(xlabel)
 
     if figtitle is not None:
-        set_figtitle(figtitle)
+        set_figtitle(figtitle, fig=fig)
+    if live:
+        from kwplot.mpl_live import LiveImage
+        return LiveImage(fig, ax, cs, colorspace=colorspace)
     return FigureAxes(fig, ax)
 
 
+def _is_identity_colorspace(colorspace, num_channels):
+    """
+    Check if image data in a colorspace can be given to matplotlib as-is.
+
+    Example:
+        >>> from kwplot.mpl_core import _is_identity_colorspace
+        >>> assert _is_identity_colorspace('rgb', 3)
+        >>> assert _is_identity_colorspace('RGB', 4)
+        >>> assert not _is_identity_colorspace('bgr', 3)
+        >>> assert not _is_identity_colorspace('rgba', 3)
+    """
+    colorspace = colorspace.lower()
+    if colorspace == 'rgb':
+        return num_channels in {3, 4}
+    if colorspace == 'rgba':
+        return num_channels == 4
+    return False
+
+
 def set_figtitle(figtitle, subtitle='', forcefignum=True, incanvas=True,
                  size=None, fontfamily=None, fontweight=None,
                  fig=None):
@@ -553,10 +1058,10 @@ def set_figtitle(figtitle, subtitle='', forcefignum=True, incanvas=True,
         >>> # xdoctest: +REQUIRES(--show)
         >>> show_if_requested()
     """
-    from matplotlib import pyplot as plt
     if figtitle is None:
         figtitle = ''
     if fig is None:
+        from matplotlib import pyplot as plt
         fig = plt.gcf()
     figtitle = ub.ensure_unicode(figtitle)
     subtitle = ub.ensure_unicode(subtitle)
@@ -580,9 +1085,9 @@ def set_figtitle(figtitle, subtitle='', forcefignum=True, incanvas=True,
     else:
         fig.suptitle('')
     # Set title in the window
-    window_figtitle = ('fig(%d) ' % fig.number) + figtitle
-    window_figtitle = window_figtitle.replace('\n', ' ')
     if fig.canvas.manager is not None:
+        window_figtitle = ('fig(%d) ' % fig.number) + figtitle
+        window_figtitle = window_figtitle.replace('\n', ' ')
         fig.canvas.manager.set_window_title(window_figtitle)
 
 
@@ -626,16 +1131,25 @@ def distinct_markers(num, style='astrisk', total=None, offset=0):
     return marker_list
 
 
-def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cmap_seed=None):
+def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cmap_seed=None,
+                    as_array=False):
     r"""
     DEPRECATED in favor of :func:`kwimage.Color.distinct`
 
     Args:
         N (int):
         brightness (float):
+        as_array (bool):
+            if True, return an (N, 3) float array instead of a list of
+            tuples (or (N, 4) RGBA if ``cmap_seed`` is given). The array is
+            shared between calls and is read-only.
 
     Returns:
-        list: RGB_tuples
+        list | ndarray: RGB_tuples
+
+    Note:
+        Results are cached on ``(N, brightness, randomize, hue_range,
+        cmap_seed)``, so repeated calls do not recompute the colors.
 
     TODO:
         - [ ] This is VERY old code that needs massive cleanup.
@@ -658,6 +1172,21 @@ def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cm
         python -m .color_funcs --exec-distinct_colors --show --no-randomize --N 50
         python -m .color_funcs --exec-distinct_colors --show --cmap_seed=foobar
 
+    Example:
+        >>> from kwplot.mpl_core import *  # NOQA
+        >>> import colorsys
+        >>> colors = distinct_colors(5, randomize=False)
+        >>> arr = distinct_colors(5, randomize=False, as_array=True)
+        >>> assert arr.shape == (5, 3) and not arr.flags.writeable
+        >>> assert colors == list(map(tuple, arr.tolist()))
+        >>> # Hues past the yellow range are shifted to skip it
+        >>> assert np.allclose(colors[1], colorsys.hsv_to_rgb(0.178 + 0.11, 0.878, 0.878))
+        >>> assert distinct_colors(5, randomize=False, as_array=True) is arr
+        >>> # Each call returns a new list of the cached tuples
+        >>> colors2 = distinct_colors(5, randomize=False)
+        >>> assert colors2 == colors and colors2 is not colors
+        >>> assert colors2[0] is colors[0]
+
     Ignore:
         >>> # xdoctest: +SKIP
         >>> import kwplot
@@ -678,18 +1207,97 @@ def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cm
         >>> testshow_colors(color_list)
         >>> show_if_requested()
     """
+    cmap_hack, ncolor_hack = _distinct_colors_hacks()
+    hue_range = tuple(hue_range)
+    key = (N, brightness, randomize, hue_range, cmap_seed)
+    try:
+        hash(key)
+    except TypeError:
+        cacheable = False
+    else:
+        cacheable = cmap_hack is None and ncolor_hack is None
+    if cacheable:
+        colors, color_tuples = _cached_distinct_colors(*key)
+        if as_array:
+            return colors
+        return list(color_tuples)
+    colors = _distinct_colors_array(*key, cmap_hack=cmap_hack,
+                                    ncolor_hack=ncolor_hack)
+    colors.setflags(write=False)
+    if as_array:
+        return colors
+    return list(map(tuple, colors.tolist()))
+
+
+@functools.lru_cache(maxsize=None)
+def _distinct_colors_hacks():
+    """
+    The ``--cmap-hack`` and ``--ncolor-hack`` command line overrides of
+    :func:`distinct_colors`. These are only parsed once.
+    """
+    cmap_hack = ub.argval('--cmap-hack', default=None)
+    ncolor_hack = ub.argval('--ncolor-hack', default=None)
+    return cmap_hack, ncolor_hack
+
+
+def _hsv_to_rgb(hsv):
+    """
+    Vectorized version of :func:`colorsys.hsv_to_rgb`.
+
+    Args:
+        hsv (ndarray): (N, 3) array of hue, saturation, and value in [0, 1]
+
+    Returns:
+        ndarray: (N, 3) array of RGB values
+
+    Example:
+        >>> from kwplot.mpl_core import _hsv_to_rgb
+        >>> import colorsys
+        >>> hsv = np.random.RandomState(0).rand(100, 3)
+        >>> hsv[0:6, 1] = 0
+        >>> expected = np.array([colorsys.hsv_to_rgb(*row) for row in hsv])
+        >>> assert np.array_equal(_hsv_to_rgb(hsv), expected)
+    """
+    hsv = np.asarray(hsv, dtype=float)
+    h, s, v = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+    i = (h * 6.0).astype(int)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+    # Rows of (r, g, b) choices for each sector of the hue circle
+    choices = np.stack([
+        np.stack([v, t, p], axis=1),
+        np.stack([q, v, p], axis=1),
+        np.stack([p, v, t], axis=1),
+        np.stack([p, q, v], axis=1),
+        np.stack([t, p, v], axis=1),
+        np.stack([v, p, q], axis=1),
+    ], axis=0)
+    rgb = choices[i, np.arange(len(i))]
+    gray = s == 0.0
+    rgb[gray] = v[gray, None]
+    return rgb
+
+
+def _distinct_colors_array(N, brightness, randomize, hue_range, cmap_seed,
+                           cmap_hack=None, ncolor_hack=None):
+    """
+    Computes the colors for :func:`distinct_colors` as an array.
+    """
     # TODO: Add sin wave modulation to the sat and value
     # HACK for white figures
-    from matplotlib import pyplot as plt
-    import colorsys
     remove_yellow = True
 
     use_jet = False
     if use_jet:
-        cmap = plt.cm.jet
-        RGB_tuples = list(map(tuple, cmap(np.linspace(0, 1, N))))
+        import matplotlib as mpl
+        cmap = mpl.colormaps['jet']
+        colors = cmap(np.linspace(0, 1, N))
     elif cmap_seed is not None:
         # Randomized map based on a seed
+        import matplotlib as mpl
         #cmap_ = 'Set1'
         #cmap_ = 'Dark2'
         choices = [
@@ -700,8 +1308,6 @@ def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cm
             #'gnuplot',
             #'Accent'
         ]
-        cmap_hack = ub.argval('--cmap-hack', default=None)
-        ncolor_hack = ub.argval('--ncolor-hack', default=None)
         if cmap_hack is not None:
             choices = [cmap_hack]
         if ncolor_hack is not None:
@@ -710,28 +1316,18 @@ def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cm
         seed = sum(list(map(ord, ub.hash_data(cmap_seed))))
         rng = np.random.RandomState(seed + 48930)
         cmap_str = rng.choice(choices, 1)[0]
-        #print('cmap_str = %r' % (cmap_str,))
-        cmap = plt.cm.get_cmap(cmap_str)
-        #.hashstr27(cmap_seed)
-        #cmap_seed = 0
-        #pass
+        cmap = mpl.colormaps[cmap_str]
         jitter = (rng.randn(N) / (rng.randn(100).max() / 2)).clip(-1, 1) * ((1 / (N ** 2)))
         range_ = np.linspace(0, 1, N, endpoint=False)
-        #print('range_ = %r' % (range_,))
         range_ = range_ + jitter
-        #print('range_ = %r' % (range_,))
         while not (np.all(range_ >= 0) and np.all(range_ <= 1)):
             range_[range_ < 0] = np.abs(range_[range_ < 0] )
             range_[range_ > 1] = 2 - range_[range_ > 1]
-        #print('range_ = %r' % (range_,))
         shift = rng.rand()
         range_ = (range_ + shift) % 1
-        #print('jitter = %r' % (jitter,))
-        #print('shift = %r' % (shift,))
-        #print('range_ = %r' % (range_,))
         if ncolor_hack is not None:
             range_ = range_[0:N_]
-        RGB_tuples = list(map(tuple, cmap(range_)))
+        colors = cmap(range_)
     else:
         sat = brightness
         val = brightness
@@ -746,14 +1342,26 @@ def distinct_colors(N, brightness=.878, randomize=True, hue_range=(0.0, 1.0), cm
         hue_list = np.linspace(hmin, hmax_, N, endpoint=False, dtype=float)
         # Remove colors (like hard to see yellows) in specified ranges
         for skip, range_ in zip(hue_skips, hue_skip_ranges):
-            hue_list = [hue if hue <= skip[0] else hue + range_ for hue in hue_list]
-        HSV_tuples = [(hue, sat, val) for hue in hue_list]
-        RGB_tuples = [colorsys.hsv_to_rgb(*x) for x in HSV_tuples]
+            hue_list = np.where(hue_list <= skip[0], hue_list, hue_list + range_)
+        hsv = np.empty((len(hue_list), 3), dtype=float)
+        hsv[:, 0] = hue_list
+        hsv[:, 1] = sat
+        hsv[:, 2] = val
+        colors = _hsv_to_rgb(hsv)
     if randomize:
         import kwarray
         rng = kwarray.ensure_rng(rng=0)
-        rng.shuffle(RGB_tuples)
-    return RGB_tuples
+        rng.shuffle(colors)
+    return colors
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_distinct_colors(N, brightness, randomize, hue_range, cmap_seed):
+    colors = _distinct_colors_array(N, brightness, randomize, hue_range,
+                                    cmap_seed)
+    colors.setflags(write=False)
+    color_tuples = tuple(map(tuple, colors.tolist()))
+    return colors, color_tuples
 
 
 def phantom_legend(label_to_color=None, label_to_attrs=None, mode='line', ax=None, legend_id=None, loc=0):
@@ -773,12 +1381,14 @@ def phantom_legend(label_to_color=None, label_to_attrs=None, mode='line', ax=Non
     TODO:
         - [ ] More docs and ensure this exists in the right place
     """
-    import kwplot
-    import kwimage
     import ubelt as ub
-    plt = kwplot.autoplt()
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Circle
+    from kwplot.mpl_color import resolve_color
 
     if ax is None:
+        import kwplot
+        plt = kwplot.autoplt()
         ax = plt.gca()
 
     _phantom_legends = getattr(ax, '_phantom_legends', None)
@@ -808,18 +1418,18 @@ def phantom_legend(label_to_color=None, label_to_attrs=None, mode='line', ax=Non
     for row in legend_rows:
         row_type = row.pop('type')
         color = row['color']
-        color = kwimage.Color(color).as01()
+        color = resolve_color(color, space=None)
         row['color'] = color
         if row_type == 'line':
-            phantom_actor = plt.Line2D((0, 0), (1, 1), **row)
+            phantom_actor = Line2D((0, 0), (1, 1), **row)
         elif row_type == 'circle':
             row['fc'] = row.pop('color')
-            phantom_actor = plt.Circle((0, 0), 1, **row)
+            phantom_actor = Circle((0, 0), 1, **row)
         elif row_type == 'star':
             row['mfc'] = row.pop('color')
             row['mec'] = row['mfc']
             # https://stackoverflow.com/questions/68120813/how-to-have-a-poligon-in-the-legend
-            phantom_actor = plt.Line2D([0], [0], linestyle='none', marker='*', **row)
+            phantom_actor = Line2D([0], [0], linestyle='none', marker='*', **row)
             # label='blue square'),
             # # not sure why this isn't working
             # star_xy = np.array([[-3.63271264e-01, -1.18033989e-01],
@@ -857,7 +1467,13 @@ def close_figures(figures=None):
     """
     if figures is None:
         figures = all_figures()
+    with _FIGURE_LRU_LOCK:
+        for fig in figures:
+            _FIGURE_LRU.pop(id(fig), None)
     for fig in figures:
+        if not _is_managed(fig):
+            _forget_unmanaged_fig(fig)
+            continue
         # TODO: make work for more than QT
         if hasattr(fig.canvas.manager, 'window'):
             try:
@@ -873,15 +1489,33 @@ def close_figures(figures=None):
             plt.close(fig)
 
 
-def all_figures():
+def _forget_unmanaged_fig(fig):
+    """
+    Remove a figure from the current thread's unmanaged figure registry
+    """
+    registry = getattr(_UNMANAGED_STATE, 'figures', None)
+    if registry:
+        for fnum, other in list(registry.items()):
+            if other is fig:
+                registry.pop(fnum)
+    fig.clf()
+    fig._kwplot_closed = True
+
+
+def all_figures(include_unmanaged=False):
     """
     Return a list of all open figures
 
+    Args:
+        include_unmanaged (bool):
+            if True, also include open figures created by
+            ``kwplot.figure(managed=False)``. Defaults to False.
+
     Returns:
         List[mpl.figure.Figure]: list of all figures
     """
-    #import matplotlib as mpl
-    manager_list = mpl._pylab_helpers.Gcf.get_all_fig_managers()
+    from matplotlib._pylab_helpers import Gcf
+    manager_list = Gcf.get_all_fig_managers()
     all_figures = []
     # Make sure you dont show figures that this module closed
     for manager in manager_list:
@@ -892,4 +1526,88 @@ def all_figures():
         all_figures.append(fig)
     # Return all the figures sorted by their number
     all_figures = sorted(all_figures, key=lambda fig: fig.number)
+    if include_unmanaged:
+        with _FIGURE_LRU_LOCK:
+            refs = list(_FIGURE_LRU.values())
+        for ref in refs:
+            fig = ref()
+            if fig is not None and not _is_managed(fig) and _figure_is_open(fig):
+                all_figures.append(fig)
     return all_figures
+
+
+def release_all(collect=True):
+    """
+    Close all open figures created by :func:`kwplot.figure` in bulk and free
+    their memory.
+
+    This closes every figure kwplot tracks (managed and unmanaged), and then
+    runs the garbage collector. Pyplot figures that were not created by
+    kwplot are left open.
+
+    Args:
+        collect (bool): if True run :func:`gc.collect`. Defaults to True.
+
+    Returns:
+        Dict[str, int]:
+            the number of figures closed ("num_closed") and an estimate of
+            the number of bytes held by their render buffers and data
+            ("bytes_estimated"). The estimate counts the Agg render buffer
+            (if the figure was drawn on its canvas), the image arrays and
+            their resampled caches, and the line and collection coordinates.
+            Memory held elsewhere (e.g. GUI windows, or other references to
+            the data) is not counted, and the memory is only returned to the
+            operating system if nothing else references it.
+
+    Example:
+        >>> import kwplot
+        >>> import numpy as np
+        >>> fig = kwplot.figure(fnum=1, managed=False, doclf=True)
+        >>> _ = kwplot.imshow(np.zeros((100, 100)), ax=fig.gca())
+        >>> fig.canvas.draw()
+        >>> plt = kwplot.autoplt()
+        >>> other = plt.figure()
+        >>> info = kwplot.release_all()
+        >>> assert info['num_closed'] >= 1
+        >>> assert info['bytes_estimated'] >= 100 * 100 * 8
+        >>> assert fig not in kwplot.all_figures(include_unmanaged=True)
+        >>> # Figures not created by kwplot are left open
+        >>> assert plt.fignum_exists(other.number)
+        >>> plt.close(other)
+    """
+    import gc
+    with _FIGURE_LRU_LOCK:
+        refs = list(_FIGURE_LRU.values())
+        _FIGURE_LRU.clear()
+    figures = [ref() for ref in refs]
+    figures = [fig for fig in figures
+               if fig is not None and _figure_is_open(fig)]
+    bytes_estimated = sum(_estimate_figure_nbytes(fig) for fig in figures)
+    close_figures(figures)
+    if collect:
+        gc.collect()
+    return {'num_closed': len(figures), 'bytes_estimated': bytes_estimated}
+
+
+def _estimate_figure_nbytes(fig):
+    """
+    Estimate the memory used by the render buffer and data of a figure.
+    """
+    nbytes = 0
+    renderer = getattr(fig.canvas, 'renderer', None)
+    if renderer is not None and hasattr(renderer, 'buffer_rgba'):
+        nbytes += memoryview(renderer.buffer_rgba()).nbytes
+    for ax in fig.axes:
+        for image in ax.images:
+            data = image.get_array()
+            if data is not None:
+                nbytes += data.nbytes
+            # The resampled copy kept between draws
+            cache = getattr(image, '_imcache', None)
+            if cache is not None:
+                nbytes += getattr(cache, 'nbytes', 0)
+        for line in ax.lines:
+            nbytes += line.get_xydata().nbytes
+        for collection in ax.collections:
+            nbytes += np.asarray(collection.get_offsets()).nbytes
+    return nbytes
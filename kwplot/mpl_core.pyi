@@ -1,5 +1,7 @@
 import matplotlib as mpl
+from os import PathLike
 from numpy import ndarray
+from numpy.typing import ArrayLike
 from typing import List
 from typing import Tuple
 from typing import Dict
@@ -23,6 +25,9 @@ def figure(fnum: int | None = None,
            doclf: bool = False,
            docla: bool = False,
            projection: Incomplete | None = ...,
+           managed: bool = True,
+           fig: mpl.figure.Figure | None = None,
+           recycle: bool = False,
            **kwargs) -> mpl.figure.Figure:
     ...
 
@@ -41,7 +46,7 @@ def show_if_requested(N: int = ...) -> None:
     ...
 
 
-def imshow(img: ndarray,
+def imshow(img: ndarray | str | PathLike | ArrayLike,
            fnum: int | None = None,
            pnum: tuple | None = None,
            xlabel: str | None = None,
@@ -55,6 +60,10 @@ def imshow(img: ndarray,
            interpolation: str = 'nearest',
            alpha: Incomplete | None = ...,
            show_ticks: bool = ...,
+           max_display_pixels: int | None = None,
+           pyramid: bool = False,
+           tile_cache_bytes: int | None = None,
+           live: bool = False,
            **kwargs) -> tuple:
     ...
 
@@ -81,7 +90,8 @@ def distinct_colors(N: int,
                     brightness: float = 0.878,
                     randomize: bool = ...,
                     hue_range=...,
-                    cmap_seed: Incomplete | None = ...) -> list:
+                    cmap_seed: Incomplete | None = ...,
+                    as_array: bool = False) -> list | ndarray:
     ...
 
 
@@ -98,5 +108,14 @@ def close_figures(figures: List[mpl.figure.Figure] | None = None) -> None:
     ...
 
 
-def all_figures() -> List[mpl.figure.Figure]:
+def all_figures(
+        include_unmanaged: bool = False) -> List[mpl.figure.Figure]:
+    ...
+
+
+def release_all(collect: bool = True) -> Dict[str, int]:
+    ...
+
+
+def set_max_figures(num: int | None) -> int | None:
     ...
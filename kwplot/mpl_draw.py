@@ -14,7 +14,8 @@ import copy
 import numpy as np
 import ubelt as ub
 
-__all__ = [
+# The deprecated kwimage re-exports are provided by __getattr__
+__all__ = [  # NOQA
     'draw_boxes',
     'draw_line_segments',
     'plot_matrix',
@@ -27,25 +28,36 @@ __all__ = [
 
 
 def draw_boxes(boxes, alpha=None, color='blue', labels=None, centers=False,
-               fill=False, ax=None, lw=2):
+               fill=False, ax=None, lw=2, label_min_pixels=8, declutter=True):
     """
     Draws boxes using matplotlib
 
+    All boxes are drawn as a single :class:`matplotlib.collections.PolyCollection`
+    built directly from the box coordinates, so drawing many boxes does not
+    create a Python object per box.
+
     Args:
-        boxes (kwimage.Boxes):
+        boxes (kwimage.Boxes | ndarray):
+            the boxes to draw. An (N, 4) array is interpreted as xywh.
 
-        color (str | Any | List[Any]):
+        color (str | Any | List[Any] | ndarray):
             one color for all boxes or a list of colors for each box
             Can be any type accepted by kwimage.Color.coerce.
+            An (N, 3) or (N, 4) array is interpreted as per-box RGB(A)
+            colors (0-255 if integer, 0-1 otherwise).
             Extended types: str | ColorLike | List[ColorLike]
 
-        alpha (float | List[float] | None):
+        alpha (float | List[float] | ndarray | None):
             A single transparency for all boxes, or a list of
             transparencies for each box.
 
-        labels (List[str] | None): a text label for each box
+        labels (List[str] | None): a text label for each box. All labels are
+            drawn by one :class:`kwplot.mpl_labels.LabelLayer`, which only
+            shows the labels that are readable at the current zoom.
 
-        centers (bool): if True, draw box centers.
+        centers (bool | dict): if True, draw box centers. If a dictionary,
+            it may specify the ``radius`` of the center markers in data units
+            (defaults to 5), ``fill``, and other collection properties.
 
         lw (float): linewidth for the box edges
 
@@ -53,68 +65,107 @@ def draw_boxes(boxes, alpha=None, color='blue', labels=None, centers=False,
             if specified, draws on this existing axes, otherwise defaults
             to the current axes.
 
-        setlim (bool):
-            if True will set the limit of the axes to show the drawn boxes.
+        label_min_pixels (float):
+            labels of boxes with a width or height smaller than this many
+            screen pixels are not drawn.
+
+        declutter (bool):
+            if True, labels that would overlap the label of a larger box are
+            not drawn.
 
     Example:
         >>> import kwimage
         >>> bboxes = kwimage.Boxes([[.1, .1, .6, .3], [.3, .5, .5, .6]], 'xywh')
         >>> draw_boxes(bboxes)
         >>> #kwplot.autompl()
+
+    Example:
+        >>> # Per-box colors and alphas are passed as arrays
+        >>> import kwplot
+        >>> import numpy as np
+        >>> fig = kwplot.figure(managed=False)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> rng = np.random.RandomState(0)
+        >>> xywh = np.hstack([rng.rand(1000, 2) * 100, rng.rand(1000, 2) * 10])
+        >>> colors = rng.rand(1000, 3)
+        >>> alpha = rng.rand(1000)
+        >>> draw_boxes(xywh, color=colors, alpha=alpha, centers=True, ax=ax)
+        >>> poly, circles = ax.collections
+        >>> assert len(poly.get_paths()) == 1000
+        >>> assert np.allclose(poly.get_edgecolor()[:, 3], alpha)
+        >>> assert np.allclose(circles.get_offsets(), xywh[:, 0:2] + xywh[:, 2:4] / 2)
+
+    Example:
+        >>> # Labels are drawn by a single artist that skips unreadable labels
+        >>> import kwplot
+        >>> import numpy as np
+        >>> fig = kwplot.figure(managed=False)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> xywh = np.array([[0, 0, 50, 50], [5, 5, 50, 50], [60, 60, 0.1, 0.1]])
+        >>> draw_boxes(xywh, labels=['big', 'overlapping', 'tiny'], ax=ax)
+        >>> ax.set_xlim(0, 120)
+        >>> ax.set_ylim(120, 0)
+        >>> fig.canvas.draw()
+        >>> assert len(ax.texts) == 1
+        >>> layer = ax.texts[0]._kwplot_label_layer
+        >>> print([layer.labels[i] for i in layer.visible_idxs])
+        ['big']
     """
-    import kwplot
     import matplotlib as mpl
-    from matplotlib import pyplot as plt
     if ax is None:
+        from matplotlib import pyplot as plt
         ax = plt.gca()
 
-    xywh = boxes.to_xywh().data
-
-    transparent = kwplot.Color((0, 0, 0, 0)).as01('rgba')
-
-    # More grouped patches == more efficient runtime
-    if alpha is None:
-        alpha = [1.0] * len(xywh)
-    elif not ub.iterable(alpha):
-        alpha = [alpha] * len(xywh)
-
-    edgecolors = [kwplot.Color(color, alpha=a).as01('rgba')
-                  for a in alpha]
-    color_groups = ub.group_items(range(len(edgecolors)), edgecolors)
-    for edgecolor, idxs in color_groups.items():
-        if fill:
-            fc = edgecolor
-        else:
-            fc = transparent
-        rectkw = dict(ec=edgecolor, fc=fc, lw=lw, linestyle='solid')
-        patches = [mpl.patches.Rectangle((x, y), w, h, **rectkw)
-                   for x, y, w, h in xywh[idxs]]
-        col = mpl.collections.PatchCollection(patches, match_original=True)
-        ax.add_collection(col)
+    if hasattr(boxes, 'to_xywh'):
+        xywh = boxes.to_xywh().data
+    else:
+        xywh = boxes
+    xywh = np.asarray(xywh, dtype=float).reshape(-1, 4)
+    num = len(xywh)
+
+    from kwplot.mpl_color import resolve_many
+    edgecolors = resolve_many(color, alpha, num=num)
+
+    x1, y1, w, h = xywh.T
+    x2 = x1 + w
+    y2 = y1 + h
+    verts = np.empty((num, 4, 2), dtype=float)
+    verts[:, 0, 0] = x1
+    verts[:, 0, 1] = y1
+    verts[:, 1, 0] = x2
+    verts[:, 1, 1] = y1
+    verts[:, 2, 0] = x2
+    verts[:, 2, 1] = y2
+    verts[:, 3, 0] = x1
+    verts[:, 3, 1] = y2
+
+    facecolors = edgecolors if fill else 'none'
+    col = mpl.collections.PolyCollection(
+        verts, closed=True, edgecolors=edgecolors, facecolors=facecolors,
+        linewidths=lw, linestyles='solid')
+    ax.add_collection(col)
 
     if centers not in [None, False]:
-        default_centerkw = {
-            # 'radius': 1,
-            'fill': True
-        }
-        centerkw = default_centerkw.copy()
+        centerkw = {}
         if isinstance(centers, dict):
             centerkw.update(centers)
-        xy_centers = boxes.xy_center
-        for fcolor, idxs in color_groups.items():
-            # TODO: radius based on size of bbox
-            # if 'radius' not in centerkw:
-            #     boxes.area[idxs]
-
-            patches = [
-                mpl.patches.Circle((x, y), ec=None, fc=fcolor, **centerkw)
-                for x, y in xy_centers[idxs]
-            ]
-            col = mpl.collections.PatchCollection(patches, match_original=True)
-            ax.add_collection(col)
+        # Matches the default radius of a matplotlib Circle
+        radius = centerkw.pop('radius', 5)
+        if centerkw.pop('fill', True):
+            centerkw.setdefault('facecolors', edgecolors)
+            centerkw.setdefault('edgecolors', 'none')
+        else:
+            centerkw.setdefault('facecolors', 'none')
+            centerkw.setdefault('edgecolors', edgecolors)
+        xy_centers = xywh[:, 0:2] + xywh[:, 2:4] / 2
+        diameter = np.broadcast_to(np.asarray(radius, dtype=float) * 2, (num,))
+        center_col = mpl.collections.EllipseCollection(
+            diameter, diameter, np.zeros(num), units='xy', offsets=xy_centers,
+            offset_transform=ax.transData, **centerkw)
+        ax.add_collection(center_col)
 
     if labels:
-        texts = []
+        from kwplot.mpl_labels import LabelLayer
         default_textkw = {
             'horizontalalignment': 'left',
             'verticalalignment': 'top',
@@ -123,23 +174,35 @@ def draw_boxes(boxes, alpha=None, color='blue', labels=None, centers=False,
             'fontproperties': mpl.font_manager.FontProperties(
                 size=6, family='monospace'),
         }
-        tkw = default_textkw.copy()
-        for (x1, y1, w, h), label in zip(xywh, labels):
-            texts.append((x1, y1, label, tkw))
-        for (x1, y1, catname, tkw) in texts:
-            ax.text(x1, y1, catname, **tkw)
+        LabelLayer(ax, xywh[:, 0:2], labels, sizes=xywh[:, 2:4],
+                   min_pixels=label_min_pixels, declutter=declutter,
+                   **default_textkw)
 
 
-def draw_line_segments(pts1, pts2, ax=None, **kwargs):
+def draw_line_segments(pts1, pts2=None, ax=None, mode='vector', **kwargs):
     """
     draws `N` line segments between `N` pairs of points
 
     Args:
-        pts1 (ndarray): Nx2
-        pts2 (ndarray): Nx2
+        pts1 (ndarray): Nx2 start points, or an Nx2x2 array of segments.
+            Note that in "vector" mode the ``LineCollection`` still converts
+            each segment into its own float64 path.
+        pts2 (ndarray | None): Nx2 end points. Must be None if pts1 is an
+            array of segments.
         ax (None): (default = None)
+        mode (str):
+            If "vector", draws a :class:`matplotlib.collections.LineCollection`.
+            If "raster", accumulates the segments into an image with one
+            pixel per screen pixel of the visible window, which is much faster
+            for millions of segments. Raster lines are one pixel wide and the
+            image is recomputed when the view changes.
+            See :class:`kwplot.mpl_raster.SegmentRaster`.
         **kwargs: lw, alpha, colors
 
+    Returns:
+        matplotlib.collections.LineCollection | matplotlib.image.AxesImage:
+            the artist that draws the segments
+
     Example:
         >>> import numpy as np
         >>> import kwplot
@@ -153,34 +216,106 @@ def draw_line_segments(pts1, pts2, ax=None, **kwargs):
         >>> ax.set_xlim(0, 1)
         >>> ax.set_ylim(0, 1)
         >>> kwplot.show_if_requested()
+
+    Example:
+        >>> # Many segments as a stacked array, drawn as an image
+        >>> import numpy as np
+        >>> import kwplot
+        >>> fig = kwplot.figure(managed=False)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> segments = np.random.rand(100000, 2, 2).astype(np.float32)
+        >>> artist = draw_line_segments(segments, ax=ax, mode='raster',
+        >>>                             color='orange', alpha=0.1)
+        >>> fig.canvas.draw()
+        >>> assert len(ax.get_images()) == 1 and len(ax.collections) == 0
+        >>> assert artist.get_array()[..., 3].max() > 0.5
     """
-    import matplotlib.pyplot as plt
     import matplotlib as mpl
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
-    assert len(pts1) == len(pts2), 'unaligned'
-    segments = [(xy1, xy2) for xy1, xy2 in zip(pts1, pts2)]
+    if pts2 is None:
+        segments = np.asarray(pts1)
+        if segments.ndim != 3 or segments.shape[1:] != (2, 2):
+            raise ValueError('segments must be an Nx2x2 array')
+    else:
+        assert len(pts1) == len(pts2), 'unaligned'
+        segments = np.stack([np.asarray(pts1), np.asarray(pts2)], axis=1)
     linewidth = kwargs.pop('lw', kwargs.pop('linewidth', 1.0))
     alpha = kwargs.pop('alpha', 1.0)
     if 'color' in kwargs:
-        kwargs['colors'] = kwargs['color']
+        kwargs['colors'] = kwargs.pop('color')
         # mpl.colors.ColorConverter().to_rgb(kwargs['color'])
-    line_group = mpl.collections.LineCollection(segments, linewidths=linewidth,
-                                                alpha=alpha, **kwargs)
-    ax.add_collection(line_group)
+    if mode == 'vector':
+        line_group = mpl.collections.LineCollection(
+            segments, linewidths=linewidth, alpha=alpha, **kwargs)
+        ax.add_collection(line_group)
+        return line_group
+    elif mode == 'raster':
+        from kwplot.mpl_color import resolve_color, resolve_many
+        from kwplot.mpl_raster import SegmentRaster
+        colors = kwargs.pop('colors', None)
+        if colors is None:
+            colors = mpl.colors.to_rgba(mpl.rcParams['lines.color'])
+        if isinstance(colors, str) or (
+                np.ndim(colors) == 1 and
+                np.asarray(colors).dtype.kind in 'iuf'):
+            colors = resolve_color(colors)
+        else:
+            colors = resolve_many(colors, num=len(segments))
+        raster = SegmentRaster(ax, segments, colors=colors, alphas=alpha,
+                               **kwargs)
+        return raster.artist
+    else:
+        raise KeyError(mode)
 
 
 def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
                 label=None, zerodiag=False, cmap='viridis', showvals=False,
                 showzero=True, logscale=False, xlabel=None, ylabel=None,
-                fnum=None, pnum=None):
+                fnum=None, pnum=None, cell_min_pixels=16, block_size=None,
+                groups=None, block_agg='sum'):
     """
     Helper for plotting confusion matrices
 
+    The cost of drawing does not grow with the number of cells: the grid is a
+    single collection that is hidden when cells are too small to see it,
+    tick labels are thinned to the ones that fit, and cell values are only
+    drawn for cells that are large enough to read (these are re-evaluated on
+    zoom). For very large matrices, ``block_size`` or ``groups`` aggregate the
+    matrix into blocks before it is shown.
+
     Args:
         matrix (ndarray | pd.DataFrame) : if a data frame then index, columns,
             xlabel, and ylabel will be defaulted to sensible values.
 
+        index (List | None): labels of the rows (shown as the x tick labels)
+
+        columns (List | None):
+            labels of the columns (shown as the y tick labels)
+
+        rot (float): rotation of the x tick labels
+
+        grid (bool): if True draw lines between the cells
+
+        showvals (bool): if True write the value in each cell
+
+        cell_min_pixels (float):
+            values are only written in cells that are at least this many
+            screen pixels wide and tall.
+
+        block_size (int | str | None):
+            if specified, aggregate blocks of this many rows and columns
+            into one cell. If "auto", pick the block size so there are at most
+            256 blocks along each axis.
+
+        groups (List | ndarray | None):
+            the group (e.g. the parent in a class hierarchy) of each row and
+            column of a square matrix. If specified, the matrix is aggregated
+            into one cell per pair of groups, in order of first appearance.
+
+        block_agg (str): how to aggregate blocks. Can be "sum" or "mean".
+
     TODO:
         - [ ] Finish args docs
         - [ ] Replace internals with seaborn
@@ -218,6 +353,50 @@ def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
         >>> matrix = np.array([[2, 2, 1], [3, 1, 0], [1, 0, 0]])
         >>> classes = ['cls1', 'cls2', 'cls3']
         >>> plot_matrix(matrix, index=classes, columns=classes)
+
+    Example:
+        >>> # xdoctest: +REQUIRES(module:pandas)
+        >>> # Large matrices only annotate cells that are big enough to read
+        >>> import kwplot
+        >>> from kwplot.mpl_draw import *  # NOQA
+        >>> fig = kwplot.figure(managed=False, figsize=(6, 6))
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> matrix = np.random.RandomState(0).randint(0, 10, (1000, 1000))
+        >>> plot_matrix(matrix, showvals=True, ax=ax)
+        >>> fig.canvas.draw()
+        >>> assert len(ax.texts) == 1
+        >>> layer = ax.texts[0]._kwplot_label_layer
+        >>> assert len(layer.visible_idxs) == 0
+        >>> assert len(ax.get_xticklabels()) < 20
+        >>> ax.set_xlim(-0.5, 9.5)
+        >>> ax.set_ylim(9.5, -0.5)
+        >>> fig.canvas.draw()
+        >>> assert len(layer.visible_idxs) == 100
+        >>> # Only a few of the 1000 tick labels are shown
+        >>> labels = [t.get_text() for t in ax.get_xticklabels()]
+        >>> assert 0 < len(labels) < 20 and '0' in labels
+
+    Example:
+        >>> # xdoctest: +REQUIRES(module:pandas)
+        >>> # Aggregate by blocks or by groups
+        >>> import kwplot
+        >>> from kwplot.mpl_draw import *  # NOQA
+        >>> fig = kwplot.figure(managed=False)
+        >>> matrix = np.ones((10, 10), dtype=int)
+        >>> ax = plot_matrix(matrix, block_size=4, ax=fig.add_subplot(1, 2, 1))
+        >>> blocks = ax.get_images()[0].get_array()
+        >>> assert blocks.shape == (3, 3)
+        >>> assert blocks.tolist() == [[16, 16, 8], [16, 16, 8], [8, 8, 4]]
+        >>> groups = ['a'] * 3 + ['b'] * 7
+        >>> ax = plot_matrix(matrix, groups=groups, block_agg='mean', ax=fig.add_subplot(1, 2, 2))
+        >>> ax.get_images()[0].get_array().tolist()
+        [[1.0, 1.0], [1.0, 1.0]]
+        >>> # Empty matrices have no blocks
+        >>> ax = plot_matrix(np.zeros((0, 0)), block_size=4, ax=fig.add_subplot(1, 2, 1))
+        >>> assert ax.get_images()[0].get_array().shape == (0, 0)
+        >>> # Figures with matrices can be pickled
+        >>> import pickle
+        >>> fig2 = pickle.loads(pickle.dumps(fig))
     """
     import pandas as pd
     import matplotlib as mpl
@@ -234,7 +413,7 @@ def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
                 ylabel = index.name
                 xlabel = columns.name
     else:
-        values = matrix
+        values = np.asarray(matrix)
 
     if index is None:
         index = np.arange(matrix.shape[0])
@@ -252,6 +431,26 @@ def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
         values = values.copy()
         values = values - np.diag(np.diag(values))
 
+    if groups is not None:
+        if values.shape[0] != values.shape[1]:
+            raise ValueError('groups require a square matrix')
+        codes, uniques = pd.factorize(np.asarray(groups))
+        values = _aggregate_blocks(values, codes, codes, len(uniques),
+                                   len(uniques), block_agg)
+        index = columns = [str(u) for u in uniques]
+    elif block_size is not None:
+        if block_size == 'auto':
+            block_size = max(1, int(np.ceil(max(values.shape) / 256)))
+        row_codes = np.arange(values.shape[0]) // block_size
+        col_codes = np.arange(values.shape[1]) // block_size
+        # Ceil division so an empty matrix has zero blocks
+        num_row_blocks = -(-values.shape[0] // block_size)
+        num_col_blocks = -(-values.shape[1] // block_size)
+        values = _aggregate_blocks(values, row_codes, col_codes,
+                                   num_row_blocks, num_col_blocks, block_agg)
+        index = _block_labels(index, block_size)
+        columns = _block_labels(columns, block_size)
+
     # aximg = ax.imshow(values, interpolation='none', cmap='viridis')
     if logscale:
         from matplotlib.colors import LogNorm
@@ -278,51 +477,49 @@ def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
     if label is not None:
         cax.set_label(label)
 
-    ax.set_xticks(list(range(len(index))))
-    ax.set_xticklabels([str(lbl)[0:100] for lbl in index])
-    for lbl in ax.get_xticklabels():
-        lbl.set_rotation(rot)
-    for lbl in ax.get_xticklabels():
-        lbl.set_horizontalalignment('center')
-
-    ax.set_yticks(list(range(len(columns))))
-    ax.set_yticklabels([str(lbl)[0:100] for lbl in columns])
-    for lbl in ax.get_yticklabels():
-        lbl.set_horizontalalignment('right')
-    for lbl in ax.get_yticklabels():
-        lbl.set_verticalalignment('center')
+    # Only label as many ticks as fit on the axis
+    num_rows, num_cols = values.shape
+    ax.xaxis.set_major_locator(mpl.ticker.MaxNLocator(
+        nbins='auto', integer=True, steps=[1, 2, 5, 10]))
+    ax.xaxis.set_major_formatter(mpl.ticker.FuncFormatter(
+        _IndexFormatter([str(lbl)[0:100] for lbl in index])))
+    ax.yaxis.set_major_locator(mpl.ticker.MaxNLocator(
+        nbins='auto', integer=True, steps=[1, 2, 5, 10]))
+    ax.yaxis.set_major_formatter(mpl.ticker.FuncFormatter(
+        _IndexFormatter([str(lbl)[0:100] for lbl in columns])))
+    ax.tick_params(axis='x', labelrotation=rot)
+    if num_rows and num_cols:
+        ax.set_xlim(-0.5, num_cols - 0.5)
+        ax.set_ylim(num_rows - 0.5, -0.5)
 
     # Grid lines around the pixels
     if grid:
-        offset = -.5
-        xlim = [-.5, len(columns)]
-        ylim = [-.5, len(index)]
-        segments = []
-        for x in range(ylim[1]):
-            xdata = [x + offset, x + offset]
-            ydata = ylim
-            segment = list(zip(xdata, ydata))
-            segments.append(segment)
-        for y in range(xlim[1]):
-            xdata = xlim
-            ydata = [y + offset, y + offset]
-            segment = list(zip(xdata, ydata))
-            segments.append(segment)
-        bingrid = mpl.collections.LineCollection(segments, color='w', linewidths=1)
-        ax.add_collection(bingrid)
+        xs = np.arange(num_cols + 1) - 0.5
+        ys = np.arange(num_rows + 1) - 0.5
+        segments = np.empty((len(xs) + len(ys), 2, 2))
+        segments[:len(xs), :, 0] = xs[:, None]
+        segments[:len(xs), :, 1] = [ys[0], ys[-1]]
+        segments[len(xs):, :, 0] = [xs[0], xs[-1]]
+        segments[len(xs):, :, 1] = ys[:, None]
+        from kwplot.mpl_artists import DrawHookLineCollection
+        bingrid = DrawHookLineCollection(
+            segments, color='w', linewidths=1,
+            draw_hook=_HideWhenCellsSmall(ax, min_pixels=4))
+        ax.add_collection(bingrid, autolim=False)
 
     if showvals:
-        x_basis = np.arange(len(columns))
-        y_basis = np.arange(len(index))
-        x, y = np.meshgrid(x_basis, y_basis)
-
-        for c, r in zip(x.flatten(), y.flatten()):
-            val = values[r, c]
-            if val == 0:
-                if showzero:
-                    ax.text(c, r, val, va='center', ha='center', color='white')
-            else:
-                ax.text(c, r, val, va='center', ha='center', color='white')
+        from kwplot.mpl_labels import LabelLayer
+        rows, cols = np.indices(values.shape).reshape(2, -1)
+        flat_values = values.ravel()
+        if not showzero:
+            flags = flat_values != 0
+            rows, cols, flat_values = rows[flags], cols[flags], flat_values[flags]
+        xy = np.stack([cols, rows], axis=1)
+        sizes = np.ones((len(xy), 2))
+        LabelLayer(ax, xy, _FormattedValues(flat_values), sizes=sizes,
+                   min_pixels=cell_min_pixels, declutter=False,
+                   verticalalignment='center', horizontalalignment='center',
+                   color='white')
 
     if xlabel is not None:
         ax.set_xlabel(xlabel)
@@ -332,12 +529,125 @@ def plot_matrix(matrix, index=None, columns=None, rot=90, ax=None, grid=True,
     return ax
 
 
+class _FormattedValues:
+    """
+    Sequence of the cell values as strings, formatted when they are accessed.
+    """
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, idx):
+        return str(self.values[idx])
+
+
+def _aggregate_blocks(values, row_codes, col_codes, num_row_blocks,
+                      num_col_blocks, agg='sum'):
+    """
+    Sum (or average) the cells of a matrix that share row and column codes.
+    """
+    flat_codes = (row_codes[:, None] * num_col_blocks + col_codes[None, :]).ravel()
+    size = num_row_blocks * num_col_blocks
+    totals = np.bincount(flat_codes, weights=values.ravel(), minlength=size)
+    if agg == 'sum':
+        if values.dtype.kind in 'iub':
+            totals = totals.round().astype(np.int64)
+        result = totals
+    elif agg == 'mean':
+        counts = np.bincount(flat_codes, minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = totals / counts
+    else:
+        raise KeyError(agg)
+    return result.reshape(num_row_blocks, num_col_blocks)
+
+
+def _block_labels(labels, block_size):
+    """
+    Label each block by its first and last label.
+    """
+    labels = list(labels)
+    block_labels = []
+    for start in range(0, len(labels), block_size):
+        first = labels[start]
+        last = labels[min(start + block_size, len(labels)) - 1]
+        if start + 1 == min(start + block_size, len(labels)):
+            block_labels.append(str(first))
+        else:
+            block_labels.append('{}-{}'.format(first, last))
+    return block_labels
+
+
+class _IndexFormatter:
+    """
+    Tick formatter that labels integer positions with the label at that index.
+    """
+    def __init__(self, labels):
+        self.labels = labels
+
+    def __call__(self, x, pos=None):
+        idx = int(round(x))
+        if idx == x and 0 <= idx < len(self.labels):
+            return self.labels[idx]
+        return ''
+
+
+class _HideWhenCellsSmall:
+    """
+    Draw hook that only draws an artist when one data unit is at least
+    ``min_pixels`` on screen.
+    """
+    def __init__(self, ax, min_pixels):
+        self.ax = ax
+        self.min_pixels = min_pixels
+
+    def __call__(self, renderer, draw):
+        (x0, y0), (x1, y1) = self.ax.transData.transform([(0, 0), (1, 1)])
+        if min(abs(x1 - x0), abs(y1 - y0)) >= self.min_pixels:
+            return draw(renderer)
+
+
 def draw_points(xy, color='blue', class_idxs=None, classes=None, ax=None,
                 alpha=None, radius=1, **kwargs):
     """
+    Draws points as filled circles using matplotlib
+
+    All points are drawn as a single
+    :class:`matplotlib.collections.EllipseCollection` with radii in data
+    units, and colors are passed as an (N, 4) array, so no Python objects are
+    created per point.
 
     Args:
-        xy (ndarray): of points.
+        xy (ndarray): (N, 2) array of points.
+
+        color (str | Any | List[Any] | ndarray):
+            One color for all points, a color for each point, "distinct" to
+            give each point a different color, or "classes" to color the
+            points by ``class_idxs`` using a distinct color for each class.
+
+        class_idxs (ndarray | None):
+            (N,) index of the class of each point. Used if color is "classes".
+
+        classes (List[str] | None):
+            the class names. Used if color is "classes".
+
+        ax (matplotlib.axes.Axes | None):
+            if specified, draws on this existing axes, otherwise defaults
+            to the current axes.
+
+        alpha (float | ndarray | None):
+            A single transparency for all points, or one for each point.
+
+        radius (float | ndarray):
+            radius of the circles in data units, or one radius for each point.
+
+        **kwargs: other properties of the collection, e.g. ``ec`` or
+            ``zorder``.
+
+    Returns:
+        List[matplotlib.collections.EllipseCollection]
 
     Example:
         >>> from kwplot.mpl_draw import *  # NOQA
@@ -347,27 +657,39 @@ def draw_points(xy, color='blue', class_idxs=None, classes=None, ax=None,
         >>> draw_points(xy, class_idxs=np.random.randint(0, 3, 10),
         >>>         radius=0.01, classes=['a', 'b', 'c'], color='classes')
 
+    Example:
+        >>> # Class colors are looked up from a table
+        >>> import kwplot
+        >>> import kwimage
+        >>> fig = kwplot.figure(managed=False)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> xy = np.random.rand(1000, 2)
+        >>> class_idxs = np.random.randint(0, 3, 1000)
+        >>> col, = draw_points(xy, color='classes', class_idxs=class_idxs,
+        >>>                    classes=['a', 'b', 'c'], alpha=0.5, ax=ax)
+        >>> table = np.array(kwimage.Color.distinct(3))
+        >>> assert np.allclose(col.get_facecolor()[:, 0:3], table[class_idxs])
+        >>> assert np.allclose(col.get_facecolor()[:, 3], 0.5)
+
     Ignore:
         >>> import kwplot
         >>> kwplot.autompl()
     """
     import kwimage
     import matplotlib as mpl
-    from matplotlib import pyplot as plt
+    from kwplot.mpl_color import resolve_many
     if ax is None:
+        from matplotlib import pyplot as plt
         ax = plt.gca()
 
-    xy = xy.reshape(-1, 2)
-
-    # More grouped patches == more efficient runtime
-    if alpha is None:
-        alpha = [1.0] * len(xy)
-    elif not ub.iterable(alpha):
-        alpha = [alpha] * len(xy)
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    num = len(xy)
 
-    if color == 'distinct':
-        colors = kwimage.Color.distinct(len(alpha))
-    elif color == 'classes':
+    if isinstance(color, str) and color == 'distinct':
+        ptcolors = resolve_many(
+            np.asarray(kwimage.Color.distinct(num), dtype=float).reshape(-1, 3),
+            num=num)
+    elif isinstance(color, str) and color == 'classes':
         # TODO: read colors from categories if they exist
         if class_idxs is None or classes is None:
             raise Exception('cannot draw class colors without class_idxs and classes')
@@ -375,43 +697,34 @@ def draw_points(xy, color='blue', class_idxs=None, classes=None, ax=None,
             cls_colors = kwimage.Color.distinct(len(classes))
         except KeyError:
             raise Exception('cannot draw class colors without class_idxs and classes')
-        import kwarray
-        _keys, _vals = kwarray.group_indices(class_idxs)
-        colors = list(ub.take(cls_colors, class_idxs))
+        table = resolve_many(
+            np.asarray(cls_colors, dtype=float).reshape(-1, 3))
+        ptcolors = table[np.asarray(class_idxs, dtype=int)]
     else:
-        colors = [color] * len(alpha)
+        ptcolors = resolve_many(color, num=num)
 
-    ptcolors = [kwimage.Color(c, alpha=a).as01('rgba')
-                for c, a in zip(colors, alpha)]
-    color_groups = ub.group_items(range(len(ptcolors)), ptcolors)
+    if alpha is not None:
+        ptcolors[:, 3] = np.broadcast_to(np.asarray(alpha, dtype=float),
+                                         (num,))
 
-    circlekw = {
-        'radius': radius,
-        'fill': True,
-        'ec': None,
-    }
     if 'fc' in kwargs:
         import warnings
-        warnings.warning(
+        warnings.warn(
             'Warning: specifying fc to Points.draw overrides '
             'the color argument. Use color instead')
-    circlekw.update(kwargs)
-    fc = circlekw.pop('fc', None)  # hack
-
-    collections = []
-    for pcolor, idxs in color_groups.items():
-
-        # hack for fc
-        if fc is not None:
-            pcolor = fc
-
-        patches = [
-            mpl.patches.Circle((x, y), fc=pcolor, **circlekw)
-            for x, y in xy[idxs]
-        ]
-        col = mpl.collections.PatchCollection(patches, match_original=True)
-        collections.append(col)
-        ax.add_collection(col)
+        ptcolors = kwargs.pop('fc')
+    collkw = {
+        'edgecolors': kwargs.pop('ec', kwargs.pop('edgecolor', 'none')),
+    }
+    kwargs.pop('fill', None)
+    collkw.update(kwargs)
+
+    diameter = np.broadcast_to(np.asarray(radius, dtype=float) * 2, (num,))
+    col = mpl.collections.EllipseCollection(
+        diameter, diameter, np.zeros(num), units='xy', offsets=xy,
+        offset_transform=ax.transData, facecolors=ptcolors, **collkw)
+    ax.add_collection(col)
+    collections = [col]
     return collections
 
 
@@ -451,5 +764,15 @@ def scatterplot_highlight(data, x, y, highlight, size=10, color='orange',
 
 
 # DEPRECATED FUNCTIONS. STILL EXISTS FOR BACKWARDS COMPAT
-# backwards compat
-from kwimage import draw_boxes_on_image, draw_clf_on_image, draw_text_on_image  # NOQA
+# backwards compat. These are resolved lazily so importing this module does
+# not import kwimage.
+_KWIMAGE_REEXPORTS = {
+    'draw_boxes_on_image', 'draw_clf_on_image', 'draw_text_on_image',
+}
+
+
+def __getattr__(name):
+    if name in _KWIMAGE_REEXPORTS:
+        import kwimage
+        return getattr(kwimage, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
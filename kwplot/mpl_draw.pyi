@@ -8,21 +8,26 @@ from _typeshed import Incomplete
 from kwimage import draw_boxes_on_image as draw_boxes_on_image, draw_clf_on_image as draw_clf_on_image, draw_text_on_image as draw_text_on_image
 
 
-def draw_boxes(boxes: kwimage.Boxes,
-               alpha: float | List[float] | None = None,
-               color: str | Any | List[Any] = 'blue',
+def draw_boxes(boxes: kwimage.Boxes | ndarray,
+               alpha: float | List[float] | ndarray | None = None,
+               color: str | Any | List[Any] | ndarray = 'blue',
                labels: List[str] | None = None,
-               centers: bool = False,
+               centers: bool | dict = False,
                fill: bool = ...,
                ax: matplotlib.axes.Axes | None = None,
-               lw: float = 2) -> None:
+               lw: float = 2,
+               label_min_pixels: float = 8,
+               declutter: bool = True) -> None:
     ...
 
 
-def draw_line_segments(pts1: ndarray,
-                       pts2: ndarray,
-                       ax: None = None,
-                       **kwargs) -> None:
+def draw_line_segments(
+    pts1: ndarray,
+    pts2: ndarray | None = None,
+    ax: None = None,
+    mode: str = 'vector',
+    **kwargs
+) -> matplotlib.collections.LineCollection | matplotlib.image.AxesImage:
     ...
 
 
@@ -41,16 +46,20 @@ def plot_matrix(matrix: ndarray | pd.DataFrame,
                 xlabel: Incomplete | None = ...,
                 ylabel: Incomplete | None = ...,
                 fnum: Incomplete | None = ...,
-                pnum: Incomplete | None = ...):
+                pnum: Incomplete | None = ...,
+                cell_min_pixels: float = 16,
+                block_size: int | str | None = None,
+                groups: List | ndarray | None = None,
+                block_agg: str = 'sum'):
     ...
 
 
 def draw_points(xy: ndarray,
-                color: str = ...,
-                class_idxs: Incomplete | None = ...,
-                classes: Incomplete | None = ...,
-                ax: Incomplete | None = ...,
-                alpha: Incomplete | None = ...,
-                radius: int = ...,
-                **kwargs):
+                color: str | Any | List[Any] | ndarray = 'blue',
+                class_idxs: ndarray | None = None,
+                classes: List[str] | None = None,
+                ax: matplotlib.axes.Axes | None = None,
+                alpha: float | ndarray | None = None,
+                radius: float | ndarray = 1,
+                **kwargs) -> List[matplotlib.collections.EllipseCollection]:
     ...
@@ -0,0 +1,253 @@
+"""
+Draw many text labels without creating an artist per label.
+
+Calling ``ax.text`` once per label creates a ``Text`` artist (and a background
+patch) for each one, and all of them are laid out and drawn even when they are
+too small to read or cover each other. A :class:`LabelLayer` instead owns a
+single ``Text`` artist and, every time it is drawn, picks the labels that are
+readable at the current zoom and draws only those. This is used by
+:func:`kwplot.draw_boxes` when ``labels`` are given.
+"""
+import numpy as np
+
+
+class LabelLayer:
+    """
+    Draws text labels anchored at data coordinates with one ``Text`` artist.
+
+    The labels to show are chosen right before the artist is drawn, so they
+    are re-evaluated whenever the view is zoomed, panned, or resized:
+
+        * labels anchored outside of the axes are skipped.
+        * if ``sizes`` are given, labels whose box is smaller than
+          ``min_pixels`` on screen are skipped.
+        * if ``declutter`` is True, labels are placed in priority order and
+          labels that would overlap an already placed label are dropped. The
+          overlap test uses a uniform grid over the axes with cells about the
+          size of one label.
+
+    The artist is a :class:`kwplot.mpl_artists.DrawHookText` that calls back
+    into this object, so it lives as long as the artist is shown.
+
+    Args:
+        ax (matplotlib.axes.Axes): the axes to draw on
+
+        xy (ndarray): (N, 2) anchor point of each label in data coordinates
+
+        labels (List[str] | Sequence[str]): the text of each label. Any
+            sequence that supports ``len`` and indexing can be used, so the
+            text can be created on demand for the labels that are shown.
+
+        sizes (ndarray | None):
+            (N, 2) width and height in data coordinates of the box each label
+            belongs to. Used for the minimum size test and to prefer labels
+            of larger boxes.
+
+        min_pixels (float):
+            labels are skipped when the width or height of their box on screen
+            is smaller than this many pixels.
+
+        declutter (bool):
+            if True, drop labels that would overlap other labels.
+
+        priority (ndarray | None):
+            (N,) labels with higher priority are placed first. Defaults to the
+            box area if ``sizes`` are given, otherwise the input order.
+
+        **textkw: properties of the ``Text`` artist (e.g. color, fontsize,
+            backgroundcolor, horizontalalignment, verticalalignment)
+
+    Attributes:
+        artist (matplotlib.text.Text): the artist that draws the labels
+
+        visible_idxs (ndarray): indices of the labels shown by the last draw
+
+    Example:
+        >>> import kwplot
+        >>> from kwplot.mpl_labels import *  # NOQA
+        >>> fig = kwplot.figure(managed=False, doclf=True)
+        >>> fig.set_size_inches(4, 4)
+        >>> fig.set_dpi(100)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> rng = np.random.RandomState(0)
+        >>> xy = rng.rand(2000, 2) * 1000
+        >>> sizes = np.full((2000, 2), 10.0)
+        >>> labels = ['box{}'.format(i) for i in range(2000)]
+        >>> ax.set_xlim(0, 1000)
+        >>> ax.set_ylim(0, 1000)
+        >>> layer = LabelLayer(ax, xy, labels, sizes=sizes, min_pixels=0,
+        >>>                    fontsize=6, verticalalignment='top')
+        >>> assert len(ax.texts) == 1
+        >>> fig.canvas.draw()
+        >>> num_full = len(layer.visible_idxs)
+        >>> assert 0 < num_full < 2000
+        >>> # Boxes that are too small on screen are not labeled
+        >>> layer.min_pixels = 8
+        >>> fig.canvas.draw()
+        >>> assert len(layer.visible_idxs) == 0
+        >>> # Zooming in makes the boxes large enough to label
+        >>> ax.set_xlim(0, 100)
+        >>> ax.set_ylim(0, 100)
+        >>> fig.canvas.draw()
+        >>> inside = (xy < 100).all(axis=1)
+        >>> assert set(layer.visible_idxs) <= set(np.where(inside)[0])
+        >>> assert len(layer.visible_idxs) > 0
+        >>> # Figures with labels can be copied
+        >>> import copy
+        >>> fig2 = copy.deepcopy(fig)
+        >>> fig2.canvas.draw()
+    """
+
+    def __init__(self, ax, xy, labels, sizes=None, min_pixels=8,
+                 declutter=True, priority=None, **textkw):
+        self.ax = ax
+        self.xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        if not hasattr(labels, '__getitem__'):
+            labels = list(labels)
+        self.labels = labels
+        if len(self.labels) != len(self.xy):
+            raise ValueError('Got {} labels for {} anchors'.format(
+                len(self.labels), len(self.xy)))
+        self.sizes = None if sizes is None else np.asarray(
+            sizes, dtype=float).reshape(-1, 2)
+        self.min_pixels = min_pixels
+        self.declutter = declutter
+        if priority is None:
+            if self.sizes is not None:
+                priority = np.abs(self.sizes.prod(axis=1))
+            else:
+                priority = -np.arange(len(self.xy))
+        # Stable so ties keep the input order
+        self._order = np.argsort(-np.asarray(priority), kind='stable')
+        self.visible_idxs = np.empty(0, dtype=int)
+        from kwplot.mpl_artists import add_hooked_text
+        self.artist = add_hooked_text(ax, 0, 0, '', draw_hook=self._draw,
+                                      **textkw)
+        self.artist._kwplot_label_layer = self
+
+    def _label_extent(self, renderer):
+        """
+        Measure the on-screen width of one character and the height of a
+        label, and the padding of the background box around it.
+        """
+        artist = self.artist
+        fontprops = artist.get_fontproperties()
+        sample = 'x' * 10
+        w, _, _ = renderer.get_text_width_height_descent(
+            sample, fontprops, ismath=False)
+        _, h, _ = renderer.get_text_width_height_descent(
+            'lp', fontprops, ismath=False)
+        pad = 0
+        patch = artist.get_bbox_patch()
+        if patch is not None:
+            # The box pad is in units of the font size
+            em = renderer.points_to_pixels(artist.get_fontsize())
+            pad = 2 * getattr(patch.get_boxstyle(), 'pad', 0) * em
+        return w / len(sample), h, pad
+
+    def _candidates(self):
+        """
+        Indices of labels in priority order that are anchored inside the axes
+        and belong to large enough boxes, along with their display anchors.
+        """
+        trans = self.ax.transData
+        if len(self.xy) == 0:
+            return np.empty(0, dtype=int), np.empty((0, 2))
+        disp = trans.transform(self.xy[self._order])
+        bbox = self.ax.get_window_extent()
+        keep = ((disp[:, 0] >= bbox.x0) & (disp[:, 0] <= bbox.x1) &
+                (disp[:, 1] >= bbox.y0) & (disp[:, 1] <= bbox.y1))
+        if self.sizes is not None and self.min_pixels:
+            corner = trans.transform(self.xy[self._order] +
+                                     self.sizes[self._order])
+            disp_wh = np.abs(corner - disp)
+            keep &= disp_wh.min(axis=1) >= self.min_pixels
+        return self._order[keep], disp[keep]
+
+    def _label_boxes(self, idxs, disp, char_w, text_h, pad):
+        """
+        Display space (x0, y0, x1, y1) boxes of the labels. The text is
+        aligned to the anchor and the background box adds padding around it.
+        """
+        widths = np.array([len(self.labels[i]) for i in idxs.tolist()],
+                          dtype=float) * char_w
+        ha = self.artist.get_horizontalalignment()
+        va = self.artist.get_verticalalignment()
+        x0 = disp[:, 0] - widths * {'left': 0, 'center': 0.5,
+                                    'right': 1}.get(ha, 0)
+        y0 = disp[:, 1] - text_h * {'top': 1, 'center': 0.5,
+                                    'center_baseline': 0.5}.get(va, 0)
+        half = pad / 2
+        return np.stack([x0 - half, y0 - half, x0 + widths + half,
+                         y0 + text_h + half], axis=1)
+
+    def _declutter(self, idxs, boxes, cell_w, cell_h):
+        """
+        Greedily keep labels in order that do not overlap an already kept
+        label, using a uniform grid to find nearby labels.
+        """
+        grid = {}
+        keep = []
+        cells = np.stack([
+            np.floor(boxes[:, 0] / cell_w), np.floor(boxes[:, 1] / cell_h),
+            np.floor(boxes[:, 2] / cell_w), np.floor(boxes[:, 3] / cell_h),
+        ], axis=1).astype(int)
+        for idx, box, (i0, j0, i1, j1) in zip(idxs, boxes.tolist(),
+                                              cells.tolist()):
+            keys = [(i, j) for i in range(i0, i1 + 1)
+                    for j in range(j0, j1 + 1)]
+            x0, y0, x1, y1 = box
+            collides = False
+            for key in keys:
+                for ox0, oy0, ox1, oy1 in grid.get(key, ()):
+                    if x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1:
+                        collides = True
+                        break
+                if collides:
+                    break
+            if not collides:
+                keep.append(idx)
+                for key in keys:
+                    grid.setdefault(key, []).append(box)
+        return np.array(keep, dtype=int)
+
+    def update(self, renderer):
+        """
+        Choose the labels that are shown for the current view.
+
+        Returns:
+            ndarray: indices of the labels to show
+        """
+        idxs, disp = self._candidates()
+        if self.declutter and len(idxs) > 1:
+            char_w, text_h, pad = self._label_extent(renderer)
+            boxes = self._label_boxes(idxs, disp, char_w, text_h, pad)
+            cell_w = max(float(np.median(boxes[:, 2] - boxes[:, 0])), 1.0)
+            cell_h = max(text_h + pad, 1.0)
+            idxs = self._declutter(idxs, boxes, cell_w, cell_h)
+        self.visible_idxs = idxs
+        return idxs
+
+    def _draw(self, renderer, draw):
+        if not self.artist.get_visible():
+            return
+        idxs = self.update(renderer)
+        artist = self.artist
+        # Changing the text while drawing must not mark the figure as stale
+        stale_callback = artist.stale_callback
+        artist.stale_callback = None
+        try:
+            for idx in idxs:
+                artist.set_position(self.xy[idx])
+                artist.set_text(self.labels[idx])
+                draw(renderer)
+        finally:
+            artist.set_text('')
+            artist.stale_callback = stale_callback
+            artist.stale = False
+
+    def remove(self):
+        """
+        Remove the labels from the axes.
+        """
+        self.artist.remove()
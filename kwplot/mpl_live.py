@@ -0,0 +1,140 @@
+"""
+Handles for updating an image in place, e.g. to show frames from a camera or a
+training loop.
+
+Calling :func:`kwplot.imshow` in a loop adds a new ``AxesImage`` each time and
+redoes the figure setup. Instead, ``kwplot.imshow(frame, live=True)`` returns
+a :class:`LiveImage` whose :func:`LiveImage.update` swaps the data of the
+existing artist and redraws only that artist.
+"""
+from kwplot.mpl_core import FigureAxes
+
+
+class LiveImage(FigureAxes):
+    """
+    The figure and axes of an image shown with ``kwplot.imshow(live=True)``,
+    plus the image artist so it can be updated in place.
+
+    This can be unpacked into ``fig, ax`` like the :class:`kwplot.FigureAxes`
+    returned by :func:`kwplot.imshow`.
+
+    Attributes:
+        artist (matplotlib.image.AxesImage): the image being updated
+
+        colorspace (str): colorspace of 3 or 4 channel frames
+
+        blit (bool):
+            if True, updates restore the cached axes background and draw only
+            the image artist. Other artists drawn over the image are not
+            redrawn until the next full draw (see :func:`LiveImage.redraw`).
+
+    Example:
+        >>> import kwplot
+        >>> import numpy as np
+        >>> kwplot.autompl()
+        >>> frame = np.zeros((32, 32, 3), dtype=np.uint8)
+        >>> h = kwplot.imshow(frame, fnum=1, doclf=True, live=True)
+        >>> fig, ax = h
+        >>> for idx in range(1, 4):
+        >>>     frame = np.full((32, 32, 3), idx * 50, dtype=np.uint8)
+        >>>     h.update(frame)
+        >>> assert len(ax.get_images()) == 1
+        >>> assert h.artist.get_array()[0, 0, 0] == 150
+        >>> canvas = kwplot.render_figure_to_image(fig, transparent=False)
+        >>> assert (canvas == 150).all(axis=2).any()
+    """
+
+    def __new__(cls, fig, ax, artist, colorspace='rgb', blit=True):
+        self = super().__new__(cls, fig, ax)
+        self.artist = artist
+        self.colorspace = colorspace
+        self.blit = blit
+        self._background = None
+        self._draw_cid = None
+        self._canvas = None
+        return self
+
+    def __getnewargs__(self):
+        return (self.fig, self.ax, self.artist, self.colorspace, self.blit)
+
+    def _prepare(self, frame):
+        """
+        Bring a frame into the format that was given to matplotlib.
+        """
+        try:
+            if 'torch' in frame.__module__:
+                frame = frame.cpu().data.numpy()
+        except Exception:
+            pass
+        if frame.ndim == 3:
+            if frame.shape[0] in {1, 3} and frame.shape[2] > 4:
+                # probably in chw format
+                frame = frame.transpose(1, 2, 0)
+            if frame.shape[2] in {3, 4}:
+                if self.colorspace.lower() not in {'rgb', 'rgba'}:
+                    import kwimage
+                    frame = kwimage.convert_colorspace(
+                        frame, src_space=self.colorspace, dst_space='rgb',
+                        implicit=True)
+            elif frame.shape[2] == 1:
+                frame = frame[..., 0]
+        return frame
+
+    def _connect(self):
+        canvas = self.fig.canvas
+        if canvas is self._canvas:
+            return
+        if self._canvas is not None and self._draw_cid is not None:
+            self._canvas.mpl_disconnect(self._draw_cid)
+        self._canvas = canvas
+        self._background = None
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self._background = self._canvas.copy_from_bbox(self.ax.bbox)
+
+    def _can_blit(self):
+        if not self.blit or not self.fig.canvas.supports_blit:
+            return False
+        # Restoring a background that contains the previous image is only
+        # correct if the new image covers it completely.
+        alpha = self.artist.get_alpha()
+        if alpha is not None and alpha < 1:
+            return False
+        array = self.artist.get_array()
+        return not (array.ndim == 3 and array.shape[2] == 4)
+
+    def update(self, frame):
+        """
+        Show a new frame in the existing image artist.
+
+        The norm and colormap of the artist are reused.
+
+        Args:
+            frame (ndarray): new image data in the same format accepted by
+                :func:`kwplot.imshow`.
+        """
+        self.artist.set_data(self._prepare(frame))
+        self._connect()
+        canvas = self._canvas
+        if not self._can_blit():
+            canvas.draw_idle()
+            canvas.flush_events()
+            return
+        if self._background is None:
+            # The first full draw caches the background
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self.ax.draw_artist(self.artist)
+            canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+    def redraw(self):
+        """
+        Do a full draw of the figure, which also refreshes the cached
+        background used for blitting.
+        """
+        self._connect()
+        self._canvas.draw()
+        self._canvas.flush_events()
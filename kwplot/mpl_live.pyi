@@ -0,0 +1,23 @@
+import matplotlib
+from kwplot.mpl_core import FigureAxes
+from numpy import ndarray
+
+
+class LiveImage(FigureAxes):
+    artist: matplotlib.image.AxesImage
+    colorspace: str
+    blit: bool
+
+    def __new__(cls,
+                fig: matplotlib.figure.Figure,
+                ax: matplotlib.axes.Axes,
+                artist: matplotlib.image.AxesImage,
+                colorspace: str = 'rgb',
+                blit: bool = True) -> LiveImage:
+        ...
+
+    def update(self, frame: ndarray) -> None:
+        ...
+
+    def redraw(self) -> None:
+        ...
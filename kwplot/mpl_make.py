@@ -3,17 +3,37 @@ DEPRECATED: use kwimage versions instead
 
 Functions used to explicitly make images as ndarrays using mpl/cv2 utilities
 """
+import functools
+import threading
+from collections import OrderedDict
 import numpy as np
-from kwimage import make_heatmask, make_vector_field, make_orimask  # NOQA
 
-__all__ = [
+# The deprecated kwimage re-exports are provided by __getattr__
+__all__ = [  # NOQA
     'make_heatmask', 'make_vector_field', 'make_orimask', 'make_legend_img',
     'render_figure_to_image',
 ]
 
+# Deprecated re-exports of kwimage functions. These are resolved lazily so
+# importing this module does not import kwimage.
+_KWIMAGE_REEXPORTS = {'make_heatmask', 'make_vector_field', 'make_orimask'}
+
+
+def __getattr__(name):
+    if name in _KWIMAGE_REEXPORTS:
+        import kwimage
+        return getattr(kwimage, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+# In-memory least recently used cache of legend images
+_LEGEND_CACHE = OrderedDict()
+_LEGEND_CACHE_LOCK = threading.Lock()
+_LEGEND_CACHE_SIZE = 64
+
 
 def make_legend_img(label_to_color, dpi=96, shape=(200, 200), mode='line',
-                    transparent=False):
+                    transparent=False, cache=True, cache_dpath=None):
     """
     Makes an image of a categorical legend
 
@@ -37,6 +57,16 @@ def make_legend_img(label_to_color, dpi=96, shape=(200, 200), mode='line',
         transparent (bool):
             if True returns an image with alpha values.
 
+        cache (bool):
+            if True, legends are kept in an in-memory least recently used
+            cache keyed by a stable hash of the inputs and the matplotlib
+            style (the font, text, line, legend, and facecolor rcParams), so
+            drawing the same legend again only costs a lookup and a copy.
+
+        cache_dpath (str | PathLike | None):
+            if specified, legends are also cached in this directory, so they
+            can be reused across processes.
+
     Returns:
         ndarray: a numpy image canvas
 
@@ -65,11 +95,47 @@ def make_legend_img(label_to_color, dpi=96, shape=(200, 200), mode='line',
         >>> kwplot.autompl()
         >>> kwplot.imshow(img)
         >>> kwplot.show_if_requested()
+
+    Example:
+        >>> # Repeated legends are served from the cache
+        >>> import kwplot
+        >>> import ubelt as ub
+        >>> from kwplot.mpl_make import _LEGEND_CACHE
+        >>> cache_dpath = ub.Path.appdir('kwplot/tests/legend_cache').delete().ensuredir()
+        >>> label_to_color = {'cat': 'red', 'dog': 'blue'}
+        >>> img1 = kwplot.make_legend_img(label_to_color, cache_dpath=cache_dpath)
+        >>> img2 = kwplot.make_legend_img(dict(label_to_color), cache_dpath=cache_dpath)
+        >>> assert np.array_equal(img1, img2) and img1 is not img2
+        >>> assert len(list(cache_dpath.glob('*.npy'))) == 1
+        >>> # The order of the labels is part of the key
+        >>> img3 = kwplot.make_legend_img({'dog': 'blue', 'cat': 'red'})
+        >>> assert not np.array_equal(img1, img3)
+        >>> # The disk cache is used when the memory cache misses
+        >>> _LEGEND_CACHE.clear()
+        >>> img4 = kwplot.make_legend_img(label_to_color, cache_dpath=cache_dpath)
+        >>> assert np.array_equal(img1, img4)
+        >>> # The matplotlib style is part of the key
+        >>> import matplotlib as mpl
+        >>> with mpl.rc_context({'legend.fontsize': 30}):
+        >>>     img5 = kwplot.make_legend_img(label_to_color)
+        >>> assert img5.shape != img1.shape
     """
+    if cache:
+        key = _legend_cache_key(label_to_color, dpi, shape, mode, transparent)
+        legend_img = _lookup_legend(key, cache_dpath)
+        if legend_img is None:
+            legend_img = _draw_legend_img(label_to_color, dpi, shape, mode,
+                                          transparent)
+            _store_legend(key, legend_img, cache_dpath)
+        return legend_img.copy()
+    return _draw_legend_img(label_to_color, dpi, shape, mode, transparent)
+
+
+def _draw_legend_img(label_to_color, dpi, shape, mode, transparent):
     import kwplot
-    plt = kwplot.autoplt()
-
-    fig = plt.figure(dpi=dpi)
+    # An unmanaged figure does not need pyplot or a specific backend
+    fig = kwplot.figure(pnum=None, managed=False)
+    fig.set_dpi(dpi)
 
     w, h = shape[1] / dpi, shape[0] / dpi
     fig.set_size_inches(w, h)
@@ -80,14 +146,142 @@ def make_legend_img(label_to_color, dpi=96, shape=(200, 200), mode='line',
     ax.grid(False)
     ax.get_xaxis().set_visible(False)
     ax.get_yaxis().set_visible(False)
-    plt.axis('off')
+    ax.axis('off')
     legend_img = render_figure_to_image(fig, dpi=dpi, transparent=transparent)
     legend_img = crop_border_by_color(legend_img)
-
-    plt.close(fig)
+    kwplot.close_figures([fig])
     return legend_img
 
 
+def _normalize_legend_input(data):
+    """
+    Convert legend inputs into plain data with a stable hash. The order of
+    dictionary items is kept because it is the order of the legend entries.
+
+    Example:
+        >>> from kwplot.mpl_make import _normalize_legend_input
+        >>> import kwimage
+        >>> _normalize_legend_input({'a': kwimage.Color('red'), 'b': np.array([0, 1, 0])})
+        ['__dict__', [['a', [1.0, 0.0, 0.0, 1.0]], ['b', [0, 1, 0]]]]
+    """
+    if isinstance(data, dict):
+        return ['__dict__', [[_normalize_legend_input(k),
+                              _normalize_legend_input(v)]
+                             for k, v in data.items()]]
+    if isinstance(data, (list, tuple)):
+        return [_normalize_legend_input(v) for v in data]
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    if isinstance(data, np.generic):
+        return data.item()
+    if isinstance(data, (str, int, float, bool, type(None))):
+        return data
+    if hasattr(data, 'as01'):
+        # A kwimage.Color
+        return list(data.as01('rgba'))
+    return repr(data)
+
+
+# The rcParams that change how a legend image looks
+_LEGEND_STYLE_KEYS = (
+    'font.family', 'font.style', 'font.variant', 'font.weight',
+    'font.stretch', 'font.size', 'font.serif', 'font.sans-serif',
+    'font.monospace', 'text.color', 'text.usetex', 'lines.linewidth',
+    'lines.markersize', 'patch.linewidth', 'legend.fontsize',
+    'legend.labelcolor', 'legend.frameon', 'legend.framealpha',
+    'legend.facecolor', 'legend.edgecolor', 'legend.fancybox',
+    'legend.shadow', 'legend.markerscale', 'legend.borderpad',
+    'legend.labelspacing', 'legend.handlelength', 'legend.handleheight',
+    'legend.handletextpad', 'legend.borderaxespad', 'legend.columnspacing',
+    'figure.facecolor', 'axes.facecolor', 'savefig.facecolor',
+    'savefig.transparent',
+)
+
+
+def _legend_style():
+    """
+    The current values of the rcParams that affect a legend image, so a
+    legend drawn under one style is not served under another.
+
+    Returns:
+        Tuple: a hashable tuple of values in the order of
+            ``_LEGEND_STYLE_KEYS``
+
+    Example:
+        >>> from kwplot.mpl_make import _legend_style
+        >>> import matplotlib as mpl
+        >>> style1 = _legend_style()
+        >>> with mpl.rc_context({'font.size': 31}):
+        >>>     style2 = _legend_style()
+        >>> assert style1 != style2
+        >>> assert hash(style1) != hash(style2)
+    """
+    import matplotlib as mpl
+    # Read the stored values directly, which skips the per-key deprecation
+    # checks of RcParams.__getitem__
+    values = [dict.get(mpl.rcParams, key) for key in _LEGEND_STYLE_KEYS]
+    return tuple(tuple(v) if isinstance(v, list) else v for v in values)
+
+
+@functools.lru_cache(maxsize=32)
+def _legend_style_digest(style):
+    import ubelt as ub
+    return ub.hash_data(_normalize_legend_input(style), base='hex')
+
+
+def _legend_cache_key(label_to_color, dpi, shape, mode, transparent):
+    import ubelt as ub
+    data = [
+        'legend_v3',
+        _normalize_legend_input(label_to_color),
+        _normalize_legend_input(dpi),
+        _normalize_legend_input(shape),
+        mode,
+        bool(transparent),
+        _legend_style_digest(_legend_style()),
+    ]
+    return ub.hash_data(data, base='hex')[0:32]
+
+
+def _lookup_legend(key, cache_dpath=None):
+    with _LEGEND_CACHE_LOCK:
+        legend_img = _LEGEND_CACHE.get(key, None)
+        if legend_img is not None:
+            _LEGEND_CACHE.move_to_end(key)
+            return legend_img
+    if cache_dpath is not None:
+        import ubelt as ub
+        fpath = ub.Path(cache_dpath) / f'legend_{key}.npy'
+        if fpath.exists():
+            try:
+                legend_img = np.load(fpath)
+            except Exception:
+                # A corrupted or partially written file is treated as a miss
+                return None
+            _store_legend(key, legend_img)
+            return legend_img
+    return None
+
+
+def _store_legend(key, legend_img, cache_dpath=None):
+    legend_img.setflags(write=False)
+    with _LEGEND_CACHE_LOCK:
+        _LEGEND_CACHE[key] = legend_img
+        _LEGEND_CACHE.move_to_end(key)
+        while len(_LEGEND_CACHE) > _LEGEND_CACHE_SIZE:
+            _LEGEND_CACHE.popitem(last=False)
+    if cache_dpath is not None:
+        import os
+        import ubelt as ub
+        dpath = ub.Path(cache_dpath).ensuredir()
+        fpath = dpath / f'legend_{key}.npy'
+        # Write to a temporary file and rename so readers never see a
+        # partial file.
+        tmp_fpath = dpath / f'.legend_{key}.{os.getpid()}.tmp.npy'
+        np.save(tmp_fpath, legend_img)
+        os.replace(tmp_fpath, fpath)
+
+
 def crop_border_by_color(img, fillval=None, thresh=0, channel=None):
     r"""
     Crops image to remove any constant color padding.
@@ -219,6 +413,9 @@ def render_figure_to_image(fig, dpi=None, transparent=None, **savekw):
         Be sure to use `fig.set_size_inches` to an appropriate size before
         calling this function.
 
+        This works with figures created by ``kwplot.figure(managed=False)``,
+        which does not require pyplot or a backend switch.
+
     Example:
         >>> import kwplot
         >>> fig = kwplot.figure(fnum=1, doclf=True)
@@ -1,3 +1,4 @@
+from os import PathLike
 from typing import Dict
 from typing import List
 import kwimage
@@ -14,7 +15,9 @@ def make_legend_img(label_to_color: Dict[str, kwimage.Color] | List[Dict],
                     dpi: int = ...,
                     shape=...,
                     mode: str = ...,
-                    transparent: bool = ...):
+                    transparent: bool = ...,
+                    cache: bool = True,
+                    cache_dpath: str | PathLike | None = None):
     ...
 
 
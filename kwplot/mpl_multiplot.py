@@ -192,7 +192,6 @@ def multi_plot(xdata=None, ydata=None, xydata=None, **kwargs):
         >>> kwplot.show_if_requested()
     """
     import matplotlib as mpl
-    from matplotlib import pyplot as plt
 
     # Initial integration with mpl rcParams standards
     mplrc = mpl.rcParams
@@ -339,7 +338,7 @@ def multi_plot(xdata=None, ydata=None, xydata=None, **kwargs):
         if kwargs['color'] == 'distinct':
             kwargs['color'] = mpl_core.distinct_colors(num_lines, randomize=0)
         else:
-            cm = plt.get_cmap(kwargs['color'])
+            cm = mpl.colormaps[kwargs['color']]
             kwargs['color'] = [cm(i / num_lines) for i in range(num_lines)]
 
     # Parse out arguments to ax.plot
@@ -397,7 +396,7 @@ def multi_plot(xdata=None, ydata=None, xydata=None, **kwargs):
         fig = mpl_core.figure(fnum=fnum, pnum=pnum, docla=False, doclf=doclf)
         ax = fig.gca()
     else:
-        plt.sca(ax)
+        mpl_core._sca(ax)
         fig = ax.figure
 
     # +---------------
@@ -474,7 +473,6 @@ def multi_plot(xdata=None, ydata=None, xydata=None, **kwargs):
                     y_data_dev = np.array(_spread)
                     y_data_max = ydata_ave + y_data_dev
                     y_data_min = ydata_ave - y_data_dev
-                    ax = plt.gca()
                     spread_alpha = extra_kw['spread_alpha']
                     ax.fill_between(_xdata, y_data_min, y_data_max, alpha=spread_alpha,
                                     color=plot_kw.get('color', None))  # , zorder=0)
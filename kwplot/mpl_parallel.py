@@ -0,0 +1,378 @@
+"""
+Render many independent figures in parallel.
+
+Matplotlib drawing is single threaded, so generating thousands of per-item
+figures (e.g. per-image diagnostics) is bound to one core. The
+:func:`render_many` function distributes that work over a pool of worker
+processes (or threads) that are initialized with the Agg backend and warm
+imports, and streams the rendered results back as they complete.
+"""
+import os
+import contextlib
+import ubelt as ub
+from typing import NamedTuple, Any
+
+
+__all__ = ['render_many', 'RenderResult']
+
+
+class RenderResult(NamedTuple):
+    """
+    The outcome of rendering a single item with :func:`render_many`.
+
+    Attributes:
+        index (int): the index of the item in the input sequence
+        value (Any): the rendered image, the written path, or None on error
+        error (BaseException | None): the exception raised by the task, if any
+    """
+    index: int
+    value: Any
+    error: Any
+
+
+def render_many(func, items, workers=0, mode='process', out='array',
+                dpath=None, finalizer=None, dpi=None, transparent=False,
+                timeout=None, max_memory=None):
+    """
+    Render a figure for each item in parallel.
+
+    For each item, ``func(item)`` should draw a figure and return it (or an
+    axes or a :class:`kwplot.FigureAxes` that belongs to it). Using
+    ``kwplot.figure(managed=False)`` inside ``func`` is recommended. The
+    figure is then rendered with :func:`kwplot.render_figure_to_image`
+    (``out='array'``) or written to disk with a
+    :class:`kwplot.FigureFinalizer` (``out='path'``), and closed.
+
+    Args:
+        func (Callable[[Any], matplotlib.figure.Figure]):
+            draws a figure for an item. In process mode this must be
+            picklable (e.g. a module level function).
+
+        items (Iterable[Any]): the items to render
+
+        workers (int):
+            number of parallel workers. If 0, items are rendered serially in
+            the current thread.
+
+        mode (str):
+            "process" or "thread". Process workers use the Agg backend and run
+            in parallel. Thread workers share the backend of this process, so
+            ``func`` must use unmanaged figures.
+
+        out (str):
+            "array" to return the rendered image as an ndarray, or "path" to
+            write the image to disk and return its path.
+
+        dpath (str | PathLike | None):
+            output directory when ``out='path'``. Files are named by item
+            index. Defaults to the finalizer's dpath.
+
+        finalizer (kwplot.FigureFinalizer | None):
+            controls how figures are written when ``out='path'``.
+
+        dpi (int | None): resolution of the rendered images
+
+        transparent (bool): if True, render with an alpha channel
+
+        timeout (float | None):
+            maximum number of seconds each task may take. A task that takes
+            longer is interrupted and reported with a :class:`TimeoutError`.
+            Only enforced in process mode on platforms with
+            :func:`signal.setitimer`.
+
+        max_memory (int | None):
+            maximum number of bytes of address space each worker process may
+            use. Tasks that need more fail with a :class:`MemoryError`. Only
+            enforced in process mode on platforms with :mod:`resource`.
+
+    Yields:
+        RenderResult: one result per item in the order they complete. Tasks
+            that fail do not stop the batch; their error is reported instead.
+
+    Note:
+        In process mode rendered arrays are returned through
+        :mod:`multiprocessing.shared_memory` instead of being pickled. The
+        returned arrays are views of the shared blocks, which are released
+        when the arrays are garbage collected.
+
+        If a worker process dies (e.g. it is killed by the OS), the tasks that
+        were running are reported as failed and a new pool is started for the
+        remaining items.
+
+    Example:
+        >>> import kwplot
+        >>> import numpy as np
+        >>> from kwplot.mpl_parallel import *  # NOQA
+        >>> def render_item(item):
+        >>>     if not isinstance(item, int):
+        >>>         raise TypeError('bad item')
+        >>>     fig = kwplot.figure(managed=False, pnum=None)
+        >>>     fig.set_size_inches(1, 1)
+        >>>     ax = fig.add_subplot(1, 1, 1)
+        >>>     kwplot.imshow(np.full((8, 8), item / 10), ax=ax)
+        >>>     return fig
+        >>> items = [1, 2, 3, 'bad']
+        >>> results = sorted(render_many(render_item, items, workers=2, mode='thread'))
+        >>> assert [r.index for r in results] == [0, 1, 2, 3]
+        >>> assert all(r.error is None for r in results[0:3])
+        >>> assert isinstance(results[3].error, TypeError)
+        >>> assert results[0].value.shape[2] == 3
+        >>> # Process mode needs a function that workers can import, e.g. one
+        >>> # defined at the module level (see tests/test_render_many.py).
+    """
+    if mode not in {'process', 'thread'}:
+        raise KeyError(f'mode={mode!r} must be "process" or "thread"')
+    if out not in {'array', 'path'}:
+        raise KeyError(f'out={out!r} must be "array" or "path"')
+    if out == 'path':
+        from kwplot.managers import FigureFinalizer
+        if finalizer is None:
+            finalizer = FigureFinalizer(
+                dpath='.' if dpath is None else dpath, dpi=dpi)
+        else:
+            finalizer = finalizer.copy()
+            if dpath is not None:
+                finalizer.update(dpath=dpath)
+        # Workers already run in parallel, so write synchronously in each one
+        finalizer.update(async_write=False)
+
+    use_processes = workers > 0 and mode == 'process'
+    task_kw = {
+        'out': out,
+        'finalizer': finalizer,
+        'dpi': dpi,
+        'transparent': transparent,
+        'timeout': timeout if use_processes else None,
+        'shared': use_processes,
+    }
+
+    if workers == 0:
+        for index, item in enumerate(items):
+            yield _run_serial_task(func, index, item, task_kw)
+    elif use_processes:
+        yield from _render_with_processes(func, items, workers, task_kw,
+                                          max_memory)
+    else:
+        yield from _render_with_threads(func, items, workers, task_kw)
+
+
+def _run_serial_task(func, index, item, task_kw):
+    try:
+        value = _render_task(func, index, item, **task_kw)
+    except Exception as ex:
+        return RenderResult(index, None, ex)
+    return RenderResult(index, value, None)
+
+
+def _render_with_threads(func, items, workers, task_kw):
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers,
+                            initializer=_init_thread_worker) as executor:
+        yield from _stream_tasks(executor, func, items, workers, task_kw)
+
+
+def _render_with_processes(func, items, workers, task_kw, max_memory):
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    item_iter = iter(enumerate(items))
+    while True:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_process_worker,
+            initargs=(max_memory,))
+        future_to_index = {}
+        try:
+            yield from _stream_tasks(executor, func, item_iter, workers,
+                                     task_kw, enumerated=True,
+                                     future_to_index=future_to_index)
+        except BrokenProcessPool:
+            # A worker died. Its in-flight tasks were reported as failed, so
+            # continue with the remaining items in a fresh pool. The
+            # cancel_futures argument of shutdown needs Python 3.9+.
+            for future in future_to_index:
+                future.cancel()
+            executor.shutdown(wait=False)
+            continue
+        executor.shutdown()
+        break
+
+
+def _stream_tasks(executor, func, items, workers, task_kw, enumerated=False,
+                  future_to_index=None):
+    """
+    Submit tasks with a bounded number in flight and yield their results as
+    they complete. The in-flight futures are tracked in ``future_to_index``.
+    """
+    from concurrent.futures import wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+    item_iter = items if enumerated else iter(enumerate(items))
+    max_in_flight = workers * 2
+    if future_to_index is None:
+        future_to_index = {}
+    exhausted = False
+    broken = False
+    while True:
+        while not exhausted and not broken and len(future_to_index) < max_in_flight:
+            try:
+                index, item = next(item_iter)
+            except StopIteration:
+                exhausted = True
+                break
+            try:
+                future = executor.submit(_render_task, func, index, item,
+                                         **task_kw)
+            except BrokenProcessPool as ex:
+                yield RenderResult(index, None, ex)
+                broken = True
+                break
+            future_to_index[future] = index
+        if not future_to_index:
+            if broken:
+                raise BrokenProcessPool('worker process died')
+            return
+        done, _ = wait(future_to_index, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = future_to_index.pop(future)
+            error = future.exception()
+            if error is None:
+                value = _receive_value(future.result())
+                yield RenderResult(index, value, None)
+            else:
+                if isinstance(error, BrokenProcessPool):
+                    broken = True
+                yield RenderResult(index, None, error)
+
+
+def _init_process_worker(max_memory=None):
+    """
+    Prepare a worker process: cap its memory, use Agg, and warm up imports.
+    """
+    if max_memory is not None:
+        try:
+            import resource
+        except ImportError:
+            pass
+        else:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (int(max_memory), hard))
+    os.environ['KWPLOT_AUTOMPL_BACKEND'] = 'agg'
+    from kwplot import auto_backends
+    auto_backends.set_mpl_backend('agg')
+    auto_backends.warmup(background=False)
+
+
+def _init_thread_worker():
+    """
+    Warm up imports without touching the global backend.
+    """
+    from kwplot import auto_backends
+    auto_backends.warmup(background=False,
+                         modules=['kwplot', 'kwimage', 'font_manager'])
+
+
+@contextlib.contextmanager
+def _task_timeout(seconds):
+    """
+    Raise a TimeoutError in the main thread if the body takes too long.
+    """
+    import signal
+    if seconds is None or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def _on_timeout(signum, frame):
+        raise TimeoutError(f'render task exceeded timeout={seconds}s')
+
+    prev_handler = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev_handler)
+
+
+def _coerce_figure(result):
+    """
+    Get the figure from the return value of a render function
+    """
+    from kwplot.mpl_core import FigureAxes
+    if isinstance(result, FigureAxes):
+        return result.fig
+    fig = getattr(result, 'figure', None)
+    if fig is not None and not hasattr(result, 'savefig'):
+        # An axes (or other artist)
+        return fig
+    if hasattr(result, 'savefig'):
+        return result
+    raise TypeError(
+        'The render function must return a figure or axes, '
+        'got {!r}'.format(type(result)))
+
+
+def _render_task(func, index, item, out, finalizer, dpi, transparent,
+                 timeout, shared):
+    """
+    Draw, render, and close the figure for one item
+    """
+    from kwplot import mpl_core
+    from kwplot.mpl_make import render_figure_to_image
+    with _task_timeout(timeout):
+        fig = _coerce_figure(func(item))
+        try:
+            if out == 'array':
+                value = render_figure_to_image(fig, dpi=dpi,
+                                               transparent=transparent)
+                if shared:
+                    value = _send_array(value)
+            else:
+                value = finalizer.finalize(fig, '{:08d}.png'.format(index))
+                value = ub.Path(value)
+        finally:
+            mpl_core.close_figures([fig])
+    return value
+
+
+def _send_array(arr):
+    """
+    Copy an array into a new shared memory block owned by the receiver.
+
+    Returns:
+        Tuple[str, str, Tuple, str]: a message for :func:`_receive_value`
+    """
+    from multiprocessing import shared_memory, resource_tracker
+    import numpy as np
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    del view
+    shm.close()
+    # The receiver attaches to and unlinks the block, which registers and
+    # unregisters it with the tracker on its side.
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return ('__shared_ndarray__', shm.name, arr.shape, arr.dtype.str)
+
+
+def _receive_value(value):
+    """
+    Take ownership of a shared array sent by :func:`_send_array`.
+
+    The returned array is backed by the shared memory block, so the pixels
+    are not copied again. The block is unlinked right away (the mapping stays
+    valid) and is unmapped when the array is garbage collected.
+    """
+    if isinstance(value, tuple) and value and value[0] == '__shared_ndarray__':
+        from multiprocessing import shared_memory
+        import numpy as np
+        import weakref
+        _, name, shape, dtype = value
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            value = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        except Exception:
+            shm.close()
+            raise
+        finally:
+            shm.unlink()
+        weakref.finalize(value, shm.close)
+    return value
+
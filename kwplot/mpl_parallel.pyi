@@ -0,0 +1,24 @@
+from os import PathLike
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+import matplotlib
+from _typeshed import Incomplete
+
+
+class RenderResult(NamedTuple):
+    index: int
+    value: Any
+    error: Any
+
+
+def render_many(func: Callable[[Any], matplotlib.figure.Figure],
+                items: Iterable[Any],
+                workers: int = 0,
+                mode: str = 'process',
+                out: str = 'array',
+                dpath: str | PathLike | None = None,
+                finalizer: Incomplete | None = None,
+                dpi: int | None = None,
+                transparent: bool = False,
+                timeout: float | None = None,
+                max_memory: int | None = None) -> Iterator[RenderResult]:
+    ...
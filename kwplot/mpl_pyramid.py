@@ -0,0 +1,599 @@
+"""
+Show large images at the resolution of the screen instead of the data.
+
+Matplotlib keeps the full array of an ``AxesImage`` and resamples all of it on
+every draw. For very large images (e.g. orthomosaics) :class:`PyramidView`
+instead shows a single level of an :class:`ImagePyramid` that matches the
+pixel size of the axes, cropped to the visible window, and swaps in a finer
+level when the view is zoomed or panned. These are used by
+:func:`kwplot.imshow` when ``pyramid=True`` or ``max_display_pixels`` is given.
+"""
+import math
+import numpy as np
+
+
+def downsample_area(img):
+    """
+    Downsample an image by a factor of two by averaging 2x2 blocks.
+
+    Odd sized dimensions are padded by repeating the last row / column.
+
+    Args:
+        img (ndarray): image data in (H, W) or (H, W, C) format
+
+    Returns:
+        ndarray: an image with half the height and width (rounded up) and the
+            same dtype as the input.
+
+    Example:
+        >>> from kwplot.mpl_pyramid import *  # NOQA
+        >>> img = np.arange(5 * 4, dtype=np.uint8).reshape(5, 4)
+        >>> downsample_area(img)
+        array([[ 3,  5],
+               [11, 13],
+               [17, 19]], dtype=uint8)
+    """
+    h, w = img.shape[0:2]
+    if h % 2 or w % 2:
+        pad = [(0, h % 2), (0, w % 2)] + [(0, 0)] * (img.ndim - 2)
+        img = np.pad(img, pad, mode='edge')
+    if img.dtype.kind in 'uib' and img.dtype.itemsize <= 2:
+        acc_dtype = np.int32
+    else:
+        acc_dtype = np.float64 if img.dtype == np.float64 else np.float32
+    out = np.empty((img.shape[0] // 2, img.shape[1] // 2) + img.shape[2:],
+                   dtype=img.dtype)
+    # Work on strips of rows to bound the size of the accumulator
+    strip = max(1, (1 << 22) // max(1, out[0:1].size))
+    for r0 in range(0, out.shape[0], strip):
+        r1 = min(r0 + strip, out.shape[0])
+        part = img[2 * r0:2 * r1]
+        acc = part[0::2, 0::2].astype(acc_dtype)
+        acc += part[1::2, 0::2]
+        acc += part[0::2, 1::2]
+        acc += part[1::2, 1::2]
+        if img.dtype.kind in 'uib':
+            acc += 2
+            acc //= 4
+        else:
+            acc /= 4
+        out[r0:r1] = acc
+    return out
+
+
+class ImagePyramid:
+    """
+    An area-averaged image pyramid of an in-memory image.
+
+    Level 0 is the original image, and each level is half the size of the
+    previous one. Levels are computed on demand and cached. Each level spans
+    the same extent as the original image, so a level pixel covers
+    :func:`ImagePyramid.scale` original pixels.
+
+    Args:
+        img (ndarray): image data in (H, W) or (H, W, C) format
+
+        min_size (int):
+            levels are added until both dimensions are at most this size
+
+    Example:
+        >>> from kwplot.mpl_pyramid import *  # NOQA
+        >>> img = np.random.rand(1000, 600, 3)
+        >>> pyr = ImagePyramid(img, min_size=128)
+        >>> print(len(pyr), [pyr.level_shape(k) for k in range(len(pyr))])
+        4 [(1000, 600), (500, 300), (250, 150), (125, 75)]
+        >>> assert pyr.scale(3) == (8.0, 8.0)
+        >>> pyr.read(3, slice(0, 10), slice(0, 5)).shape
+        (10, 5, 3)
+    """
+
+    def __init__(self, img, min_size=256):
+        self.shape = tuple(img.shape)
+        self.dtype = img.dtype
+        self._levels = [img]
+        h, w = self.shape[0:2]
+        num_levels = 1
+        while max(h, w) > min_size:
+            h, w = (h + 1) // 2, (w + 1) // 2
+            num_levels += 1
+        self.num_levels = num_levels
+
+    def __len__(self):
+        return self.num_levels
+
+    def level_shape(self, level):
+        """
+        Returns:
+            Tuple[int, int]: the height and width of a level
+        """
+        h, w = self.shape[0:2]
+        for _ in range(level):
+            h, w = (h + 1) // 2, (w + 1) // 2
+        return (h, w)
+
+    def scale(self, level):
+        """
+        Returns:
+            Tuple[float, float]: the number of original pixels along the y and
+                x axes covered by one pixel of the given level.
+        """
+        h, w = self.shape[0:2]
+        lh, lw = self.level_shape(level)
+        return (h / lh, w / lw)
+
+    def level(self, level):
+        """
+        Returns:
+            ndarray: the full image data of a level
+        """
+        while len(self._levels) <= level:
+            self._levels.append(downsample_area(self._levels[-1]))
+        return self._levels[level]
+
+    def read(self, level, rows, cols):
+        """
+        Read a window of a level.
+
+        Args:
+            level (int): the pyramid level
+            rows (slice): the rows of the window in level coordinates
+            cols (slice): the columns of the window in level coordinates
+
+        Returns:
+            ndarray
+        """
+        return self.level(level)[rows, cols]
+
+    def level_for_scale(self, scale, max_pixels=None):
+        """
+        Find the coarsest level whose pixels are no larger than ``scale``
+        original pixels.
+
+        Args:
+            scale (float): the number of original pixels per screen pixel
+            max_pixels (int | None): if specified, use a coarser level if
+                needed so the full level has at most this many pixels.
+
+        Returns:
+            int
+        """
+        best = 0
+        for level in range(self.num_levels):
+            if max(self.scale(level)) <= scale * (1 + 1e-9):
+                best = level
+            else:
+                break
+        if max_pixels is not None:
+            best = max(best, self.level_for_size(max_pixels))
+        return best
+
+    def level_for_size(self, max_pixels):
+        """
+        Find the finest level that has at most ``max_pixels`` pixels.
+
+        Returns:
+            int
+        """
+        for level in range(self.num_levels):
+            lh, lw = self.level_shape(level)
+            if lh * lw <= max_pixels:
+                return level
+        return self.num_levels - 1
+
+
+class LazyImagePyramid(ImagePyramid):
+    """
+    A pyramid over an image that does not fit in memory.
+
+    The source can be a :class:`numpy.memmap`, a ``.npy`` file opened with
+    ``mmap_mode``, or any lazy array-like object with a ``shape`` that
+    supports slicing with steps. Level ``k`` samples every ``2 ** k``-th pixel
+    of the source, and only the requested window is ever read. Windows are
+    read in tiles, which are kept in a least-recently-used cache with a
+    bounded size in bytes.
+
+    Args:
+        data (ArrayLike): image data in (H, W) or (H, W, C) format, or in
+            (C, H, W) format if ``chw`` is True.
+
+        min_size (int):
+            levels are added until both dimensions are at most this size
+
+        tile_size (int): height and width of a cached tile in level pixels
+
+        cache_bytes (int): maximum number of bytes of cached tiles
+
+        chw (bool): if True the source is in (C, H, W) format
+
+        transform (Callable[[ndarray], ndarray] | None):
+            applied to each tile after it is read (e.g. a colorspace
+            conversion).
+
+    Example:
+        >>> from kwplot.mpl_pyramid import *  # NOQA
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('kwplot/tests/lazy_pyramid').ensuredir()
+        >>> fpath = dpath / 'big.npy'
+        >>> data = np.lib.format.open_memmap(fpath, mode='w+', dtype=np.uint8,
+        >>>                                  shape=(1000, 800, 3))
+        >>> data[400:500, 200:300] = 255
+        >>> data.flush()
+        >>> del data
+        >>> source = np.load(fpath, mmap_mode='r')
+        >>> pyr = LazyImagePyramid(source, tile_size=128, cache_bytes=2 ** 20)
+        >>> window = pyr.read(2, slice(100, 125), slice(50, 75))
+        >>> assert window.shape == (25, 25, 3) and window.min() == 255
+        >>> assert not isinstance(window, np.memmap)
+        >>> # Reading the full image keeps the cache within its budget
+        >>> full = pyr.level(0)
+        >>> assert full.shape == (1000, 800, 3)
+        >>> assert pyr.cache_nbytes <= 2 ** 20
+    """
+
+    def __init__(self, data, min_size=256, tile_size=256,
+                 cache_bytes=256 * 2 ** 20, chw=False, transform=None):
+        from collections import OrderedDict
+        shape = tuple(data.shape)
+        if chw:
+            shape = shape[1:3] + shape[0:1]
+        self.data = data
+        self.chw = chw
+        self.transform = transform
+        self.tile_size = tile_size
+        self.cache_bytes = cache_bytes
+        self.cache_nbytes = 0
+        self._tiles = OrderedDict()
+        self.shape = shape
+        self.dtype = getattr(data, 'dtype', None)
+        if self.dtype is None:
+            corner = data[:, 0:1, 0:1] if chw else data[0:1, 0:1]
+            self.dtype = np.asarray(corner).dtype
+        h, w = self.shape[0:2]
+        num_levels = 1
+        while max(h, w) > min_size:
+            h, w = (h + 1) // 2, (w + 1) // 2
+            num_levels += 1
+        self.num_levels = num_levels
+
+    def level(self, level):
+        """
+        Returns:
+            ndarray: the full image data of a level
+        """
+        lh, lw = self.level_shape(level)
+        return self.read(level, slice(0, lh), slice(0, lw))
+
+    def read(self, level, rows, cols):
+        """
+        Read a window of a level through the tile cache.
+
+        Args:
+            level (int): the pyramid level
+            rows (slice): the rows of the window in level coordinates
+            cols (slice): the columns of the window in level coordinates
+
+        Returns:
+            ndarray
+        """
+        lh, lw = self.level_shape(level)
+        r0, r1, _ = rows.indices(lh)
+        c0, c1, _ = cols.indices(lw)
+        size = self.tile_size
+        parts = []
+        for tr in range(r0 // size, (max(r1, r0 + 1) - 1) // size + 1):
+            row_parts = []
+            for tc in range(c0 // size, (max(c1, c0 + 1) - 1) // size + 1):
+                tile = self._tile(level, tr, tc)
+                y0 = tr * size
+                x0 = tc * size
+                row_parts.append(tile[max(r0 - y0, 0):r1 - y0,
+                                      max(c0 - x0, 0):c1 - x0])
+            parts.append(np.concatenate(row_parts, axis=1))
+        return np.concatenate(parts, axis=0)
+
+    def _tile(self, level, tr, tc):
+        key = (level, tr, tc)
+        tile = self._tiles.get(key, None)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+        lh, lw = self.level_shape(level)
+        size = self.tile_size
+        step = 2 ** level
+        ry = slice(tr * size * step, min((tr + 1) * size, lh) * step, step)
+        rx = slice(tc * size * step, min((tc + 1) * size, lw) * step, step)
+        if self.chw:
+            tile = np.array(self.data[:, ry, rx]).transpose(1, 2, 0)
+        else:
+            tile = np.array(self.data[ry, rx])
+        if self.transform is not None:
+            tile = self.transform(tile)
+        self._tiles[key] = tile
+        self.cache_nbytes += tile.nbytes
+        while self.cache_nbytes > self.cache_bytes and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self.cache_nbytes -= old.nbytes
+        return tile
+
+
+def is_lazy_image(img):
+    """
+    Check if image data should be read on demand instead of loaded.
+
+    Args:
+        img (Any): image data passed to :func:`kwplot.imshow`
+
+    Returns:
+        bool: True for memory-mapped arrays and array-like objects that are
+            not in-memory ndarrays.
+
+    Example:
+        >>> from kwplot.mpl_pyramid import *  # NOQA
+        >>> class LazyArray:
+        >>>     shape = (4, 4)
+        >>>     def __getitem__(self, index):
+        >>>         return np.zeros(self.shape)[index]
+        >>> assert not is_lazy_image(np.zeros((2, 2)))
+        >>> assert is_lazy_image(LazyArray())
+    """
+    if isinstance(img, np.memmap):
+        return True
+    if isinstance(img, np.ndarray):
+        return False
+    return hasattr(img, 'shape') and hasattr(img, '__getitem__')
+
+
+def lazy_image_pyramid(data, colorspace='rgb', cache_bytes=None):
+    """
+    Wrap a lazy image source in a :class:`LazyImagePyramid` that reads tiles
+    in the format :func:`kwplot.imshow` gives to matplotlib.
+
+    This detects (C, H, W) data like :func:`kwplot.imshow` does, converts
+    3 and 4 channel tiles to RGB(A) from ``colorspace``, and drops the
+    channel axis of single channel data.
+
+    Args:
+        data (ArrayLike): lazy image data
+        colorspace (str): the colorspace of 3 or 4 channel data
+        cache_bytes (int | None): maximum bytes of cached tiles
+
+    Returns:
+        LazyImagePyramid
+    """
+    shape = tuple(data.shape)
+    chw = (len(shape) == 3 and shape[0] in {1, 3} and shape[2] > 4)
+    if chw:
+        shape = shape[1:3] + shape[0:1]
+
+    def _to_rgb(tile):
+        import kwimage
+        return kwimage.convert_colorspace(
+            tile, src_space=colorspace, dst_space='rgb', implicit=True)
+
+    def _drop_channel(tile):
+        return tile[..., 0]
+
+    transform = None
+    if len(shape) == 3 and shape[2] in {3, 4}:
+        transform = _to_rgb
+    elif len(shape) == 3 and shape[2] == 1:
+        transform = _drop_channel
+    kw = {}
+    if cache_bytes is not None:
+        kw['cache_bytes'] = cache_bytes
+    return LazyImagePyramid(data, chw=chw, transform=transform, **kw)
+
+
+class PyramidView:
+    """
+    Keeps an ``AxesImage`` showing the visible window of an image at the
+    level of detail that matches the axes size in screen pixels.
+
+    When the x or y limits of the axes change, the image is marked stale and
+    the shown window is refreshed right before the image is drawn. Deferring
+    the refresh means a zoom that changes both limits only reads one window.
+    The artist calls back into this object, so it lives as long as the image
+    is shown.
+
+    Args:
+        ax (matplotlib.axes.Axes): the axes the image is drawn on
+
+        artist (kwplot.mpl_artists.DrawHookImage): the image artist to update
+
+        pyramid (ImagePyramid): source of the image data
+
+        offset (float):
+            the data coordinate of the top left corner of the image. This is
+            -0.5 for ``origin_convention='center'`` and 0 for ``'corner'``.
+
+        max_display_pixels (int | None):
+            the maximum number of pixels to give to matplotlib at once.
+
+    Example:
+        >>> import kwplot
+        >>> from kwplot.mpl_pyramid import *  # NOQA
+        >>> img = np.random.rand(4000, 3000)
+        >>> fig = kwplot.figure(managed=False, doclf=True)
+        >>> fig.set_size_inches(4, 4)
+        >>> fig.set_dpi(50)
+        >>> ax = kwplot.imshow(img, ax=fig.gca(), pyramid=True).ax
+        >>> artist = ax.get_images()[0]
+        >>> view = artist._kwplot_pyramid_view
+        >>> # The full view uses a coarse level
+        >>> assert artist.get_array().shape[0] < 500
+        >>> assert artist.get_extent() == [-0.5, 2999.5, 3999.5, -0.5]
+        >>> # Zooming in swaps in a finer level for only the visible window
+        >>> ax.set_xlim(1000, 1100)
+        >>> ax.set_ylim(2100, 2000)
+        >>> fig.canvas.draw()
+        >>> assert view.level == 0
+        >>> assert artist.get_array().shape[0] < 200
+        >>> left, right, bottom, top = artist.get_extent()
+        >>> assert left <= 1000 and right >= 1100 and top <= 2000 and bottom >= 2100
+        >>> # Figures with pyramid images can be copied
+        >>> import copy
+        >>> fig2 = copy.deepcopy(fig)
+        >>> fig2.canvas.draw()
+    """
+
+    def __init__(self, ax, artist, pyramid, offset=-0.5,
+                 max_display_pixels=None):
+        self.ax = ax
+        self.artist = artist
+        self.pyramid = pyramid
+        self.offset = offset
+        self.max_display_pixels = max_display_pixels
+        self.level = None
+        self._key = None
+        self._cids = [
+            ax.callbacks.connect('xlim_changed', self._on_lims_changed),
+            ax.callbacks.connect('ylim_changed', self._on_lims_changed),
+        ]
+        artist._kwplot_pyramid_view = self
+        artist.draw_hook = self._draw
+
+    @property
+    def full_extent(self):
+        """
+        The extent of the entire image in data coordinates.
+
+        Returns:
+            Tuple[float, float, float, float]: left, right, bottom, top
+        """
+        h, w = self.pyramid.shape[0:2]
+        off = self.offset
+        return (off, w + off, h + off, off)
+
+    def _on_lims_changed(self, ax):
+        self.artist.stale = True
+
+    def _draw(self, renderer, draw):
+        self.update()
+        return draw(renderer)
+
+    def _axes_pixel_size(self):
+        bbox = self.ax.get_window_extent()
+        return max(bbox.width, 1.0), max(bbox.height, 1.0)
+
+    def update(self):
+        """
+        Show the level and window that matches the current view.
+        """
+        h, w = self.pyramid.shape[0:2]
+        off = self.offset
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        # Visible window in original pixel-corner coordinates
+        sx0, sx1 = max(x0 - off, 0), min(x1 - off, w)
+        sy0, sy1 = max(y0 - off, 0), min(y1 - off, h)
+        if sx1 <= sx0 or sy1 <= sy0:
+            return
+        ax_w, ax_h = self._axes_pixel_size()
+        scale = min((x1 - x0) / ax_w, (y1 - y0) / ax_h)
+        level = self.pyramid.level_for_scale(scale)
+        self._show_level(level, sy0, sy1, sx0, sx1)
+
+    def _show_level(self, level, sy0, sy1, sx0, sx1):
+        """
+        Show the window of a level that covers the given original pixel
+        range, using a coarser level if it would be too large.
+        """
+        ly, lx = self.pyramid.scale(level)
+        lh, lw = self.pyramid.level_shape(level)
+        r0 = max(int(math.floor(sy0 / ly)) - 1, 0)
+        r1 = min(int(math.ceil(sy1 / ly)) + 1, lh)
+        c0 = max(int(math.floor(sx0 / lx)) - 1, 0)
+        c1 = min(int(math.ceil(sx1 / lx)) + 1, lw)
+        if (self.max_display_pixels is not None and
+                (r1 - r0) * (c1 - c0) > self.max_display_pixels and
+                level + 1 < len(self.pyramid)):
+            return self._show_level(level + 1, sy0, sy1, sx0, sx1)
+        self._show_window(level, r0, r1, c0, c1)
+
+    def _show_window(self, level, r0, r1, c0, c1):
+        key = (level, r0, r1, c0, c1)
+        if key == self._key:
+            return
+        self._key = key
+        self.level = level
+        ly, lx = self.pyramid.scale(level)
+        off = self.offset
+        data = self.pyramid.read(level, slice(r0, r1), slice(c0, c1))
+        extent = (c0 * lx + off, c1 * lx + off, r1 * ly + off, r0 * ly + off)
+        ax = self.ax
+        # Changing the extent must not autoscale the view to the window
+        autoscale = ax.get_autoscalex_on(), ax.get_autoscaley_on()
+        ax.set_autoscalex_on(False)
+        ax.set_autoscaley_on(False)
+        try:
+            self.artist.set_data(data)
+            self.artist.set_extent(extent)
+        finally:
+            ax.set_autoscalex_on(autoscale[0])
+            ax.set_autoscaley_on(autoscale[1])
+        self.artist.stale = True
+
+    def disconnect(self):
+        """
+        Stop updating the image when the view changes.
+        """
+        for cid in self._cids:
+            self.ax.callbacks.disconnect(cid)
+        self._cids = []
+        self.artist.draw_hook = None
+
+
+def pyramid_imshow(ax, img, offset=-0.5, pyramid=True,
+                   max_display_pixels=None, **imshow_kwargs):
+    """
+    Show an image at a level of detail that matches the display.
+
+    Args:
+        ax (matplotlib.axes.Axes): axes to draw on
+
+        img (ndarray | ImagePyramid): image data in (H, W) or (H, W, C)
+            format, or a pyramid such as a :class:`LazyImagePyramid`.
+
+        offset (float): the data coordinate of the top left image corner
+
+        pyramid (bool):
+            if True, update the shown level and window when the view changes.
+            Otherwise show a single static level.
+
+        max_display_pixels (int | None):
+            maximum number of image pixels given to matplotlib at once.
+
+        **imshow_kwargs: image properties as accepted by ``ax.imshow``
+
+    Returns:
+        matplotlib.image.AxesImage
+    """
+    if isinstance(img, ImagePyramid):
+        pyr = img
+    else:
+        pyr = ImagePyramid(img)
+    h, w = pyr.shape[0:2]
+    full_extent = (offset, w + offset, h + offset, offset)
+    imshow_kwargs.pop('extent', None)
+    if pyramid:
+        ax_bbox = ax.get_window_extent()
+        scale = min(w / max(ax_bbox.width, 1), h / max(ax_bbox.height, 1))
+        level = pyr.level_for_scale(scale, max_pixels=max_display_pixels)
+    elif max_display_pixels is not None:
+        level = pyr.level_for_size(max_display_pixels)
+    else:
+        level = 0
+    lh, lw = pyr.level_shape(level)
+    data = pyr.read(level, slice(0, lh), slice(0, lw))
+    if pyramid:
+        from kwplot.mpl_artists import add_hooked_image
+        artist = add_hooked_image(ax, data, extent=full_extent,
+                                  **imshow_kwargs)
+    else:
+        artist = ax.imshow(data, extent=full_extent, **imshow_kwargs)
+    if pyramid:
+        view = PyramidView(ax, artist, pyr, offset=offset,
+                           max_display_pixels=max_display_pixels)
+        view.level = level
+        view._key = (level, 0, lh, 0, lw)
+    return artist
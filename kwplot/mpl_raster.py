@@ -0,0 +1,288 @@
+"""
+Draw very many line segments as one image at the resolution of the screen.
+
+A ``LineCollection`` keeps a ``Path`` for every segment and renders each one,
+which becomes slow for millions of segments (e.g. feature matches between two
+images). :class:`SegmentRaster` instead accumulates the segments that cross
+the visible window into a buffer with one pixel per screen pixel and shows it
+as a single ``AxesImage``. The buffer is recomputed when the view is zoomed,
+panned, or resized. This is used by :func:`kwplot.draw_line_segments` when
+``mode='raster'``.
+"""
+import numpy as np
+
+
+def _clip_segments(x0, y0, x1, y1, width, height):
+    """
+    Clip segments to the box [0, width] x [0, height] (Liang-Barsky).
+
+    Returns:
+        Tuple[ndarray, ...]: flags of the segments that cross the box and
+            the clipped endpoints of those segments.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    t0 = np.zeros_like(x0)
+    t1 = np.ones_like(x0)
+    keep = np.ones(x0.shape, dtype=bool)
+    for p, q in [(-dx, x0), (dx, width - x0), (-dy, y0), (dy, height - y0)]:
+        parallel = p == 0
+        keep &= ~(parallel & (q < 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = q / p
+        entering = (p < 0) & ~parallel
+        leaving = (p > 0) & ~parallel
+        t0 = np.where(entering, np.maximum(t0, r), t0)
+        t1 = np.where(leaving, np.minimum(t1, r), t1)
+    keep &= t0 <= t1
+    t0 = t0[keep]
+    t1 = t1[keep]
+    dx = dx[keep]
+    dy = dy[keep]
+    cx0 = x0[keep] + t0 * dx
+    cy0 = y0[keep] + t0 * dy
+    cx1 = x0[keep] + t1 * dx
+    cy1 = y0[keep] + t1 * dy
+    return keep, cx0, cy0, cx1, cy1
+
+
+def rasterize_segments(segments, shape, extent, colors=None, alphas=None,
+                       chunk_pixels=2 ** 22):
+    """
+    Accumulate line segments into an RGBA image.
+
+    Each segment covers one pixel per step along its major axis (the same
+    pixels as Bresenham's algorithm). Overlapping segments are composited as
+    if they were drawn on top of each other: the color of a pixel is the
+    alpha weighted mean of the segment colors, and its alpha is
+    ``1 - prod(1 - alpha_i)``.
+
+    Args:
+        segments (ndarray): (N, 2, 2) array of segments, where
+            ``segments[i] = [(x1, y1), (x2, y2)]``.
+
+        shape (Tuple[int, int]): height and width of the buffer
+
+        extent (Tuple[float, float, float, float]):
+            the ``(left, right, bottom, top)`` data coordinates covered by the
+            buffer. Row 0 of the buffer is at ``bottom``.
+
+        colors (ndarray | None): (N, 4) or (4,) RGBA colors of the segments.
+            Defaults to blue.
+
+        alphas (ndarray | float | None): alpha of each segment. Overrides the
+            alpha of the colors if specified.
+
+        chunk_pixels (int): number of pixels to process at once. Bounds the
+            temporary memory used.
+
+    Returns:
+        ndarray: (H, W, 4) float32 RGBA image
+
+    Example:
+        >>> from kwplot.mpl_raster import *  # NOQA
+        >>> segments = np.array([[(0, 0.5), (4, 0.5)], [(1.5, 0), (1.5, 3)]])
+        >>> img = rasterize_segments(segments, (3, 4), (0, 4, 0, 3), alphas=0.5)
+        >>> img[..., 3]
+        array([[0.5 , 0.75, 0.5 , 0.5 ],
+               [0.  , 0.5 , 0.  , 0.  ],
+               [0.  , 0.5 , 0.  , 0.  ]], dtype=float32)
+    """
+    h, w = shape
+    left, right, bottom, top = extent
+    segments = np.asarray(segments).reshape(-1, 2, 2)
+    num = len(segments)
+    if colors is None:
+        colors = (0.0, 0.0, 1.0, 1.0)
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float32),
+                             (num, 4))
+    if alphas is None:
+        alphas = colors[:, 3]
+    alphas = np.broadcast_to(np.asarray(alphas, dtype=np.float32), (num,))
+
+    # Segment endpoints in buffer pixel coordinates
+    sx = w / (right - left)
+    sy = h / (top - bottom)
+    x0 = ((segments[:, 0, 0] - left) * sx).astype(np.float32)
+    y0 = ((segments[:, 0, 1] - bottom) * sy).astype(np.float32)
+    x1 = ((segments[:, 1, 0] - left) * sx).astype(np.float32)
+    y1 = ((segments[:, 1, 1] - bottom) * sy).astype(np.float32)
+    keep, x0, y0, x1, y1 = _clip_segments(x0, y0, x1, y1, w, h)
+    colors = colors[keep]
+    alphas = alphas[keep]
+
+    # Step along the major axis of each segment from its low end
+    major_x = np.abs(x1 - x0) >= np.abs(y1 - y0)
+    u0 = np.where(major_x, x0, y0)
+    u1 = np.where(major_x, x1, y1)
+    v0 = np.where(major_x, y0, x0)
+    v1 = np.where(major_x, y1, x1)
+    flip = u0 > u1
+    u0, u1 = np.where(flip, u1, u0), np.where(flip, u0, u1)
+    v0, v1 = np.where(flip, v1, v0), np.where(flip, v0, v1)
+    du = u1 - u0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(du > 0, (v1 - v0) / du, 0).astype(np.float32)
+    major_size = np.where(major_x, w, h).astype(np.int32)
+    i0 = np.floor(u0).astype(np.int32)
+    i1 = np.minimum(np.floor(u1).astype(np.int32), major_size - 1)
+    i0 = np.minimum(i0, i1)
+    counts = i1 - i0 + 1
+
+    # When all segments look the same, only the number of segments that
+    # cover each pixel is needed.
+    uniform = len(alphas) == 0 or (
+        (colors == colors[0]).all() and (alphas == alphas[0]).all())
+    if uniform:
+        weights = None
+        accum = np.zeros((1, h * w), dtype=np.float64)
+    else:
+        weights = np.empty((len(alphas), 5), dtype=np.float64)
+        weights[:, 0:3] = colors[:, 0:3] * alphas[:, None]
+        weights[:, 3] = alphas
+        weights[:, 4] = np.log1p(-np.minimum(alphas, 1 - 1e-7))
+        accum = np.zeros((5, h * w), dtype=np.float64)
+
+    cumcounts = np.cumsum(counts)
+    total = int(cumcounts[-1]) if len(counts) else 0
+    stops = np.searchsorted(cumcounts, np.arange(chunk_pixels, total,
+                                                 chunk_pixels))
+    bounds = [0] + (stops + 1).tolist() + [len(counts)]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop <= start:
+            continue
+        cn = counts[start:stop]
+        seg_idx = np.repeat(np.arange(start, stop, dtype=np.int32), cn)
+        offset = np.arange(len(seg_idx), dtype=np.int32) - np.repeat(
+            (np.cumsum(cn) - cn).astype(np.int32), cn)
+        ui = i0[seg_idx] + offset
+        # Sample the minor axis at the center of each major axis pixel
+        u0_ = u0[seg_idx]
+        uc = np.clip(ui + np.float32(0.5), u0_, u1[seg_idx])
+        vi = np.floor(v0[seg_idx] + (uc - u0_) * slope[seg_idx])
+        vi = vi.astype(np.int32)
+        is_x = major_x[seg_idx]
+        cols = np.clip(np.where(is_x, ui, vi), 0, w - 1)
+        rows = np.clip(np.where(is_x, vi, ui), 0, h - 1)
+        flat = rows.astype(np.int64) * w + cols
+        if weights is None:
+            accum[0] += np.bincount(flat, minlength=h * w)
+        else:
+            for ch in range(5):
+                accum[ch] += np.bincount(flat, weights=weights[seg_idx, ch],
+                                         minlength=h * w)
+
+    img = np.zeros((h * w, 4), dtype=np.float32)
+    if weights is None:
+        hit = accum[0] > 0
+        if len(alphas):
+            alpha = min(float(alphas[0]), 1 - 1e-7)
+            img[hit, 0:3] = colors[0, 0:3]
+            img[hit, 3] = -np.expm1(accum[0, hit] * np.log1p(-alpha))
+    else:
+        asum = accum[3]
+        hit = asum > 0
+        img[hit, 0:3] = (accum[0:3, hit] / asum[hit]).T
+        img[hit, 3] = -np.expm1(accum[4, hit])
+    return img.reshape(h, w, 4)
+
+
+class SegmentRaster:
+    """
+    Keeps an ``AxesImage`` showing line segments rasterized at the resolution
+    of the axes for the visible window.
+
+    Like :class:`kwplot.mpl_pyramid.PyramidView`, the buffer is refreshed
+    right before the image is drawn, and only if the view or the size of the
+    axes changed. The artist is a :class:`kwplot.mpl_artists.DrawHookImage`
+    that calls back into this object. The axes must have linear scales.
+
+    Args:
+        ax (matplotlib.axes.Axes): the axes to draw on
+
+        segments (ndarray): (N, 2, 2) segments in data coordinates
+
+        colors (ndarray | None): (N, 4) or (4,) RGBA colors
+
+        alphas (ndarray | float | None): alpha of each segment
+
+        **kwargs: passed to :class:`matplotlib.image.AxesImage`
+
+    Example:
+        >>> import kwplot
+        >>> from kwplot.mpl_raster import *  # NOQA
+        >>> fig = kwplot.figure(managed=False, doclf=True)
+        >>> fig.set_size_inches(4, 3)
+        >>> fig.set_dpi(50)
+        >>> ax = fig.add_subplot(1, 1, 1)
+        >>> rng = np.random.RandomState(0)
+        >>> segments = rng.rand(10000, 2, 2) * 100
+        >>> raster = SegmentRaster(ax, segments, alphas=0.1)
+        >>> fig.canvas.draw()
+        >>> buf = raster.artist.get_array()
+        >>> bbox = ax.get_window_extent()
+        >>> assert buf.shape[0:2] == (int(np.ceil(bbox.height)), int(np.ceil(bbox.width)))
+        >>> # Zooming rasterizes the visible window again
+        >>> ax.set_xlim(10, 20)
+        >>> fig.canvas.draw()
+        >>> assert raster.artist.get_extent()[0:2] == [10, 20]
+        >>> # Figures with rasterized segments can be copied
+        >>> import copy
+        >>> fig2 = copy.deepcopy(fig)
+        >>> fig2.canvas.draw()
+    """
+
+    def __init__(self, ax, segments, colors=None, alphas=None, **kwargs):
+        from kwplot.mpl_artists import DrawHookImage
+        self.ax = ax
+        self.segments = np.asarray(segments).reshape(-1, 2, 2)
+        self.colors = colors
+        self.alphas = alphas
+        self._key = None
+        kwargs.setdefault('interpolation', 'nearest')
+        self.artist = DrawHookImage(ax, draw_hook=self._draw, origin='lower',
+                                    **kwargs)
+        self.artist.set_data(np.zeros((1, 1, 4), dtype=np.float32))
+        if len(self.segments):
+            x_lo, y_lo = self.segments.reshape(-1, 2).min(axis=0)
+            x_hi, y_hi = self.segments.reshape(-1, 2).max(axis=0)
+        else:
+            x_lo, y_lo, x_hi, y_hi = 0, 0, 1, 1
+        self.artist.set_extent((x_lo, x_hi, y_lo, y_hi))
+        ax.add_image(self.artist)
+        ax.update_datalim([(x_lo, y_lo), (x_hi, y_hi)])
+        ax.autoscale_view()
+        self.artist._kwplot_segment_raster = self
+
+    def _draw(self, renderer, draw):
+        self.update()
+        return draw(renderer)
+
+    def update(self):
+        """
+        Rasterize the segments for the current view if it changed.
+        """
+        ax = self.ax
+        x_lo, x_hi = sorted(ax.get_xlim())
+        y_lo, y_hi = sorted(ax.get_ylim())
+        bbox = ax.get_window_extent()
+        w = max(int(np.ceil(bbox.width)), 1)
+        h = max(int(np.ceil(bbox.height)), 1)
+        key = (x_lo, x_hi, y_lo, y_hi, w, h)
+        if key == self._key or x_hi <= x_lo or y_hi <= y_lo:
+            return
+        self._key = key
+        extent = (x_lo, x_hi, y_lo, y_hi)
+        data = rasterize_segments(self.segments, (h, w), extent,
+                                  colors=self.colors, alphas=self.alphas)
+        # Changing the extent must not autoscale the view to the window
+        autoscale = ax.get_autoscalex_on(), ax.get_autoscaley_on()
+        ax.set_autoscalex_on(False)
+        ax.set_autoscaley_on(False)
+        try:
+            self.artist.set_data(data)
+            self.artist.set_extent(extent)
+        finally:
+            ax.set_autoscalex_on(autoscale[0])
+            ax.set_autoscaley_on(autoscale[1])
+        self.artist.stale = True
@@ -0,0 +1,52 @@
+"""
+Check that the pure-data helpers in kwplot do not import matplotlib.
+"""
+import subprocess
+import sys
+
+
+def _run_isolated(code):
+    """
+    Run code in a fresh interpreter so previously imported modules in the test
+    process do not hide an eager import.
+    """
+    info = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                          text=True)
+    assert info.returncode == 0, info.stdout + info.stderr
+    return info.stdout
+
+
+def test_pure_data_helpers_do_not_import_matplotlib():
+    code = (
+        'import sys\n'
+        'import kwplot\n'
+        'pnums = kwplot.PlotNums(nSubplots=4)\n'
+        'assert pnums[0] == (2, 2, 1)\n'
+        'markers = kwplot.distinct_markers(3)\n'
+        'assert len(markers) == 3\n'
+        "palette = kwplot.Palette.coerce({'cat': 'red'})\n"
+        "palette.add_labels(labels=['dog', 'bird'])\n"
+        'assert len(palette) == 3\n'
+        "labelman = kwplot.LabelManager({'cat': 'Cat'})\n"
+        "labelman.add_mapping({'dog': 'Dog'})\n"
+        "assert labelman._modify_text('cat') == 'Cat'\n"
+        'from kwplot import video_writer\n'
+        'inputs = video_writer.VideoArrayInputs([])\n'
+        'writer = video_writer.VideoWriter()\n'
+        "print('matplotlib' in sys.modules)\n"
+    )
+    out = _run_isolated(code)
+    assert out.strip() == 'False', (
+        'matplotlib was imported by a pure-data helper')
+
+
+def test_deprecated_reexports_are_lazy():
+    code = (
+        'import sys\n'
+        'from kwplot import mpl_draw, mpl_make\n'
+        "print('kwimage' in sys.modules, 'matplotlib' in sys.modules)\n"
+        'assert mpl_draw.draw_text_on_image is not None\n'
+        'assert mpl_make.make_heatmask is not None\n'
+    )
+    out = _run_isolated(code)
+    assert out.strip() == 'False False'
@@ -0,0 +1,45 @@
+"""
+Tests for :func:`kwplot.render_many` in process mode. The render function is
+defined at the module level so worker processes can unpickle it.
+"""
+import sys
+import pytest
+
+requires_linux = pytest.mark.skipif(
+    not sys.platform.startswith('linux'),
+    reason='process mode tests only run on linux')
+
+
+def _render_item(item):
+    import kwplot
+    import numpy as np
+    if not isinstance(item, int):
+        raise TypeError('bad item')
+    fig = kwplot.figure(managed=False, pnum=None)
+    fig.set_size_inches(1, 1)
+    ax = fig.add_subplot(1, 1, 1)
+    kwplot.imshow(np.full((8, 8), item / 10), ax=ax)
+    return fig
+
+
+@requires_linux
+def test_render_many_processes_write_paths(tmp_path):
+    import kwplot
+    items = [1, 2, 'bad']
+    results = sorted(kwplot.render_many(_render_item, items, workers=2,
+                                        out='path', dpath=tmp_path,
+                                        timeout=30))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].value.exists()
+    assert results[1].value.exists()
+    assert results[2].error is not None
+
+
+@requires_linux
+def test_render_many_processes_return_shared_arrays():
+    import kwplot
+    results = list(kwplot.render_many(_render_item, [1], workers=1))
+    assert results[0].error is None
+    assert results[0].value.shape[2] == 3
+    # The array is a view of the shared memory block, not a copy
+    assert not results[0].value.flags['OWNDATA']